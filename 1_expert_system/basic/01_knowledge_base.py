@@ -16,19 +16,73 @@ Tujuan:
 - Menyimpan dan mengakses knowledge base
 """
 
+import csv
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from array import array
+
+from record_io import read_records   # dipakai bersama 03_fact_matching.py
+
+_SNAPSHOT_MAGIC = b"KBSNAP01"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQ")   # magic, offset meta, panjang meta
+
+
+class ConsoleListener:
+    """
+    Listener yang mencetak setiap perubahan knowledge base
+    
+    Listener lain cukup punya method fact_added(fact) dan rule_added(rule),
+    misal CountingListener / JsonLinesListener di 02_simple_rules.py.
+    """
+    
+    def fact_added(self, fact):
+        print(f"✓ Fakta ditambahkan: {fact}")
+    
+    def rule_added(self, rule):
+        print(f"✓ Aturan ditambahkan: {rule['name']}")
+
+
 class KnowledgeBase:
     """
     Knowledge Base sederhana untuk menyimpan fakta dan aturan
     """
     
-    def __init__(self):
+    def __init__(self, listener=None):
+        """
+        Args:
+            listener: Listener opsional (misal ConsoleListener()).
+                      Tanpa listener, tidak ada output sama sekali.
+        """
         self.facts = set()  # Set untuk menyimpan fakta (unique)
         self.rules = []     # List untuk menyimpan aturan
+        self.listener = listener
     
     def add_fact(self, fact):
         """Menambahkan fakta ke knowledge base"""
+        if fact in self.facts:
+            return
         self.facts.add(fact)
-        print(f"✓ Fakta ditambahkan: {fact}")
+        if self.listener is not None:
+            self.listener.fact_added(fact)
+    
+    def add_facts(self, facts):
+        """
+        Menambahkan banyak fakta sekaligus (satu set.update, tanpa
+        pengecekan per fakta kecuali ada listener)
+        
+        Returns:
+            Jumlah fakta baru
+        """
+        count = len(self.facts)
+        if self.listener is None:
+            self.facts.update(facts)
+        else:
+            for fact in facts:
+                self.add_fact(fact)
+        return len(self.facts) - count
     
     def add_rule(self, rule_name, conditions, conclusion):
         """
@@ -45,7 +99,121 @@ class KnowledgeBase:
             'conclusion': conclusion
         }
         self.rules.append(rule)
-        print(f"✓ Aturan ditambahkan: {rule_name}")
+        if self.listener is not None:
+            self.listener.rule_added(rule)
+    
+    def add_rules(self, rules):
+        """Menambahkan banyak aturan (dict dengan name/conditions/conclusion)"""
+        for rule in rules:
+            self.add_rule(rule['name'], list(rule['conditions']), rule['conclusion'])
+    
+    def load_facts(self, path, chunk_size=50000):
+        """
+        Memuat fakta dari file JSON-lines atau CSV (ekstensi .csv)
+        
+        JSON-lines: satu fakta per baris, sebagai string JSON
+        ("memiliki bulu") atau objek {"fact": "memiliki bulu"}.
+        CSV: satu fakta per baris, di kolom pertama.
+        
+        File dibaca per `chunk_size` baris; string di-intern sehingga
+        fakta yang sama berbagi satu objek.
+        
+        Returns:
+            Jumlah fakta baru
+        """
+        is_csv = str(path).lower().endswith(".csv")
+        count = 0
+        for chunk in read_records(path, chunk_size):
+            if is_csv:
+                facts = [row[0] for row in chunk]
+            else:
+                facts = [record['fact'] if isinstance(record, dict) else record
+                         for record in chunk]
+            count += self.add_facts(map(sys.intern, facts))
+        return count
+    
+    def load_rules(self, path, chunk_size=50000):
+        """
+        Memuat aturan dari file JSON-lines atau CSV
+        
+        JSON-lines: {"name": "R1", "conditions": ["a", "b"], "conclusion": "c"}
+        CSV dengan header name,conditions,conclusion; kondisi dipisah ';'.
+        
+        Returns:
+            Jumlah aturan yang dimuat
+        """
+        count = len(self.rules)
+        if str(path).lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as stream:
+                self.add_rules(
+                    {'name': row['name'],
+                     'conditions': [sys.intern(condition.strip())
+                                    for condition in row['conditions'].split(";")
+                                    if condition.strip()],
+                     'conclusion': sys.intern(row['conclusion'])}
+                    for row in csv.DictReader(stream)
+                )
+        else:
+            for chunk in read_records(path, chunk_size):
+                self.add_rules(
+                    {'name': record['name'],
+                     'conditions': [sys.intern(c) for c in record['conditions']],
+                     'conclusion': sys.intern(record['conclusion'])}
+                    for record in chunk
+                )
+        return len(self.rules) - count
+    
+    def save_snapshot(self, path):
+        """
+        Menyimpan knowledge base ke snapshot biner
+        
+        Fakta (string) disimpan terurut sebagai bytes UTF-8 plus array
+        offset; aturan disimpan sebagai JSON di akhir file.
+        """
+        encoded = sorted(fact.encode("utf-8") for fact in self.facts)
+        offsets = array("Q", [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        with open(path, "wb") as stream:
+            stream.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, 0, 0))
+            offsets.tofile(stream)
+            for data in encoded:
+                stream.write(data)
+            meta_offset = stream.tell()
+            text = json.dumps({"facts": len(encoded), "byteorder": sys.byteorder,
+                               "rules": self.rules}).encode()
+            stream.write(text)
+            stream.seek(0)
+            stream.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, meta_offset, len(text)))
+    
+    @classmethod
+    def open_snapshot(cls, path, listener=None):
+        """
+        Membuka snapshot dari save_snapshot tanpa memuat semua fakta
+        
+        Fakta dibaca langsung dari file yang di-mmap (has_fact memakai
+        bisect), sehingga knowledge base besar terbuka seketika dan proses
+        lain yang membuka file yang sama berbagi page cache. Fakta yang
+        ditambahkan sesudahnya disimpan di memori.
+        
+        Contoh:
+            with KnowledgeBase.open_snapshot("hewan.kbsnap") as kb:
+                kb.has_fact("karnivora")
+        """
+        kb = cls(listener=listener)
+        kb.facts, kb.rules = _open_snapshot(path)
+        return kb
+    
+    def close(self):
+        """Lepas mmap snapshot (jika dibuka dengan open_snapshot)"""
+        if isinstance(self.facts, MappedFacts):
+            self.facts.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def has_fact(self, fact):
         """Mengecek apakah fakta ada di knowledge base"""
@@ -71,6 +239,95 @@ class KnowledgeBase:
             print(f"    THEN {rule['conclusion']}")
 
 
+class MappedFacts:
+    """
+    Himpunan fakta dari snapshot (mmap) plus fakta baru di memori
+    
+    Mendukung operasi set yang dipakai KnowledgeBase: in, add, update,
+    iterasi dan len. Panggil close() (atau pakai `with`) untuk melepas
+    mmap dan file-nya.
+    """
+    
+    def __init__(self, data, offsets, mapping):
+        self._data = data          # bytes fakta terurut (memoryview)
+        self._offsets = offsets    # offset fakta ke-i di data
+        self._map = mapping
+        self._count = len(offsets) - 1
+        self.added = set()
+    
+    def _fact(self, number):
+        return bytes(self._data[self._offsets[number]:self._offsets[number + 1]])
+    
+    def _mapped(self, fact):
+        if not isinstance(fact, str):
+            return False
+        key = fact.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:   # bisect atas bytes fakta di file
+            mid = (lo + hi) // 2
+            if self._fact(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._count and self._fact(lo) == key
+    
+    def __contains__(self, fact):
+        return fact in self.added or self._mapped(fact)
+    
+    def add(self, fact):
+        if not self._mapped(fact):
+            self.added.add(fact)
+    
+    def update(self, facts):
+        for fact in facts:
+            self.add(fact)
+    
+    def __iter__(self):
+        for number in range(self._count):
+            yield sys.intern(self._fact(number).decode("utf-8"))
+        yield from self.added
+    
+    def __len__(self):
+        return self._count + len(self.added)
+    
+    def __bool__(self):
+        return len(self) > 0
+    
+    def close(self):
+        """Lepas mmap (boleh dipanggil berkali-kali)"""
+        if self._map.closed:
+            return
+        self._offsets.release()
+        self._data.release()
+        self._map.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open_snapshot(path):
+    """(MappedFacts, aturan) dari file snapshot"""
+    with open(path, "rb") as stream:
+        mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, meta_offset, meta_length = _SNAPSHOT_HEADER.unpack_from(mapping)
+    if magic != _SNAPSHOT_MAGIC:
+        mapping.close()
+        raise ValueError(f"{path} bukan snapshot KnowledgeBase")
+    meta = json.loads(mapping[meta_offset:meta_offset + meta_length])
+    if meta["byteorder"] != sys.byteorder:
+        mapping.close()
+        raise ValueError(f"{path} dibuat di mesin dengan byte order lain")
+    start = _SNAPSHOT_HEADER.size
+    end = start + (meta["facts"] + 1) * array("Q").itemsize
+    with memoryview(mapping) as view:   # slice tetap valid sampai close()
+        offsets = view[start:end].cast("Q")
+        facts = MappedFacts(view[end:meta_offset], offsets, mapping)
+    return facts, meta["rules"]
+
+
 def demo_animal_knowledge():
     """
     Contoh: Knowledge Base untuk identifikasi hewan
@@ -79,8 +336,8 @@ def demo_animal_knowledge():
     print("DEMO: Knowledge Base - Identifikasi Hewan")
     print("="*60)
     
-    # Buat knowledge base
-    kb = KnowledgeBase()
+    # Buat knowledge base (ConsoleListener mencetak setiap penambahan)
+    kb = KnowledgeBase(listener=ConsoleListener())
     
     # Tambahkan fakta-fakta yang diketahui
     print("\n1. Menambahkan Fakta:")
@@ -123,6 +380,57 @@ def demo_animal_knowledge():
         print(f"  '{fact}': {result}")
 
 
+def demo_load_from_file():
+    """
+    Contoh: Memuat fakta dan aturan dari file (untuk knowledge base besar)
+    """
+    print("\n" + "="*60)
+    print("DEMO: Memuat Knowledge Base dari File")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        facts_path = f"{directory}/fakta.jsonl"
+        with open(facts_path, "w", encoding="utf-8") as stream:
+            for fact in ["memiliki bulu", "memberi susu", "karnivora"]:
+                stream.write(json.dumps(fact) + "\n")
+        rules_path = f"{directory}/aturan.csv"
+        with open(rules_path, "w", encoding="utf-8") as stream:
+            stream.write("name,conditions,conclusion\n")
+            stream.write("R1: Mamalia,memiliki bulu; memberi susu,adalah mamalia\n")
+        
+        kb = KnowledgeBase()   # tanpa listener: tidak ada output per fakta
+        print(f"\nFakta dimuat : {kb.load_facts(facts_path)}")
+        print(f"Aturan dimuat: {kb.load_rules(rules_path)}")
+    kb.display_facts()
+    kb.display_rules()
+
+
+def demo_snapshot():
+    """
+    Contoh: Menyimpan knowledge base ke snapshot biner lalu membukanya lagi
+    """
+    print("\n" + "="*60)
+    print("DEMO: Snapshot Knowledge Base")
+    print("="*60)
+    
+    kb = KnowledgeBase()
+    kb.add_facts(["memiliki bulu", "memberi susu", "karnivora"])
+    kb.add_rule("R1: Mamalia", ["memiliki bulu", "memberi susu"], "adalah mamalia")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/hewan.kbsnap"
+        kb.save_snapshot(path)
+        
+        # Fakta dibaca dari mmap; `with` melepasnya sebelum direktori
+        # sementara dihapus
+        with KnowledgeBase.open_snapshot(path) as loaded:
+            loaded.add_fact("bisa berenang")   # fakta baru: di memori
+            print(f"\nFakta: {len(loaded.facts)}, aturan: {len(loaded.rules)}")
+            for fact in ["karnivora", "bisa berenang", "bisa terbang"]:
+                result = "✓ ADA" if loaded.has_fact(fact) else "✗ TIDAK ADA"
+                print(f"  '{fact}': {result}")
+
+
 def exercise_plant_knowledge():
     """
     LATIHAN: Buat knowledge base untuk identifikasi tanaman
@@ -145,7 +453,7 @@ def exercise_plant_knowledge():
     print("LATIHAN: Buat Knowledge Base Tanaman")
     print("="*60)
     
-    kb = KnowledgeBase()
+    kb = KnowledgeBase(listener=ConsoleListener())
     
     # TODO: Tambahkan fakta-fakta di sini
     # kb.add_fact("...")
@@ -164,6 +472,12 @@ def main():
     # Jalankan demo
     demo_animal_knowledge()
     
+    # Memuat dari file
+    demo_load_from_file()
+    
+    # Snapshot biner
+    demo_snapshot()
+    
     # Jalankan latihan (uncomment setelah mengerjakan)
     # exercise_plant_knowledge()
     
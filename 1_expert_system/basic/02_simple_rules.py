@@ -16,23 +16,304 @@ Tujuan:
 - Menangani AND/OR dalam kondisi
 """
 
+import heapq
+import json
+import os
+import random
+import sys
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Alasan aturan tidak FIRED (dikirim ke listener.rule_skipped)
+SKIP_CONCLUSION_EXISTS = "kesimpulan sudah ada"
+SKIP_CONDITIONS_UNMET = "kondisi tidak terpenuhi"
+
+
+class RuleListener:
+    """
+    Listener event inferensi (override method yang dibutuhkan)
+    
+    Event:
+    - rule_fired(rule, conclusion): aturan FIRED, kesimpulan baru
+    - rule_skipped(rule, reason): aturan dievaluasi tapi tidak FIRED
+    - fact_added(fact): fakta baru masuk working memory
+    - rule_added(rule): aturan ditambahkan (KnowledgeBase)
+    
+    Tanpa listener (listener=None) engine tidak mencetak atau mencatat
+    apapun; biayanya hanya satu pengecekan `is not None`.
+    """
+    
+    def rule_fired(self, rule, conclusion):
+        pass
+    
+    def rule_skipped(self, rule, reason):
+        pass
+    
+    def fact_added(self, fact):
+        pass
+    
+    def rule_added(self, rule):
+        pass
+
+
+class ConsoleListener(RuleListener):
+    """Cetak setiap event ke layar (untuk demo dan debugging)"""
+    
+    def rule_fired(self, rule, conclusion):
+        print(f"  🔥 {rule.name} FIRED! → '{conclusion}'")
+    
+    def rule_skipped(self, rule, reason):
+        symbol = "⊗" if reason == SKIP_CONCLUSION_EXISTS else "✗"
+        print(f"  {symbol} {rule.name} ({reason})")
+
+
+class CountingListener(RuleListener):
+    """Hitung jumlah event (statistik firing per aturan)"""
+    
+    def __init__(self):
+        self.fired = Counter()     # nama aturan -> jumlah FIRED
+        self.skipped = Counter()   # nama aturan -> jumlah tidak FIRED
+        self.facts_added = 0
+    
+    def rule_fired(self, rule, conclusion):
+        self.fired[rule.name] += 1
+    
+    def rule_skipped(self, rule, reason):
+        self.skipped[rule.name] += 1
+    
+    def fact_added(self, fact):
+        self.facts_added += 1
+
+
+class SamplingListener(RuleListener):
+    """Teruskan hanya sebagian event (rate 0..1) ke listener lain"""
+    
+    def __init__(self, listener, rate=0.01, seed=None):
+        self.listener = listener
+        self.rate = rate
+        self._random = random.Random(seed).random
+    
+    def rule_fired(self, rule, conclusion):
+        if self._random() < self.rate:
+            self.listener.rule_fired(rule, conclusion)
+    
+    def rule_skipped(self, rule, reason):
+        if self._random() < self.rate:
+            self.listener.rule_skipped(rule, reason)
+    
+    def fact_added(self, fact):
+        if self._random() < self.rate:
+            self.listener.fact_added(fact)
+    
+    def rule_added(self, rule):
+        if self._random() < self.rate:
+            self.listener.rule_added(rule)
+
+
+class JsonLinesListener(RuleListener):
+    """Tulis setiap event sebagai satu baris JSON (structured log)"""
+    
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+    
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False, default=str))
+        self.stream.write("\n")
+    
+    def rule_fired(self, rule, conclusion):
+        self._write({'event': 'fired', 'rule': rule.name,
+                     'conclusion': conclusion})
+    
+    def rule_skipped(self, rule, reason):
+        self._write({'event': 'skipped', 'rule': rule.name, 'reason': reason})
+    
+    def fact_added(self, fact):
+        self._write({'event': 'fact_added', 'fact': fact})
+    
+    def rule_added(self, rule):
+        name = rule['name'] if isinstance(rule, dict) else rule.name
+        self._write({'event': 'rule_added', 'rule': name})
+
+
+class MultiListener(RuleListener):
+    """Teruskan event ke beberapa listener sekaligus"""
+    
+    def __init__(self, *listeners):
+        self.listeners = listeners
+    
+    def rule_fired(self, rule, conclusion):
+        for listener in self.listeners:
+            listener.rule_fired(rule, conclusion)
+    
+    def rule_skipped(self, rule, reason):
+        for listener in self.listeners:
+            listener.rule_skipped(rule, reason)
+    
+    def fact_added(self, fact):
+        for listener in self.listeners:
+            listener.fact_added(fact)
+    
+    def rule_added(self, rule):
+        for listener in self.listeners:
+            listener.rule_added(rule)
+
+
+class ProofStore:
+    """
+    Catatan pembuktian (proof DAG) untuk menjelaskan kesimpulan
+    
+    Untuk setiap fakta turunan disimpan aturan yang menurunkannya dan id
+    fakta-fakta premisnya. Semua disimpan di array integer:
+    - rule_of[id]      : nomor aturan (-1 = fakta awal)
+    - premise_start[id]: posisi awal premis di array `premises`
+    - premise_count[id]: jumlah premis
+    
+    Pencatatan per firing hanya beberapa lookup dict dan append array,
+    jadi bisa tetap aktif di produksi. Pohon pembuktian baru dibangun
+    saat explain() dipanggil.
+    """
+    
+    def __init__(self):
+        self.facts = []            # id -> fakta
+        self.rules = []            # nomor aturan -> aturan
+        self._fact_ids = {}
+        self._rule_ids = {}
+        self.rule_of = array("i")
+        self.premise_start = array("i")
+        self.premise_count = array("i")
+        self.premises = array("i")
+    
+    def fact_id(self, fact):
+        """Id fakta (dibuat jika belum ada)"""
+        fact_id = self._fact_ids.get(fact)
+        if fact_id is None:
+            fact_id = self._fact_ids[fact] = len(self.facts)
+            self.facts.append(fact)
+            self.rule_of.append(-1)
+            self.premise_start.append(0)
+            self.premise_count.append(0)
+        return fact_id
+    
+    def record(self, conclusion, rule, premises):
+        """
+        Catat bahwa `rule` menurunkan `conclusion` dari `premises`
+        
+        Hanya pembuktian pertama untuk setiap fakta yang disimpan.
+        """
+        fact_id = self.fact_id(conclusion)
+        if self.rule_of[fact_id] != -1:
+            return
+        rule_id = self._rule_ids.get(rule)
+        if rule_id is None:
+            rule_id = self._rule_ids[rule] = len(self.rules)
+            self.rules.append(rule)
+        fact_id_of = self.fact_id
+        self.rule_of[fact_id] = rule_id
+        self.premise_start[fact_id] = len(self.premises)
+        self.premise_count[fact_id] = len(premises)
+        self.premises.extend(fact_id_of(premise) for premise in premises)
+    
+    def explain(self, fact):
+        """
+        Pohon pembuktian untuk fakta
+        
+        Returns:
+            Dict {'fact', 'rule', 'premises': [...]} (rule None untuk fakta
+            awal), atau None jika fakta tidak pernah dicatat. Sub-pohon
+            yang dipakai beberapa kali adalah objek dict yang sama (DAG).
+        """
+        fact_id = self._fact_ids.get(fact)
+        if fact_id is None:
+            return None
+        nodes = {}
+        stack = [fact_id]
+        while stack:   # iteratif: rantai panjang tidak kena batas rekursi
+            current = stack[-1]
+            if current in nodes:
+                stack.pop()
+                continue
+            start = self.premise_start[current]
+            children = self.premises[start:start + self.premise_count[current]]
+            missing = [child for child in children if child not in nodes]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            rule_id = self.rule_of[current]
+            nodes[current] = {
+                'fact': self.facts[current],
+                'rule': self.rules[rule_id] if rule_id != -1 else None,
+                'premises': [nodes[child] for child in children],
+            }
+        return nodes[fact_id]
+    
+    def format(self, fact):
+        """
+        Penjelasan dalam bentuk teks bertingkat
+        
+        Setiap fakta ditulis sekali dengan nomor #id; premis yang sudah
+        ditulis sebelumnya (DAG) hanya dirujuk dengan "(lihat #id)".
+        """
+        fact_id = self._fact_ids.get(fact)
+        if fact_id is None:
+            return ""
+        lines = []
+        shown = set()
+        stack = [(fact_id, 0)]
+        while stack:   # iteratif, pre-order
+            current, depth = stack.pop()
+            indent = "  " * depth
+            if current in shown:
+                lines.append(f"{indent}• {self.facts[current]} (lihat #{current})")
+                continue
+            shown.add(current)
+            rule_id = self.rule_of[current]
+            if rule_id == -1:
+                lines.append(f"{indent}• {self.facts[current]} (fakta) #{current}")
+                continue
+            lines.append(f"{indent}• {self.facts[current]} ← "
+                         f"{self.rules[rule_id].name} #{current}")
+            start = self.premise_start[current]
+            children = self.premises[start:start + self.premise_count[current]]
+            stack.extend((child, depth + 1) for child in reversed(children))
+        return "\n".join(lines)
+
+
+def _premises(rule, facts):
+    """Premis firing: semua kondisi (AND) atau kondisi pertama yang ada (OR)"""
+    if rule.operator == "AND":
+        return rule.conditions
+    for condition in rule.conditions:
+        if condition in facts:
+            return (condition,)
+    return ()
+
+
 class Rule:
     """
     Representasi aturan IF-THEN
     """
     
-    def __init__(self, name, conditions, conclusion, operator="AND"):
+    def __init__(self, name, conditions, conclusion, operator="AND", salience=0,
+                 negations=()):
         """
         Args:
             name: Nama aturan
             conditions: List kondisi
             conclusion: Kesimpulan
             operator: "AND" atau "OR"
+            salience: Prioritas di agenda (lebih besar = lebih dulu)
+            negations: List fakta yang harus TIDAK ada (negation as failure),
+                       selalu digabung dengan AND
         """
         self.name = name
         self.conditions = conditions
         self.conclusion = conclusion
         self.operator = operator
+        self.salience = salience
+        self.negations = tuple(negations)
     
     def evaluate(self, facts):
         """
@@ -41,6 +322,8 @@ class Rule:
         Returns:
             True jika aturan terpenuhi, False jika tidak
         """
+        if self.negations and any(fact in facts for fact in self.negations):
+            return False
         if self.operator == "AND":
             # Semua kondisi harus terpenuhi
             return all(condition in facts for condition in self.conditions)
@@ -57,30 +340,1204 @@ class Rule:
         """
         return self.evaluate(facts)
     
-    def fire(self, facts):
+    def fire(self, facts, listener=None, proofs=None):
         """
         Eksekusi aturan: tambahkan kesimpulan ke fakta
         
+        Args:
+            facts: Set fakta
+            listener: RuleListener opsional (misal ConsoleListener())
+            proofs: ProofStore opsional untuk mencatat pembuktian
+        
         Returns:
             True jika berhasil dieksekusi, False jika tidak
         """
         if self.can_fire(facts):
             if self.conclusion not in facts:
+                if proofs is not None:
+                    proofs.record(self.conclusion, self, _premises(self, facts))
                 facts.add(self.conclusion)
-                print(f"  🔥 {self.name} FIRED! → '{self.conclusion}'")
+                if listener is not None:
+                    listener.rule_fired(self, self.conclusion)
                 return True
-            else:
-                print(f"  ⊗ {self.name} (kesimpulan sudah ada)")
-                return False
-        else:
-            print(f"  ✗ {self.name} (kondisi tidak terpenuhi)")
+            if listener is not None:
+                listener.rule_skipped(self, SKIP_CONCLUSION_EXISTS)
             return False
+        if listener is not None:
+            listener.rule_skipped(self, SKIP_CONDITIONS_UNMET)
+        return False
     
     def __str__(self):
         conditions_str = f" {self.operator} ".join(self.conditions)
+        for negation in self.negations:
+            conditions_str += f" AND NOT {negation}"
         return f"{self.name}: IF {conditions_str} THEN {self.conclusion}"
 
 
+def _as_rule(rule):
+    """
+    Normalisasi aturan: terima objek Rule atau dict dari KnowledgeBase.rules
+    ({'name', 'conditions', 'conclusion'}, opsional 'operator')
+    """
+    if isinstance(rule, Rule):
+        return rule
+    return Rule(
+        rule['name'],
+        rule['conditions'],
+        rule['conclusion'],
+        rule.get('operator', "AND"),
+        rule.get('salience', 0),
+        rule.get('negations', ())
+    )
+
+
+def stratify(rules):
+    """
+    Strata aturan untuk negation as failure
+    
+    Strata kesimpulan >= strata kondisinya, dan > strata fakta yang
+    dinegasikan. Aturan di strata k baru boleh FIRED setelah semua aturan
+    di strata < k selesai, sehingga fakta yang dinegasikan sudah final.
+    
+    Returns:
+        List strata (0, 1, ...) per aturan, sesuai urutan `rules`
+    
+    Raises:
+        ValueError: jika ada negasi di dalam siklus (tidak bisa distratifikasi)
+    """
+    users = {}   # fakta -> nomor aturan yang memakainya (positif/negasi)
+    for number, rule in enumerate(rules):
+        for fact in (*rule.conditions, *rule.negations):
+            users.setdefault(fact, []).append(number)
+    level = {}
+    work = list(range(len(rules)))
+    while work:
+        rule = rules[work.pop()]
+        needed = max((level.get(c, 0) for c in rule.conditions), default=0)
+        for negation in rule.negations:
+            needed = max(needed, level.get(negation, 0) + 1)
+        if needed > level.get(rule.conclusion, 0):
+            if needed > len(rules):
+                raise ValueError(
+                    f"Aturan tidak bisa distratifikasi: negasi di dalam "
+                    f"siklus melalui '{rule.conclusion}'"
+                )
+            level[rule.conclusion] = needed
+            work.extend(users.get(rule.conclusion, ()))
+    return [level.get(rule.conclusion, 0) for rule in rules]
+
+
+class Activation:
+    """Aturan yang siap FIRED, beserta time tag fakta yang memicunya"""
+    
+    __slots__ = ("rule", "time_tags", "active")
+    
+    def __init__(self, rule, time_tags):
+        self.rule = rule
+        self.time_tags = time_tags
+        self.active = True
+    
+    def __repr__(self):
+        return f"Activation({self.rule.name}, {self.time_tags})"
+
+
+def _recency(time_tags):
+    """
+    Kunci LEX: time tag diurutkan dari yang terbaru, dinegasikan agar
+    cocok untuk min-heap. Penanda 0 di akhir membuat daftar yang lebih
+    panjang menang jika prefiksnya sama (aturan OPS5).
+    """
+    return tuple(-tag for tag in sorted(time_tags, reverse=True)) + (0,)
+
+
+class Agenda:
+    """
+    Agenda: antrian prioritas aktivasi aturan (conflict resolution)
+    
+    Strategi (selalu didahului salience, lalu urutan masuk):
+    - "salience"   : hanya salience
+    - "lex"        : fakta paling baru (recency) lebih dulu
+    - "mea"        : recency kondisi pertama dulu, lalu seperti LEX
+    - "specificity": aturan dengan kondisi lebih banyak lebih dulu
+    
+    push/pop O(log n) dengan heap. Aktivasi yang hilang (misal
+    kesimpulannya sudah ada) ditandai tidak aktif dan dibuang saat
+    sampai di puncak heap (lazy deletion).
+    """
+    
+    STRATEGIES = ("salience", "lex", "mea", "specificity")
+    
+    def __init__(self, strategy="lex"):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Strategi tidak dikenal: {strategy}")
+        self.strategy = strategy
+        self._heap = []
+        self._counter = 0
+        self._active = 0
+    
+    def _key(self, rule, time_tags):
+        salience = -rule.salience
+        if self.strategy == "lex":
+            return (salience, _recency(time_tags), -len(rule.conditions))
+        if self.strategy == "mea":
+            first = -time_tags[0] if time_tags else 0
+            return (salience, first, _recency(time_tags), -len(rule.conditions))
+        if self.strategy == "specificity":
+            return (salience, -len(rule.conditions))
+        return (salience,)
+    
+    def push(self, rule, time_tags=()):
+        """
+        Tambahkan aktivasi
+        
+        Args:
+            rule: Aturan yang siap FIRED
+            time_tags: Time tag fakta yang memenuhi kondisinya
+                       (urutan sesuai rule.conditions)
+        
+        Returns:
+            Activation (bisa dipakai untuk remove)
+        """
+        activation = Activation(rule, tuple(time_tags))
+        self._counter += 1
+        heapq.heappush(self._heap, (self._key(rule, activation.time_tags),
+                                    self._counter, activation))
+        self._active += 1
+        return activation
+    
+    def remove(self, activation):
+        """Batalkan aktivasi (O(1), dibuang dari heap nanti)"""
+        if activation.active:
+            activation.active = False
+            self._active -= 1
+    
+    def pop(self):
+        """
+        Ambil aktivasi dengan prioritas tertinggi
+        
+        Returns:
+            Activation, atau None jika agenda kosong
+        """
+        heap = self._heap
+        while heap:
+            activation = heapq.heappop(heap)[2]
+            if activation.active:
+                activation.active = False
+                self._active -= 1
+                return activation
+        return None
+    
+    def __len__(self):
+        return self._active
+
+
+class _AlphaNode:
+    """Node alpha: satu kondisi (dipakai bersama oleh semua aturan)"""
+    
+    __slots__ = ("condition", "present", "joins")
+    
+    def __init__(self, condition):
+        self.condition = condition
+        self.present = False   # alpha memory: apakah fakta sudah ada
+        self.joins = []        # join node yang memakai alpha ini (right input)
+
+
+class _JoinNode:
+    """
+    Node beta (join): prefix kondisi AND yang sudah terpenuhi
+    
+    Node dengan prefix yang sama dipakai bersama oleh beberapa aturan.
+    """
+    
+    __slots__ = ("parent", "alpha", "satisfied", "children", "productions")
+    
+    def __init__(self, parent, alpha):
+        self.parent = parent        # left input (None = root)
+        self.alpha = alpha          # right input
+        self.satisfied = False      # beta memory
+        self.children = []          # join node berikutnya
+        self.productions = []       # aturan yang selesai di node ini
+
+
+class ReteNetwork:
+    """
+    Jaringan Rete untuk forward chaining proposisional
+    
+    Aturan dikompilasi sekali menjadi jaringan alpha/beta:
+    - Alpha node: satu per kondisi unik (dipakai bersama)
+    - Join node: satu per prefix kondisi AND (dipakai bersama)
+    
+    Saat fakta baru ditambahkan, hanya node yang memakai fakta tersebut
+    yang diperiksa ulang. Biaya matching sebanding dengan perubahan (delta),
+    bukan jumlah aturan x jumlah fakta.
+    
+    Contoh:
+        net = ReteNetwork(rules)      # Rule atau KnowledgeBase.rules
+        net.add_facts(["pagi", "mata terbuka"])
+        net.facts                     # termasuk semua kesimpulan
+    
+    Tanpa agenda, aktivasi diproses sesuai urutan munculnya (FIFO).
+    Dengan agenda (misal Agenda("lex")), urutan FIRED mengikuti strategi
+    conflict resolution; setiap fakta diberi time tag untuk recency.
+    
+    Aturan dengan negasi ditahan sampai semua aktivasi strata di bawahnya
+    habis, lalu negasinya dicek saat FIRED. Kesimpulan yang sudah FIRED
+    tidak ditarik jika fakta yang dinegasikan ditambahkan belakangan.
+    """
+    
+    def __init__(self, rules, listener=None, agenda=None, proofs=None):
+        self.rules = [_as_rule(rule) for rule in rules]
+        self.listener = listener
+        self.agenda = agenda
+        self.proofs = proofs
+        self.time_tags = {}        # fakta -> time tag (urutan masuk)
+        self._waiting = {}         # kesimpulan -> aktivasi di agenda
+        self.facts = set()
+        self.fired = []            # urutan aturan yang FIRED
+        self._alphas = {}          # condition -> _AlphaNode
+        self._joins = {}           # prefix kondisi (tuple) -> _JoinNode
+        self._unconditional = []   # aturan AND tanpa kondisi
+        # Kondisi yang paling sering dipakai diletakkan di depan,
+        # sehingga lebih banyak prefix join yang bisa dipakai bersama
+        self._frequency = Counter(
+            condition for rule in self.rules for condition in set(rule.conditions)
+        )
+        for rule in self.rules:
+            self._compile(rule)
+        self._strata = None        # aturan -> strata (hanya jika ada negasi)
+        if any(rule.negations for rule in self.rules):
+            self._strata = dict(zip(self.rules, stratify(self.rules)))
+        self._level = 0            # strata yang sedang diproses
+        self._deferred = {}        # strata -> aktivasi yang ditahan
+        self._pending = deque()
+        for rule in self._unconditional:
+            self._activate(rule, None)
+        self._run(hold=True)   # negasi baru dicek setelah fakta pertama masuk
+    
+    def _alpha(self, condition):
+        node = self._alphas.get(condition)
+        if node is None:
+            node = self._alphas[condition] = _AlphaNode(condition)
+        return node
+    
+    def _join(self, prefix):
+        """Ambil (atau buat) join node untuk prefix kondisi"""
+        node = self._joins.get(prefix)
+        if node is None:
+            parent = self._join(prefix[:-1]) if len(prefix) > 1 else None
+            alpha = self._alpha(prefix[-1])
+            node = self._joins[prefix] = _JoinNode(parent, alpha)
+            alpha.joins.append(node)
+            if parent is not None:
+                parent.children.append(node)
+        return node
+    
+    def _compile(self, rule):
+        # Urutan kanonik agar prefix yang sama bisa dipakai bersama
+        frequency = self._frequency
+        conditions = tuple(sorted(set(rule.conditions),
+                                  key=lambda c: (-frequency[c], c)))
+        if rule.operator == "AND":
+            if conditions:
+                self._join(conditions).productions.append(rule)
+            else:
+                self._unconditional.append(rule)  # all([]) selalu True
+        elif rule.operator == "OR":
+            for condition in conditions:
+                self._join((condition,)).productions.append(rule)
+        else:
+            raise ValueError(f"Operator tidak dikenal: {rule.operator}")
+    
+    def add_fact(self, fact):
+        """
+        Tambahkan fakta dan jalankan inferensi inkremental
+        
+        Returns:
+            List aturan yang FIRED akibat fakta ini (termasuk rantainya)
+        """
+        start = len(self.fired)
+        self._insert(fact)
+        self._run()
+        return self.fired[start:]
+    
+    def add_facts(self, facts):
+        """Tambahkan banyak fakta sekaligus"""
+        start = len(self.fired)
+        for fact in facts:
+            self._insert(fact)
+        self._run()
+        return self.fired[start:]
+    
+    def _insert(self, fact):
+        if fact in self.facts:
+            return
+        self.facts.add(fact)
+        self.time_tags[fact] = len(self.time_tags) + 1
+        if self.listener is not None:
+            self.listener.fact_added(fact)
+        if self.agenda is not None:
+            # Aktivasi dengan kesimpulan ini tidak lagi berguna
+            for activation in self._waiting.pop(fact, ()):
+                self.agenda.remove(activation)
+        alpha = self._alphas.get(fact)
+        if alpha is None:
+            return  # tidak ada aturan yang memakai fakta ini
+        alpha.present = True
+        stack = [join for join in alpha.joins
+                 if join.parent is None or join.parent.satisfied]
+        while stack:
+            join = stack.pop()
+            if join.satisfied:
+                continue
+            join.satisfied = True
+            for rule in join.productions:
+                self._activate(rule, join)
+            stack.extend(child for child in join.children
+                         if child.alpha.present)
+    
+    def _activate(self, rule, join):
+        if self._strata is not None and self._strata[rule] > self._level:
+            self._deferred.setdefault(self._strata[rule], []).append((rule, join))
+            return
+        self._schedule(rule, join)
+    
+    def _schedule(self, rule, join):
+        if self.agenda is None:
+            self._pending.append(rule)
+            return
+        if rule.conclusion in self.facts:
+            return
+        if rule.operator == "OR":
+            time_tags = (self.time_tags[join.alpha.condition],)
+        else:
+            time_tags = tuple(self.time_tags[c] for c in rule.conditions)
+        activation = self.agenda.push(rule, time_tags)
+        self._waiting.setdefault(rule.conclusion, []).append(activation)
+    
+    def _next(self):
+        if self.agenda is None:
+            return self._pending.popleft() if self._pending else None
+        activation = self.agenda.pop()
+        return activation.rule if activation is not None else None
+    
+    def _run(self, hold=False):
+        while True:
+            rule = self._next()
+            if rule is None:
+                if hold or not self._deferred:
+                    break
+                # Strata di bawahnya selesai: lepaskan strata berikutnya
+                self._level = min(self._deferred)
+                for rule, join in self._deferred.pop(self._level):
+                    self._schedule(rule, join)
+                continue
+            if rule.negations and any(f in self.facts for f in rule.negations):
+                if self.listener is not None:
+                    self.listener.rule_skipped(rule, SKIP_CONDITIONS_UNMET)
+                continue
+            if rule.conclusion not in self.facts:
+                self.fired.append(rule)
+                if self.proofs is not None:
+                    self.proofs.record(rule.conclusion, rule,
+                                       _premises(rule, self.facts))
+                if self.listener is not None:
+                    self.listener.rule_fired(rule, rule.conclusion)
+                self._insert(rule.conclusion)
+            elif self.listener is not None:
+                self.listener.rule_skipped(rule, SKIP_CONCLUSION_EXISTS)
+        self._level = 0
+    
+    def stats(self):
+        """Jumlah node di jaringan (untuk melihat efek sharing)"""
+        return {
+            'rules': len(self.rules),
+            'alpha_nodes': len(self._alphas),
+            'join_nodes': len(self._joins),
+        }
+
+
+class ForwardChainer:
+    """
+    Forward chaining linear (algoritma Dowling-Gallier)
+    
+    Setiap aturan punya penghitung kondisi yang belum terpenuhi, dan ada
+    index kondisi -> aturan yang memakainya. Setiap fakta baru hanya
+    mengurangi penghitung aturan yang menyebutnya; aturan FIRED saat
+    penghitungnya mencapai 0.
+    
+    Tidak bergantung urutan aturan, dan setiap fakta/kondisi diproses
+    sekali, sehingga total waktu linear terhadap ukuran basis aturan.
+    
+    Aturan dengan negasi: aturan yang siap di strata lebih tinggi ditahan
+    sampai strata di bawahnya selesai, lalu negasinya dicek (satu lookup
+    set per fakta yang dinegasikan).
+    """
+    
+    def __init__(self, rules):
+        self.rules = [_as_rule(rule) for rule in rules]
+        self._watchers = {}        # kondisi -> nomor aturan yang memakainya
+        self._needed = []          # nomor aturan -> jumlah kondisi dibutuhkan
+        self._unconditional = []   # aturan AND tanpa kondisi
+        for number, rule in enumerate(self.rules):
+            conditions = set(rule.conditions)
+            if rule.operator == "AND":
+                needed = len(conditions)
+                if not conditions:
+                    self._unconditional.append(number)
+            elif rule.operator == "OR":
+                needed = 1 if conditions else -1   # OR kosong tidak pernah FIRED
+            else:
+                raise ValueError(f"Operator tidak dikenal: {rule.operator}")
+            self._needed.append(needed)
+            for condition in conditions:
+                self._watchers.setdefault(condition, []).append(number)
+        self._strata = None        # nomor aturan -> strata (jika ada negasi)
+        if any(rule.negations for rule in self.rules):
+            self._strata = stratify(self.rules)
+    
+    def run(self, facts, listener=None, proofs=None):
+        """
+        Jalankan forward chaining sampai tidak ada kesimpulan baru
+        
+        Args:
+            facts: Set fakta, kesimpulan baru ditambahkan ke set ini
+            listener: RuleListener opsional
+            proofs: ProofStore opsional untuk mencatat pembuktian
+        
+        Returns:
+            List aturan yang FIRED (sesuai urutan)
+        """
+        rules = self.rules
+        watchers = self._watchers
+        strata = self._strata
+        remaining = list(self._needed)
+        fired = []
+        queue = deque(facts)
+        deferred = {}              # strata -> [(nomor aturan, pemicu)]
+        level = 0
+        
+        def conclude(number, trigger):
+            rule = rules[number]
+            if strata is not None and strata[number] > level:
+                deferred.setdefault(strata[number], []).append((number, trigger))
+                return
+            if rule.negations and any(f in facts for f in rule.negations):
+                if listener is not None:
+                    listener.rule_skipped(rule, SKIP_CONDITIONS_UNMET)
+                return
+            if rule.conclusion not in facts:
+                if proofs is not None:
+                    premises = rule.conditions if rule.operator == "AND" else (trigger,)
+                    proofs.record(rule.conclusion, rule, premises)
+                facts.add(rule.conclusion)
+                fired.append(rule)
+                queue.append(rule.conclusion)
+                if listener is not None:
+                    listener.rule_fired(rule, rule.conclusion)
+                    listener.fact_added(rule.conclusion)
+            elif listener is not None:
+                listener.rule_skipped(rule, SKIP_CONCLUSION_EXISTS)
+        
+        for number in self._unconditional:
+            conclude(number, None)
+        while True:
+            while queue:
+                fact = queue.popleft()
+                for number in watchers.get(fact, ()):
+                    remaining[number] -= 1
+                    if remaining[number] == 0:
+                        conclude(number, fact)
+            if not deferred:
+                return fired
+            level = min(deferred)
+            for number, trigger in deferred.pop(level):
+                conclude(number, trigger)
+
+
+class RuleProgram(ForwardChainer):
+    """
+    Basis aturan yang dikompilasi sekali dan dipakai bersama banyak sesi
+    
+    Contoh:
+        program = RuleProgram(kb.rules, base_facts=kb.facts)
+        session = program.session()      # murah, satu per user/request
+        session.add_facts(["demam", "batuk"])
+    
+    Program (index aturan + fakta dasar beserta kesimpulannya) tidak
+    pernah diubah setelah dibuat. Setiap sesi hanya menyimpan:
+    - fakta yang ditambahkan sesi itu (copy-on-write di atas fakta dasar)
+    - penghitung aturan yang benar-benar disentuh sesi itu
+    
+    Jadi membuat sesi hampir tanpa biaya dan memori sesi tidak tumbuh
+    mengikuti jumlah aturan.
+    
+    Fakta dasar diproses sampai strata terakhir (termasuk aturan dengan
+    negasi), sehingga sesi baru sudah berisi closure lengkap, sama
+    dengan ForwardChainer.run(base_facts). Seperti ReteNetwork, fakta
+    yang ditambahkan kemudian tidak menarik kembali kesimpulan negasi
+    yang sudah ada.
+    """
+    
+    def __init__(self, rules, base_facts=()):
+        super().__init__(rules)
+        self._watchers = {condition: tuple(numbers)
+                          for condition, numbers in self._watchers.items()}
+        self._needed = tuple(self._needed)
+        
+        # Fakta dasar dan kesimpulannya dihitung sekali untuk semua sesi
+        # (pembuktiannya di base_proofs; di ProofStore sesi fakta dasar
+        # tampil sebagai daun)
+        base = set(base_facts)
+        self.base_proofs = ProofStore()
+        fired = self.run(base, proofs=self.base_proofs)
+        self.base_facts = frozenset(base)
+        self.base_fired = tuple(fired)
+        remaining = {}
+        for fact in self.base_facts:
+            for number in self._watchers.get(fact, ()):
+                remaining[number] = remaining.get(number, self._needed[number]) - 1
+        self._base_remaining = remaining
+    
+    def session(self, listener=None, proofs=None):
+        """Buat working memory baru untuk satu sesi"""
+        return Session(self, listener, proofs)
+
+
+class Session:
+    """
+    Working memory satu sesi di atas RuleProgram yang dipakai bersama
+    """
+    
+    def __init__(self, program, listener=None, proofs=None):
+        self.program = program
+        self.listener = listener
+        self.proofs = proofs
+        self.local_facts = set()   # hanya fakta milik sesi ini
+        self.fired = []
+        self._remaining = {}       # nomor aturan -> penghitung (yang disentuh)
+    
+    def __contains__(self, fact):
+        return fact in self.local_facts or fact in self.program.base_facts
+    
+    @property
+    def facts(self):
+        """Semua fakta sesi (fakta dasar + fakta sesi), dibuat saat diminta"""
+        return self.program.base_facts | self.local_facts
+    
+    def add_fact(self, fact):
+        """Tambahkan fakta; Returns: list aturan yang FIRED"""
+        return self.add_facts([fact])
+    
+    def add_facts(self, facts):
+        """Tambahkan banyak fakta; Returns: list aturan yang FIRED"""
+        program = self.program
+        rules = program.rules
+        watchers = program._watchers
+        needed = program._needed
+        base_remaining = program._base_remaining
+        remaining = self._remaining
+        strata = program._strata
+        listener = self.listener
+        start = len(self.fired)
+        queue = deque()
+        deferred = {}              # strata -> [(nomor aturan, pemicu)]
+        level = 0
+        
+        for fact in facts:
+            if fact not in self:
+                self.local_facts.add(fact)
+                queue.append(fact)
+                if listener is not None:
+                    listener.fact_added(fact)
+        
+        while True:
+            while queue:
+                fact = queue.popleft()
+                for number in watchers.get(fact, ()):
+                    count = remaining.get(number)
+                    if count is None:
+                        count = base_remaining.get(number, needed[number])
+                    remaining[number] = count = count - 1
+                    if count != 0:
+                        continue
+                    if strata is not None and strata[number] > level:
+                        deferred.setdefault(strata[number], []).append((number, fact))
+                        continue
+                    self._conclude(rules[number], fact, queue)
+            if not deferred:
+                return self.fired[start:]
+            level = min(deferred)
+            for number, trigger in deferred.pop(level):
+                self._conclude(rules[number], trigger, queue)
+    
+    def _conclude(self, rule, trigger, queue):
+        listener = self.listener
+        if rule.conclusion in self:
+            if listener is not None:
+                listener.rule_skipped(rule, SKIP_CONCLUSION_EXISTS)
+            return
+        if rule.negations and any(fact in self for fact in rule.negations):
+            if listener is not None:
+                listener.rule_skipped(rule, SKIP_CONDITIONS_UNMET)
+            return
+        if self.proofs is not None:
+            premises = rule.conditions if rule.operator == "AND" else (trigger,)
+            self.proofs.record(rule.conclusion, rule, premises)
+        self.local_facts.add(rule.conclusion)
+        self.fired.append(rule)
+        queue.append(rule.conclusion)
+        if listener is not None:
+            listener.rule_fired(rule, rule.conclusion)
+            listener.fact_added(rule.conclusion)
+
+
+class RuleGraph:
+    """
+    Graf ketergantungan antar aturan
+    
+    Aturan A -> B jika kesimpulan A dipakai B (sebagai kondisi atau
+    negasi). Komponen terhubung kuat (SCC, algoritma Tarjan) adalah
+    kelompok aturan yang saling bergantung (siklus); graf komponennya
+    tidak bersiklus, sehingga bisa dievaluasi berurutan secara topologis.
+    
+    Atribut:
+        components: List komponen (list nomor aturan), urutan topologis
+        cyclic:     Per komponen, True jika perlu iterasi sampai fixpoint
+        layers:     Komponen per lapis; komponen di lapis yang sama tidak
+                    saling bergantung dan boleh dievaluasi bersamaan
+    """
+    
+    def __init__(self, rules):
+        self.rules = [_as_rule(rule) for rule in rules]
+        producers = {}   # fakta -> nomor aturan yang menyimpulkannya
+        for number, rule in enumerate(self.rules):
+            producers.setdefault(rule.conclusion, []).append(number)
+        self.edges = [[] for _ in self.rules]   # nomor aturan -> pemakai
+        for number, rule in enumerate(self.rules):
+            for fact in set(rule.conditions).union(rule.negations):
+                for producer in producers.get(fact, ()):
+                    self.edges[producer].append(number)
+        
+        self.components = self._strongly_connected()
+        self.component_of = array("i", [0]) * len(self.rules)
+        for index, component in enumerate(self.components):
+            for number in component:
+                self.component_of[number] = index
+        self.cyclic = [
+            len(component) > 1 or component[0] in self.edges[component[0]]
+            for component in self.components
+        ]
+        
+        # Lapis = 1 + lapis terdalam komponen yang dibutuhkan
+        depth = [0] * len(self.components)
+        for index, component in enumerate(self.components):
+            for number in component:
+                rule = self.rules[number]
+                for negation in rule.negations:
+                    for producer in producers.get(negation, ()):
+                        if self.component_of[producer] == index:
+                            raise ValueError(
+                                f"Aturan tidak bisa distratifikasi: negasi "
+                                f"'{negation}' di dalam siklus {rule.name}"
+                            )
+                for user in self.edges[number]:
+                    target = self.component_of[user]
+                    if target != index:
+                        depth[target] = max(depth[target], depth[index] + 1)
+        self.layers = [[] for _ in range(max(depth, default=-1) + 1)]
+        for index, layer in enumerate(depth):
+            self.layers[layer].append(index)
+    
+    def _strongly_connected(self):
+        """Tarjan iteratif; hasil dibalik menjadi urutan topologis"""
+        edges = self.edges
+        index_of = [-1] * len(edges)
+        low = [0] * len(edges)
+        on_stack = [False] * len(edges)
+        stack = []
+        components = []
+        counter = 0
+        for root in range(len(edges)):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index_of[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                successors = edges[node]
+                while position < len(successors):
+                    successor = successors[position]
+                    position += 1
+                    if index_of[successor] == -1:
+                        work.append((node, position))
+                        work.append((successor, 0))
+                        break
+                    if on_stack[successor]:
+                        low[node] = min(low[node], index_of[successor])
+                else:
+                    if low[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component))
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        components.reverse()
+        return components
+
+
+_worker_rules = None   # aturan di proses worker (diisi _init_worker)
+
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _evaluate_components(components, facts, rules=None):
+    """
+    Evaluasi komponen secara berurutan terhadap `facts` (diubah)
+    
+    Komponen tanpa siklus cukup dievaluasi sekali; komponen bersiklus
+    diulang sampai tidak ada kesimpulan baru.
+    
+    Returns:
+        List nomor aturan yang FIRED
+    """
+    rules = rules if rules is not None else _worker_rules
+    fired = []
+    for numbers, cyclic in components:
+        changed = True
+        while changed:
+            changed = False
+            for number in numbers:
+                rule = rules[number]
+                if rule.conclusion not in facts and rule.evaluate(facts):
+                    facts.add(rule.conclusion)
+                    fired.append(number)
+                    changed = cyclic
+    return fired
+
+
+class ParallelChainer:
+    """
+    Forward chaining per lapis RuleGraph, lapis besar dibagi ke process pool
+    
+    Komponen di satu lapis tidak saling bergantung, jadi bisa dievaluasi
+    di proses berbeda. Setiap proses hanya menerima nomor komponen dan
+    fakta yang dipakai komponen itu; aturan dikirim sekali saat worker
+    dibuat. Lapis kecil dievaluasi langsung, karena biaya kirim ke proses
+    lain lebih mahal daripada evaluasinya.
+    
+    Basis aturan yang hampir tanpa siklus selesai dalam satu lintasan
+    topologis; hanya komponen bersiklus yang diulang sampai fixpoint.
+    """
+    
+    def __init__(self, rules, processes=None, min_parallel=2000):
+        """
+        Args:
+            rules: List Rule atau dict aturan
+            processes: Jumlah proses (None = jumlah CPU, 1 = tanpa pool)
+            min_parallel: Jumlah aturan minimum di satu lapis agar
+                          lapis itu dikirim ke process pool
+        """
+        self.graph = RuleGraph(rules)
+        self.rules = self.graph.rules
+        self.processes = processes or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+    
+    def run(self, facts, listener=None):
+        """
+        Jalankan forward chaining sampai tidak ada kesimpulan baru
+        
+        Args:
+            facts: Set fakta, kesimpulan baru ditambahkan ke set ini
+            listener: RuleListener opsional (dipanggil di proses utama)
+        
+        Returns:
+            List aturan yang FIRED (per lapis)
+        """
+        graph = self.graph
+        rules = self.rules
+        fired = []
+        pool = None
+        try:
+            for layer in graph.layers:
+                components = [(graph.components[index], graph.cyclic[index])
+                              for index in layer]
+                size = sum(len(numbers) for numbers, _ in components)
+                if self.processes < 2 or size < self.min_parallel:
+                    numbers = _evaluate_components(components, facts, rules)
+                else:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(
+                            self.processes, initializer=_init_worker,
+                            initargs=(rules,))
+                    numbers = self._run_layer(pool, components, facts)
+                for number in numbers:
+                    rule = rules[number]
+                    facts.add(rule.conclusion)
+                    fired.append(rule)
+                    if listener is not None:
+                        listener.rule_fired(rule, rule.conclusion)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return fired
+    
+    def _run_layer(self, pool, components, facts):
+        # Bagi komponen ke beberapa potongan dengan jumlah aturan seimbang
+        chunks = [[] for _ in range(self.processes)]
+        sizes = [0] * self.processes
+        for component in sorted(components, key=lambda c: -len(c[0])):
+            smallest = sizes.index(min(sizes))
+            chunks[smallest].append(component)
+            sizes[smallest] += len(component[0])
+        rules = self.rules
+        futures = []
+        for chunk in chunks:
+            if not chunk:
+                continue
+            needed = {fact
+                      for numbers, _ in chunk for number in numbers
+                      for fact in (*rules[number].conditions, *rules[number].negations)
+                      if fact in facts}
+            futures.append(pool.submit(_evaluate_components, chunk, needed))
+        
+        # Kesimpulan yang sama bisa diturunkan di dua proses: ambil sekali
+        numbers = []
+        seen = set()
+        for future in futures:
+            for number in future.result():
+                conclusion = rules[number].conclusion
+                if conclusion not in seen and conclusion not in facts:
+                    seen.add(conclusion)
+                    numbers.append(number)
+        return numbers
+
+
+def _set_bits(mask):
+    """Posisi bit yang bernilai 1 (dibaca dari representasi biner)"""
+    digits = bin(mask)[:1:-1]   # bit terendah lebih dulu, tanpa '0b'
+    positions = []
+    position = digits.find("1")
+    while position != -1:
+        positions.append(position)
+        position = digits.find("1", position + 1)
+    return positions
+
+
+class BitsetRuleSet:
+    """
+    Aturan proposisional yang dikompilasi menjadi bitmask integer
+    
+    Setiap kondisi/kesimpulan mendapat satu posisi bit, sehingga
+    himpunan fakta menjadi satu integer. Aturan juga diberi nomor bit,
+    dan untuk setiap kondisi disimpan bitmask aturan yang memakainya.
+    
+    Evaluasi semua aturan sekaligus:
+    - OR  : aturan terpenuhi = gabungan (|) aturan dari kondisi yang ADA
+    - AND : aturan gagal     = gabungan (|) aturan dari kondisi yang TIDAK ada
+            atau per mask aturan: mask & facts == mask
+    
+    Operasi | dan & pada integer Python dikerjakan per 64 bit sekaligus,
+    jadi 100 ribu aturan cukup beberapa operasi integer besar.
+    
+    Negasi: aturan diblokir = gabungan (|) aturan yang menegasikan fakta
+    yang ADA. closure() menjalankan aturan per strata.
+    """
+    
+    def __init__(self, rules):
+        self.rules = [_as_rule(rule) for rule in rules]
+        self.bits = {}               # kondisi/kesimpulan -> posisi bit
+        self.symbols = []            # posisi bit -> kondisi/kesimpulan
+        self._and_rules = 0          # bitmask aturan AND
+        self._or_rules = 0           # bitmask aturan OR
+        self._used_by = []           # posisi bit -> bitmask aturan
+        self._and_masks = {}         # mask kondisi -> bitmask aturan AND
+        self._conclusion_bit = []    # nomor aturan -> bit kesimpulan
+        self._negated_by = []        # posisi bit -> bitmask aturan yang menegasikan
+        self._has_negations = False
+        
+        for number, rule in enumerate(self.rules):
+            rule_bit = 1 << number
+            mask = 0
+            for condition in rule.conditions:
+                bit = self._bit(condition)
+                mask |= 1 << bit
+                self._used_by[bit] |= rule_bit
+            for negation in rule.negations:
+                self._negated_by[self._bit(negation)] |= rule_bit
+                self._has_negations = True
+            if rule.operator == "AND":
+                self._and_rules |= rule_bit
+                self._and_masks[mask] = self._and_masks.get(mask, 0) | rule_bit
+            elif rule.operator == "OR":
+                self._or_rules |= rule_bit
+            else:
+                raise ValueError(f"Operator tidak dikenal: {rule.operator}")
+            self._conclusion_bit.append(self._bit(rule.conclusion))
+        
+        # Mask AND dikelompokkan per satu bit kondisinya (yang dipakai
+        # paling sedikit aturan): saat sedikit fakta ADA, satisfied() hanya
+        # memeriksa mask milik bit yang ada, bukan semua mask
+        self._and_by_bit = {}        # posisi bit -> {mask kondisi: bitmask aturan}
+        self._unconditional = 0      # aturan AND tanpa kondisi
+        users = [bin(rules).count("1") for rules in self._used_by]
+        for mask, rules in self._and_masks.items():
+            if not mask:
+                self._unconditional |= rules
+                continue
+            bit = min(_set_bits(mask), key=users.__getitem__)
+            self._and_by_bit.setdefault(bit, {})[mask] = rules
+        
+        # Bitmask aturan yang boleh FIRED sampai strata k (kumulatif)
+        self._strata_masks = [(1 << len(self.rules)) - 1]
+        if self._has_negations:
+            levels = stratify(self.rules)
+            self._strata_masks = [0] * (max(levels) + 1)
+            for number, level in enumerate(levels):
+                self._strata_masks[level] |= 1 << number
+            for k in range(1, len(self._strata_masks)):
+                self._strata_masks[k] |= self._strata_masks[k - 1]
+    
+    def _bit(self, symbol):
+        bit = self.bits.get(symbol)
+        if bit is None:
+            bit = self.bits[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._used_by.append(0)
+            self._negated_by.append(0)
+        return bit
+    
+    def encode(self, facts):
+        """Himpunan fakta -> bitmask (fakta yang tidak dikenal diabaikan)"""
+        bits = self.bits
+        mask = 0
+        for fact in facts:
+            bit = bits.get(fact)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def decode(self, mask):
+        """Bitmask -> himpunan fakta"""
+        return {self.symbols[bit] for bit in _set_bits(mask)}
+    
+    def satisfied(self, facts_mask):
+        """
+        Aturan yang terpenuhi oleh fakta
+        
+        Returns:
+            Bitmask nomor aturan (bit i = self.rules[i] terpenuhi)
+        """
+        present = _set_bits(facts_mask)
+        used_by = self._used_by
+        
+        matched = 0
+        for bit in present:
+            matched |= used_by[bit]
+        result = matched & self._or_rules
+        
+        absent_count = len(self.symbols) - len(present)
+        if absent_count <= len(present):
+            # Sedikit kondisi yang tidak ada: kumpulkan aturan yang gagal
+            blocked = 0
+            for bit in _set_bits(~facts_mask & ((1 << len(self.symbols)) - 1)):
+                blocked |= used_by[bit]
+            result |= self._and_rules & ~blocked
+        else:
+            # Sedikit fakta: cek hanya mask yang bit pengawasnya ada
+            result |= self._unconditional
+            and_by_bit = self._and_by_bit
+            for bit in present:
+                group = and_by_bit.get(bit)
+                if group is not None:
+                    for mask, rules in group.items():
+                        if mask & facts_mask == mask:
+                            result |= rules
+        
+        if self._has_negations:
+            negated_by = self._negated_by
+            blocked = 0
+            for bit in present:
+                blocked |= negated_by[bit]
+            result &= ~blocked
+        return result
+    
+    def evaluate(self, facts):
+        """List aturan yang terpenuhi (sama dengan Rule.evaluate per aturan)"""
+        rules = self.rules
+        return [rules[i] for i in _set_bits(self.satisfied(self.encode(facts)))]
+    
+    def closure(self, facts):
+        """
+        Forward chaining sampai fixpoint
+        
+        Returns:
+            Himpunan fakta awal + semua kesimpulan
+        """
+        facts = set(facts)
+        mask = self.encode(facts)
+        fired = 0
+        conclusion_bit = self._conclusion_bit
+        for allowed in self._strata_masks:
+            while True:
+                new_rules = self.satisfied(mask) & allowed & ~fired
+                if not new_rules:
+                    break
+                fired |= new_rules
+                for number in _set_bits(new_rules):
+                    mask |= 1 << conclusion_bit[number]
+        return facts | self.decode(mask)
+
+
+class BackwardChainer:
+    """
+    Backward chaining (goal-driven) dengan tabling
+    
+    prove(goal) bekerja mundur: cari aturan yang kesimpulannya goal,
+    lalu buktikan kondisi-kondisinya sebagai sub-goal. Hanya aturan yang
+    relevan dengan goal yang disentuh, tanpa menghitung semua kesimpulan.
+    
+    Tabling:
+    - Sub-goal yang sudah terbukti / gagal disimpan dan tidak dihitung ulang
+    - Sub-goal yang sedang dibuktikan (siklus aturan) dianggap belum
+      terbukti di jalur itu, sehingga siklus tidak rekursi selamanya
+    - Kegagalan yang bergantung pada goal di dalam siklus baru disimpan
+      setelah goal pemimpin siklus itu selesai
+    
+    Negasi: fakta yang dinegasikan dibuktikan penuh dengan prove()
+    tersendiri. Aturan harus bisa distratifikasi, sehingga pembuktian itu
+    tidak pernah bergantung pada goal yang sedang dibuktikan.
+    
+    Tabel berlaku untuk isi `facts` saat ini; panggil reset() jika fakta
+    berubah.
+    """
+    
+    def __init__(self, rules, facts):
+        self.rules = [_as_rule(rule) for rule in rules]
+        self.facts = facts
+        self._by_conclusion = {}
+        for rule in self.rules:
+            if rule.operator not in ("AND", "OR"):
+                raise ValueError(f"Operator tidak dikenal: {rule.operator}")
+            self._by_conclusion.setdefault(rule.conclusion, []).append(rule)
+        if any(rule.negations for rule in self.rules):
+            stratify(self.rules)   # ValueError jika negasi dalam siklus
+        self.reset()
+    
+    def reset(self):
+        """Kosongkan tabel (misal setelah fakta berubah)"""
+        self.proven = {}       # goal -> aturan yang membuktikan
+        self._failed = set()
+    
+    def _blocked(self, rule):
+        """Apakah salah satu fakta yang dinegasikan aturan terbukti"""
+        return any(self.prove(negation) for negation in rule.negations)
+    
+    def _lookup(self, goal):
+        if goal in self.facts or goal in self.proven:
+            return True
+        if goal in self._failed or goal not in self._by_conclusion:
+            return False
+        return None
+    
+    def prove(self, goal):
+        """
+        Buktikan goal
+        
+        Returns:
+            True jika goal adalah fakta atau bisa diturunkan dari aturan
+        """
+        result = self._lookup(goal)
+        if result is not None:
+            return result
+        
+        # Stack eksplisit agar rantai aturan yang panjang tidak
+        # melewati batas rekursi Python.
+        # Frame: [goal, aturan kandidat, index aturan, index kondisi, low]
+        done = float("inf")
+        depth_of = {goal: 0}
+        frames = [[goal, self._by_conclusion[goal], 0, 0, done]]
+        answer = None   # (hasil, low) dari sub-goal yang baru selesai
+        
+        while frames:
+            frame = frames[-1]
+            goal, rules, rule_index, condition_index, low = frame
+            
+            succeeded = False
+            if answer is not None:
+                ok, child_low = answer
+                answer = None
+                frame[4] = low = min(low, child_low)
+                rule = rules[rule_index]
+                if rule.operator == "OR" and ok:
+                    if rule.negations and self._blocked(rule):
+                        rule_index, condition_index = rule_index + 1, 0
+                    else:
+                        succeeded = True
+                elif rule.operator == "AND" and not ok:
+                    rule_index, condition_index = rule_index + 1, 0
+                else:
+                    condition_index += 1
+                frame[2], frame[3] = rule_index, condition_index
+            
+            if succeeded:
+                frames.pop()
+                del depth_of[goal]
+                self.proven[goal] = rules[rule_index]
+                answer = (True, done)
+                continue
+            
+            if rule_index >= len(rules):
+                # Semua aturan gagal
+                frames.pop()
+                depth = depth_of.pop(goal)
+                if low >= depth:
+                    self._failed.add(goal)
+                    answer = (False, done)
+                else:
+                    answer = (False, low)
+                continue
+            
+            rule = rules[rule_index]
+            conditions = rule.conditions
+            if condition_index >= len(conditions):
+                if rule.operator == "AND" and rule.negations and self._blocked(rule):
+                    frame[2], frame[3] = rule_index + 1, 0
+                elif rule.operator == "AND":
+                    frames.pop()
+                    del depth_of[goal]
+                    self.proven[goal] = rule
+                    answer = (True, done)
+                else:
+                    frame[2], frame[3] = rule_index + 1, 0   # OR: semua gagal
+                continue
+            
+            condition = conditions[condition_index]
+            result = self._lookup(condition)
+            if result is not None:
+                answer = (result, done)
+            elif condition in depth_of:
+                answer = (False, depth_of[condition])   # siklus
+            else:
+                depth_of[condition] = len(frames)
+                frames.append([condition, self._by_conclusion[condition],
+                               0, 0, done])
+        
+        return answer[0]
+
+
 def demo_simple_rules():
     """
     Demo: Evaluasi aturan sederhana
@@ -91,6 +1548,7 @@ def demo_simple_rules():
     
     # Fakta awal
     facts = {"hujan", "membawa payung"}
+    console = ConsoleListener()   # cetak setiap aturan yang dievaluasi
     
     print("\nFakta awal:")
     for fact in facts:
@@ -110,7 +1568,7 @@ def demo_simple_rules():
     print(f"  {rule1}")
     
     print("\n  Evaluasi:")
-    rule1.fire(facts)
+    rule1.fire(facts, console)
     
     # Buat aturan dengan operator OR
     print("\n" + "-"*60)
@@ -126,7 +1584,7 @@ def demo_simple_rules():
     print(f"  {rule2}")
     
     print("\n  Evaluasi:")
-    rule2.fire(facts)
+    rule2.fire(facts, console)
     
     # Aturan yang tidak terpenuhi
     print("\n" + "-"*60)
@@ -142,7 +1600,7 @@ def demo_simple_rules():
     print(f"  {rule3}")
     
     print("\n  Evaluasi:")
-    rule3.fire(facts)
+    rule3.fire(facts, console)
     
     # Fakta akhir
     print("\n" + "="*60)
@@ -161,6 +1619,7 @@ def demo_chaining_rules():
     print("="*60)
     
     facts = set()
+    console = ConsoleListener()
     
     # Definisikan aturan-aturan
     rules = [
@@ -188,7 +1647,7 @@ def demo_chaining_rules():
     
     for i, rule in enumerate(rules, 1):
         print(f"\nLangkah {i}: Evaluasi {rule.name}")
-        rule.fire(facts)
+        rule.fire(facts, console)
     
     # Hasil akhir
     print("\n" + "="*60)
@@ -196,6 +1655,199 @@ def demo_chaining_rules():
     for fact in facts:
         print(f"  • {fact}")
     print("="*60)
+    
+    # Evaluasi satu kali sesuai urutan list bisa melewatkan kesimpulan
+    # jika aturan tidak berurutan. ForwardChainer tidak bergantung urutan.
+    print("\nForwardChainer (aturan dalam urutan terbalik):")
+    facts = {"pagi", "mata terbuka"}
+    proofs = ProofStore()
+    ForwardChainer(reversed(rules)).run(facts, console, proofs)
+    
+    print("\nMengapa 'bisa melihat'?")
+    print(proofs.format("bisa melihat"))
+
+
+def demo_rete_network():
+    """
+    Demo: Jaringan Rete
+    Aturan dikompilasi sekali, fakta baru hanya memicu node yang relevan
+    """
+    print("\n" + "="*60)
+    print("DEMO: Jaringan Rete (Forward Chaining Inkremental)")
+    print("="*60)
+    
+    # Urutan aturan sengaja dibalik: Rete tidak bergantung urutan list
+    rules = [
+        Rule("R3", ["terang", "mata terbuka"], "bisa melihat", "AND"),
+        Rule("R2", ["matahari terbit"], "terang", "AND"),
+        Rule("R1", ["pagi"], "matahari terbit", "AND"),
+        Rule("R4", ["terang", "mata terbuka", "ada buku"], "bisa membaca", "AND"),
+    ]
+    
+    net = ReteNetwork(rules)
+    stats = net.stats()
+    print(f"\nJaringan: {stats['rules']} aturan, "
+          f"{stats['alpha_nodes']} alpha node, {stats['join_nodes']} join node")
+    
+    for fact in ["pagi", "mata terbuka", "ada buku"]:
+        fired = net.add_fact(fact)
+        names = ", ".join(rule.name for rule in fired) or "-"
+        print(f"  + '{fact}' → FIRED: {names}")
+    
+    print("\nFakta akhir:")
+    for fact in sorted(net.facts):
+        print(f"  • {fact}")
+
+
+def demo_backward_chaining():
+    """
+    Demo: Backward chaining dengan tabling
+    Mulai dari goal, hanya aturan yang relevan yang diperiksa
+    """
+    print("\n" + "="*60)
+    print("DEMO: Backward Chaining (Goal-Driven)")
+    print("="*60)
+    
+    facts = {"demam", "batuk"}
+    rules = [
+        Rule("D1", ["demam", "batuk"], "infeksi saluran napas", "AND"),
+        Rule("D2", ["infeksi saluran napas"], "perlu istirahat", "AND"),
+        # Siklus: D3 dan D4 saling bergantung, tabling mencegah rekursi tak hingga
+        Rule("D3", ["alergi"], "bersin", "AND"),
+        Rule("D4", ["bersin", "ruam"], "alergi", "AND"),
+    ]
+    
+    chainer = BackwardChainer(rules, facts)
+    for goal in ["perlu istirahat", "alergi"]:
+        result = "✓ TERBUKTI" if chainer.prove(goal) else "✗ TIDAK TERBUKTI"
+        print(f"  Goal '{goal}': {result}")
+        if goal in chainer.proven:
+            print(f"    via {chainer.proven[goal]}")
+
+
+def demo_bitset_rules():
+    """
+    Demo: Aturan dikompilasi menjadi bitmask
+    """
+    print("\n" + "="*60)
+    print("DEMO: Evaluasi Aturan dengan Bitmask")
+    print("="*60)
+    
+    rules = [
+        Rule("R1", ["hujan", "membawa payung"], "tetap kering", "AND"),
+        Rule("R2", ["hujan", "badai"], "cuaca buruk", "OR"),
+        Rule("R3", ["cerah", "panas"], "cuaca bagus", "AND"),
+    ]
+    compiled = BitsetRuleSet(rules)
+    facts = {"hujan", "membawa payung"}
+    
+    print("\nPosisi bit:")
+    for symbol, bit in compiled.bits.items():
+        print(f"  bit {bit}: {symbol}")
+    
+    mask = compiled.encode(facts)
+    print(f"\nFakta {sorted(facts)} → {bin(mask)}")
+    print("Aturan terpenuhi:")
+    for rule in compiled.evaluate(facts):
+        print(f"  ✓ {rule}")
+
+
+def demo_agenda():
+    """
+    Demo: Agenda dan conflict resolution
+    Beberapa aturan siap FIRED, urutan ditentukan strategi agenda
+    """
+    print("\n" + "="*60)
+    print("DEMO: Agenda (Conflict Resolution)")
+    print("="*60)
+    
+    rules = [
+        Rule("Info", ["asap"], "catat kejadian", "AND"),
+        Rule("Evakuasi", ["asap", "panas"], "evakuasi gedung", "AND", salience=10),
+        Rule("Sprinkler", ["panas"], "nyalakan sprinkler", "AND"),
+    ]
+    
+    for strategy in ["lex", "specificity"]:
+        print(f"\nStrategi: {strategy}")
+        net = ReteNetwork(rules, agenda=Agenda(strategy))
+        for rule in net.add_facts(["asap", "panas"]):
+            print(f"  🔥 {rule.name} (salience {rule.salience}) → '{rule.conclusion}'")
+
+
+def demo_shared_program():
+    """
+    Demo: Satu basis aturan untuk banyak sesi (misal banyak pasien)
+    """
+    print("\n" + "="*60)
+    print("DEMO: Basis Aturan Bersama, Sesi Terpisah")
+    print("="*60)
+    
+    program = RuleProgram(
+        [
+            Rule("D1", ["demam", "batuk"], "flu", "AND"),
+            Rule("D2", ["flu", "musim hujan"], "perlu vitamin", "AND"),
+        ],
+        base_facts={"musim hujan"},   # berlaku untuk semua sesi
+    )
+    
+    for patient, symptoms in [("Pasien A", ["demam", "batuk"]),
+                              ("Pasien B", ["demam"])]:
+        session = program.session()
+        session.add_facts(symptoms)
+        print(f"\n{patient}: {symptoms}")
+        print(f"  Fakta sesi: {sorted(session.local_facts)}")
+
+
+def demo_negation():
+    """
+    Demo: Kondisi negasi (IF ... AND NOT ...)
+    """
+    print("\n" + "="*60)
+    print("DEMO: Negasi (Negation as Failure)")
+    print("="*60)
+    
+    rules = [
+        Rule("N1", ["hujan"], "jalan basah"),
+        Rule("N2", ["cerah"], "bawa topi", negations=["jalan basah"]),
+        Rule("N3", ["jalan basah"], "pakai sepatu bot"),
+    ]
+    for rule, level in zip(rules, stratify(rules)):
+        print(f"  [strata {level}] {rule}")
+    
+    for facts in [{"cerah"}, {"cerah", "hujan"}]:
+        start = sorted(facts)
+        ForwardChainer(rules).run(facts)
+        print(f"\nFakta {start} → {sorted(facts)}")
+
+
+def demo_rule_graph():
+    """
+    Demo: Graf ketergantungan aturan, komponen siklus, dan lapis
+    """
+    print("\n" + "="*60)
+    print("DEMO: Graf Ketergantungan Aturan (SCC)")
+    print("="*60)
+    
+    rules = [
+        Rule("R1", ["pagi"], "matahari terbit"),
+        Rule("R2", ["matahari terbit"], "terang"),
+        Rule("R3", ["terang", "mata terbuka"], "bisa melihat"),
+        Rule("R4", ["lapar"], "makan"),
+        Rule("R5", ["makan"], "kenyang"),
+        Rule("R6", ["kenyang"], "tidak lapar", "OR"),
+        Rule("R7", ["tidak lapar", "ada makanan"], "makan"),   # siklus R5-R6-R7
+    ]
+    graph = RuleGraph(rules)
+    for depth, layer in enumerate(graph.layers):
+        names = []
+        for index in layer:
+            members = "+".join(rules[n].name for n in graph.components[index])
+            names.append(f"({members})" if graph.cyclic[index] else members)
+        print(f"  Lapis {depth}: {', '.join(names)}")
+    
+    facts = {"pagi", "mata terbuka", "lapar"}
+    fired = ParallelChainer(rules).run(facts)
+    print(f"\nFIRED: {[rule.name for rule in fired]}")
 
 
 def exercise_weather_rules():
@@ -232,7 +1884,7 @@ def exercise_weather_rules():
     print("Evaluasi Aturan:")
     print("-"*60)
     # for rule in rules:
-    #     rule.fire(facts)
+    #     rule.fire(facts, ConsoleListener())
     
     print("\n" + "="*60)
     print("Fakta akhir:")
@@ -249,6 +1901,27 @@ def main():
     # Demo 2: Rantai aturan
     demo_chaining_rules()
     
+    # Demo 3: Jaringan Rete
+    demo_rete_network()
+    
+    # Demo 4: Backward chaining
+    demo_backward_chaining()
+    
+    # Demo 5: Evaluasi bitmask
+    demo_bitset_rules()
+    
+    # Demo 6: Agenda
+    demo_agenda()
+    
+    # Demo 7: Basis aturan bersama
+    demo_shared_program()
+    
+    # Demo 8: Negasi
+    demo_negation()
+    
+    # Demo 9: Graf ketergantungan aturan
+    demo_rule_graph()
+    
     # Latihan (uncomment setelah mengerjakan)
     # exercise_weather_rules()
     
@@ -259,6 +1932,8 @@ def main():
     print("✓ Operator AND: semua kondisi harus terpenuhi")
     print("✓ Operator OR: minimal satu kondisi terpenuhi")
     print("✓ Rule chaining: output → input aturan lain")
+    print("✓ Rete: matching inkremental, hanya memproses delta fakta")
+    print("✓ Negasi (NOT) butuh strata: fakta yang dinegasikan dihitung dulu")
     print("="*60)
 
 
@@ -17,117 +17,2807 @@ Tujuan:
 - Membuat aturan yang lebih fleksibel
 """
 
+import csv
+import gc
+import heapq
+import json
+import math
+import mmap
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from itertools import islice, product
+
+from record_io import read_records   # dipakai bersama 01_knowledge_base.py
+
+
+def is_variable(arg):
+    """Argumen adalah variabel jika berupa string yang diawali '?'"""
+    return isinstance(arg, str) and arg.startswith("?")
+
+
+def is_number(value):
+    """Nilai numerik yang bisa dipakai di Range (bool dan NaN tidak termasuk)"""
+    return type(value) in (int, float) and value == value   # NaN != NaN
+
+
+class Range:
+    """
+    Batasan numerik di posisi argumen pola
+    
+    Contoh: Fact("age", ["?p", gt(60, "?a")])   # ?a > 60, ?a diikat
+            Fact("suhu", ["?s", between(36, 38)])
+    
+    Hanya fakta dengan nilai numerik (int/float) di posisi itu yang
+    cocok. FactBase menjawabnya dengan index terurut (bisect), sehingga
+    biayanya O(log n + k), bukan memeriksa semua fakta predicate itu.
+    """
+    
+    __slots__ = ("low", "high", "low_inclusive", "high_inclusive", "variable")
+    
+    def __init__(self, low=None, high=None, low_inclusive=True,
+                 high_inclusive=True, variable=None):
+        """
+        Args:
+            low, high: Batas bawah/atas (None = tanpa batas)
+            low_inclusive, high_inclusive: Apakah batas termasuk
+            variable: Variabel yang diikat ke nilai (opsional, misal "?a")
+        """
+        set_slot = object.__setattr__
+        set_slot(self, "low", low)
+        set_slot(self, "high", high)
+        set_slot(self, "low_inclusive", low_inclusive)
+        set_slot(self, "high_inclusive", high_inclusive)
+        set_slot(self, "variable", variable)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Range bersifat immutable")
+    
+    def _key(self):
+        return (self.low, self.high, self.low_inclusive, self.high_inclusive,
+                self.variable)
+    
+    def __eq__(self, other):
+        return isinstance(other, Range) and self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __reduce__(self):
+        return (Range, self._key())
+    
+    def contains(self, value):
+        """Apakah nilai memenuhi batasan"""
+        if not is_number(value):
+            return False
+        if self.low is not None:
+            if value < self.low or (value == self.low and not self.low_inclusive):
+                return False
+        if self.high is not None:
+            if value > self.high or (value == self.high and not self.high_inclusive):
+                return False
+        return True
+    
+    def __str__(self):
+        name = self.variable or "_"
+        if self.low is not None and self.high is not None:
+            left = "<=" if self.low_inclusive else "<"
+            right = "<=" if self.high_inclusive else "<"
+            return f"{self.low} {left} {name} {right} {self.high}"
+        if self.low is not None:
+            return f"{name} {'>=' if self.low_inclusive else '>'} {self.low}"
+        if self.high is not None:
+            return f"{name} {'<=' if self.high_inclusive else '<'} {self.high}"
+        return name
+
+
+def lt(value, variable=None):
+    """Range: < value"""
+    return Range(high=value, high_inclusive=False, variable=variable)
+
+
+def le(value, variable=None):
+    """Range: <= value"""
+    return Range(high=value, variable=variable)
+
+
+def gt(value, variable=None):
+    """Range: > value"""
+    return Range(low=value, low_inclusive=False, variable=variable)
+
+
+def ge(value, variable=None):
+    """Range: >= value"""
+    return Range(low=value, variable=variable)
+
+
+def between(low, high, variable=None):
+    """Range: low <= nilai <= high"""
+    return Range(low, high, variable=variable)
+
+
+def intern_symbol(symbol):
+    """
+    Pakai satu objek string yang sama untuk simbol yang sama
+    (jutaan fakta "kucing" berbagi satu string, bukan jutaan salinan)
+    """
+    if type(symbol) is str:
+        return sys.intern(symbol)
+    return symbol
+
+
 class Fact:
     """
-    Representasi fakta dengan predicate dan arguments
+    Representasi fakta dengan predicate dan arguments
+    
+    Contoh: Fact("is", ["kucing", "mamalia"])
+    Artinya: "kucing is mamalia" atau "kucing adalah mamalia"
+    
+    Fakta bersifat immutable: argumen disimpan sebagai tuple, simbol
+    di-intern, dan hash dihitung sekali saat dibuat. __slots__ membuat
+    setiap fakta tidak membawa __dict__ sendiri.
+    """
+    
+    __slots__ = ("predicate", "arguments", "_hash")
+    
+    def __init__(self, predicate, arguments):
+        """
+        Args:
+            predicate: Predikat/hubungan (misal: "is", "has", "eats")
+            arguments: List (atau tuple) argumen
+        """
+        if not isinstance(arguments, (list, tuple)):
+            arguments = [arguments]
+        predicate = intern_symbol(predicate)
+        arguments = tuple(intern_symbol(arg) for arg in arguments)
+        set_slot = object.__setattr__
+        set_slot(self, "predicate", predicate)
+        set_slot(self, "arguments", arguments)
+        set_slot(self, "_hash", hash((predicate, arguments)))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Fact bersifat immutable")
+    
+    def __reduce__(self):
+        return (Fact, (self.predicate, self.arguments))
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Fact):
+            return False
+        return (self._hash == other._hash and
+                self.predicate == other.predicate and
+                self.arguments == other.arguments)
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __str__(self):
+        args_str = ", ".join(str(arg) for arg in self.arguments)
+        return f"{self.predicate}({args_str})"
+    
+    def matches(self, pattern, bindings=None):
+        """
+        Cek apakah fakta ini cocok dengan pola
+        
+        Args:
+            pattern: Pola fakta (bisa mengandung variabel)
+            bindings: Dictionary binding variabel
+        
+        Returns:
+            Dictionary bindings jika cocok, None jika tidak
+        """
+        return compile_pattern(pattern).match_dict(self, bindings)
+
+
+_UNBOUND = object()     # penanda variabel belum punya nilai
+_NO_BINDINGS = {}       # bindings kosong (jangan diubah)
+
+
+class Bindings:
+    """
+    Environment binding variabel dengan undo trail
+    
+    Setiap binding baru dicatat di trail. undo(mark) menghapus binding
+    yang dibuat sesudah mark, sehingga join bisa mencoba kandidat satu per
+    satu pada environment yang sama tanpa menyalin dict.
+    """
+    
+    __slots__ = ("values", "trail")
+    
+    def __init__(self, values=None):
+        self.values = dict(values) if values else {}
+        self.trail = []
+    
+    def mark(self):
+        """Posisi trail saat ini (untuk undo)"""
+        return len(self.trail)
+    
+    def undo(self, mark):
+        """Hapus semua binding yang dibuat sesudah mark"""
+        values = self.values
+        trail = self.trail
+        while len(trail) > mark:
+            del values[trail.pop()]
+    
+    def to_dict(self):
+        """Salinan bindings sebagai dict biasa"""
+        return dict(self.values)
+
+
+class CompiledPattern:
+    """
+    Pola yang sudah dikompilasi untuk matching cepat
+    
+    Posisi konstanta dan posisi variabel dipisahkan sekali saat kompilasi,
+    sehingga matching tidak perlu mengecek '?' untuk setiap argumen lagi.
+    """
+    
+    __slots__ = ("pattern", "predicate", "arity", "constants", "slots",
+                 "repeats", "positions", "ranges")
+    
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.predicate = pattern.predicate
+        self.arity = len(pattern.arguments)
+        constants = []
+        slots = []
+        repeats = []               # (posisi, posisi pertama variabel yang sama)
+        ranges = []                # (posisi, Range)
+        self.positions = {}        # variabel -> posisi pertama
+        for position, arg in enumerate(pattern.arguments):
+            if isinstance(arg, Range):
+                ranges.append((position, arg))
+                arg = arg.variable
+                if arg is None:
+                    continue
+            if is_variable(arg):
+                slots.append((position, arg))
+                first = self.positions.setdefault(arg, position)
+                if first != position:
+                    repeats.append((position, first))
+            else:
+                constants.append((position, arg))
+        self.constants = tuple(constants)
+        self.slots = tuple(slots)
+        self.repeats = tuple(repeats)
+        self.ranges = tuple(ranges)
+    
+    def candidates(self, fact_base, values):
+        """
+        Kandidat fakta dari index terkecil
+        
+        Konstanta pola dan variabel yang sudah terikat di `values`
+        dipakai sebagai kunci index.
+        """
+        predicate = self.predicate
+        best = fact_base._by_arity.get((predicate, self.arity))
+        if not best:
+            return ()
+        by_position = fact_base._by_position
+        for position, value in self.constants:
+            bucket = by_position.get((predicate, position, value))
+            if not bucket:
+                return ()
+            if len(bucket) < len(best):
+                best = bucket
+        for position, var in self.slots:
+            value = values.get(var, _UNBOUND)
+            if value is _UNBOUND:
+                continue
+            bucket = by_position.get((predicate, position, value))
+            if not bucket:
+                return ()
+            if len(bucket) < len(best):
+                best = bucket
+        for position, bounds in self.ranges:
+            index = fact_base._range_index(predicate, position)
+            if index is None:
+                continue
+            low, high = index.bounds(bounds)
+            if high == low:
+                return ()
+            if high - low < len(best):
+                best = index.facts[low:high]
+        return best
+    
+    def bind(self, fact, env):
+        """
+        Cocokkan kandidat dari candidates() dan tambahkan binding ke env
+        
+        Returns:
+            True jika cocok; jika tidak, env dikembalikan seperti semula
+        """
+        args = fact.arguments
+        if len(args) != self.arity:
+            return False   # bucket posisi berisi fakta dengan arity lain
+        for position, value in self.constants:
+            if args[position] != value:
+                return False
+        for position, bounds in self.ranges:
+            if not bounds.contains(args[position]):
+                return False
+        values = env.values
+        trail = env.trail
+        mark = len(trail)
+        for position, var in self.slots:
+            current = values.get(var, _UNBOUND)
+            if current is _UNBOUND:
+                values[var] = args[position]
+                trail.append(var)
+            elif current != args[position]:
+                env.undo(mark)
+                return False
+        return True
+    
+    def accepts(self, fact):
+        """
+        Cocokkan kandidat tanpa membuat bindings (untuk agregasi)
+        
+        Returns:
+            True jika fakta cocok dengan pola
+        """
+        args = fact.arguments
+        if len(args) != self.arity:
+            return False
+        for position, value in self.constants:
+            if args[position] != value:
+                return False
+        for position, first in self.repeats:
+            if args[position] != args[first]:
+                return False
+        for position, bounds in self.ranges:
+            if not bounds.contains(args[position]):
+                return False
+        return True
+    
+    def match_dict(self, fact, bindings=None):
+        """
+        Seperti Fact.matches: dict baru hanya dibuat jika cocok
+        
+        Returns:
+            Dictionary bindings jika cocok, None jika tidak
+        """
+        if fact.predicate != self.predicate or len(fact.arguments) != self.arity:
+            return None
+        args = fact.arguments
+        for position, value in self.constants:
+            if args[position] != value:
+                return None
+        for position, bounds in self.ranges:
+            if not bounds.contains(args[position]):
+                return None
+        bindings = bindings if bindings is not None else _NO_BINDINGS
+        added = None
+        for position, var in self.slots:
+            value = args[position]
+            current = bindings.get(var, _UNBOUND)
+            if current is _UNBOUND and added is not None:
+                current = added.get(var, _UNBOUND)
+            if current is _UNBOUND:
+                if added is None:
+                    added = {}
+                added[var] = value
+            elif current != value:
+                return None
+        result = dict(bindings)
+        if added:
+            result.update(added)
+        return result
+    
+    def build(self, values):
+        """Buat fakta dengan mengganti variabel dari `values`"""
+        args = list(self.pattern.arguments)
+        for position, var in self.slots:
+            args[position] = values.get(var, var)
+        return Fact(self.predicate, args)
+
+
+_compiled_patterns = {}
+
+
+def compile_pattern(pattern):
+    """CompiledPattern untuk pola (disimpan di cache)"""
+    matcher = _compiled_patterns.get(pattern)
+    if matcher is None:
+        if len(_compiled_patterns) >= 10000:
+            _compiled_patterns.clear()
+        matcher = _compiled_patterns[pattern] = CompiledPattern(pattern)
+    return matcher
+
+
+def _parse_value(text):
+    """Sel CSV: angka jadi int/float, selain itu simbol (di-intern)"""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        value = float(text)
+    except ValueError:
+        return sys.intern(text)
+    return value if math.isfinite(value) else sys.intern(text)
+
+
+def _fact_from_record(record, parse=None):
+    """Fakta dari {"predicate": p, "arguments": [...]} atau [p, arg1, ...]"""
+    if isinstance(record, dict):
+        predicate, arguments = record["predicate"], record.get("arguments", ())
+    else:
+        predicate, *arguments = record
+    if parse is not None:
+        arguments = [parse(arg) for arg in arguments]
+    return Fact(predicate, arguments)
+
+
+def read_facts(path, chunk_size=50000):
+    """
+    Fakta dari file JSON-lines atau CSV, satu per satu (streaming)
+    
+    JSON-lines: satu fakta per baris, {"predicate": "usia",
+    "arguments": ["ani", 72]} atau ["usia", "ani", 72].
+    CSV (tanpa header): predicate,arg1,arg2,... (sel angka jadi int/float).
+    """
+    parse = _parse_value if str(path).lower().endswith(".csv") else None
+    for chunk in read_records(path, chunk_size):
+        for record in chunk:
+            yield _fact_from_record(record, parse)
+
+
+class _SortedIndex:
+    """Nilai numerik satu posisi argumen, terurut (untuk Range)"""
+    
+    __slots__ = ("keys", "facts")
+    
+    def __init__(self, items):
+        items = sorted(items, key=lambda item: item[0])
+        self.keys = [key for key, _ in items]
+        self.facts = [fact for _, fact in items]
+    
+    def add(self, key, fact):
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.facts.insert(index, fact)
+    
+    def remove(self, key, fact):
+        start = bisect_left(self.keys, key)
+        index = self.facts.index(fact, start, bisect_right(self.keys, key))
+        del self.keys[index]
+        del self.facts[index]
+    
+    def bounds(self, bounds):
+        """Posisi [awal, akhir) nilai yang memenuhi Range"""
+        keys = self.keys
+        low, high = 0, len(keys)
+        if bounds.low is not None:
+            search = bisect_left if bounds.low_inclusive else bisect_right
+            low = search(keys, bounds.low)
+        if bounds.high is not None:
+            search = bisect_right if bounds.high_inclusive else bisect_left
+            high = search(keys, bounds.high)
+        return low, max(low, high)
+
+
+class FactBase:
+    """
+    Database fakta dengan kemampuan pattern matching
+    
+    Fakta diindeks (hash index) berdasarkan:
+    - predicate
+    - (predicate, arity)
+    - (predicate, posisi argumen, konstanta)
+    
+    Sehingga query hanya memeriksa kandidat yang mungkin cocok,
+    bukan seluruh fakta.
+    
+    Untuk pola dengan Range (misal gt(60)), index terurut per
+    (predicate, posisi) dibuat saat pertama dibutuhkan lalu dipelihara
+    di add/remove.
+    """
+    
+    def __init__(self):
+        self.facts = set()
+        self._by_predicate = defaultdict(set)
+        self._by_arity = defaultdict(set)      # (predicate, arity)
+        self._by_position = defaultdict(set)   # (predicate, posisi, konstanta)
+        self._distinct = defaultdict(int)      # (predicate, posisi) -> jumlah nilai
+        self._sorted = {}                      # (predicate, posisi) -> _SortedIndex
+    
+    def add(self, fact):
+        """Tambahkan fakta"""
+        if fact in self.facts:
+            return
+        self.facts.add(fact)
+        predicate = fact.predicate
+        self._by_predicate[predicate].add(fact)
+        self._by_arity[(predicate, len(fact.arguments))].add(fact)
+        for position, arg in enumerate(fact.arguments):
+            bucket = self._by_position[(predicate, position, arg)]
+            if not bucket:
+                self._distinct[(predicate, position)] += 1
+            bucket.add(fact)
+        if self._sorted:
+            self._update_sorted(fact, _SortedIndex.add)
+    
+    def add_facts(self, facts):
+        """
+        Tambahkan banyak fakta sekaligus
+        
+        Pass pertama hanya mengisi set fakta (buang duplikat); index
+        dibangun dalam satu pass di akhir untuk fakta yang baru. GC
+        dimatikan selama bulk insert: jutaan objek baru memicu koleksi
+        berulang yang tidak membebaskan apa pun.
+        
+        Returns:
+            Jumlah fakta baru
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._add_all(facts)
+        finally:
+            if enabled:
+                gc.enable()
+    
+    def _add_all(self, facts):
+        known = self.facts
+        added = []
+        for fact in facts:
+            if fact not in known:
+                known.add(fact)
+                added.append(fact)
+        by_predicate = self._by_predicate
+        by_arity = self._by_arity
+        by_position = self._by_position
+        distinct = self._distinct
+        for fact in added:
+            predicate = fact.predicate
+            arguments = fact.arguments
+            by_predicate[predicate].add(fact)
+            by_arity[(predicate, len(arguments))].add(fact)
+            for position, arg in enumerate(arguments):
+                bucket = by_position[(predicate, position, arg)]
+                if not bucket:
+                    distinct[(predicate, position)] += 1
+                bucket.add(fact)
+        if added:
+            self._sorted.clear()   # index terurut dibangun ulang saat dibutuhkan
+        return len(added)
+    
+    def load_facts(self, path, chunk_size=50000):
+        """
+        Muat fakta dari file JSON-lines atau CSV (lihat read_facts)
+        
+        Returns:
+            Jumlah fakta baru
+        """
+        return self.add_facts(read_facts(path, chunk_size))
+    
+    def save_snapshot(self, path):
+        """Simpan fakta ke snapshot biner (lihat save_snapshot, MappedFactBase)"""
+        save_snapshot(self.facts, path)
+    
+    def remove(self, fact):
+        """
+        Hapus fakta (beserta entri index-nya)
+        
+        Returns:
+            True jika fakta ada dan dihapus
+        """
+        if fact not in self.facts:
+            return False
+        self.facts.discard(fact)
+        predicate = fact.predicate
+        self._discard(self._by_predicate, predicate, fact)
+        self._discard(self._by_arity, (predicate, len(fact.arguments)), fact)
+        for position, arg in enumerate(fact.arguments):
+            if self._discard(self._by_position, (predicate, position, arg), fact):
+                self._distinct[(predicate, position)] -= 1
+        if self._sorted:
+            self._update_sorted(fact, _SortedIndex.remove)
+        return True
+    
+    def _update_sorted(self, fact, update):
+        for position, arg in enumerate(fact.arguments):
+            index = self._sorted.get((fact.predicate, position))
+            if index is not None and is_number(arg):
+                update(index, arg, fact)
+    
+    def _range_index(self, predicate, position, build=True):
+        """
+        Index terurut untuk (predicate, posisi)
+        
+        Dibuat jika belum ada (build=False: None jika belum ada). Setelah
+        dibuat, setiap add/remove fakta predicate itu ikut memperbaruinya.
+        """
+        index = self._sorted.get((predicate, position))
+        if index is None and build:
+            index = self._sorted[(predicate, position)] = _SortedIndex(
+                (fact.arguments[position], fact)
+                for fact in self._by_predicate.get(predicate, ())
+                if len(fact.arguments) > position and is_number(fact.arguments[position])
+            )
+        return index
+    
+    @staticmethod
+    def _discard(index, key, fact):
+        """Hapus fakta dari bucket; True jika bucket menjadi kosong"""
+        bucket = index[key]
+        bucket.discard(fact)
+        if not bucket:
+            del index[key]
+            return True
+        return False
+    
+    def candidates(self, pattern):
+        """
+        Kandidat fakta untuk sebuah pola (belum tentu semuanya cocok)
+        
+        Memilih bucket index terkecil di antara (predicate, arity)
+        dan setiap argumen konstanta pada pola.
+        """
+        return compile_pattern(pattern).candidates(self, _NO_BINDINGS)
+    
+    def query(self, pattern, limit=None):
+        """
+        Query fakta berdasarkan pola
+        
+        Args:
+            pattern: Pola fakta yang dicari
+            limit: Jumlah hasil maksimum (None = semua)
+        
+        Returns:
+            List of (fact, bindings) yang cocok
+        """
+        return list(islice(self.iter_query(pattern), limit))
+    
+    def iter_query(self, pattern):
+        """
+        Seperti query, tapi menghasilkan (fact, bindings) satu per satu
+        
+        Pencarian berhenti begitu pemanggil berhenti mengambil hasil.
+        """
+        matcher = compile_pattern(pattern)
+        for fact in matcher.candidates(self, _NO_BINDINGS):
+            bindings = matcher.match_dict(fact)
+            if bindings is not None:
+                yield fact, bindings
+    
+    def first(self, pattern):
+        """
+        Hasil pertama yang cocok
+        
+        Returns:
+            (fact, bindings), atau None jika tidak ada
+        """
+        return next(self.iter_query(pattern), None)
+    
+    def exists(self, pattern):
+        """Apakah ada fakta yang cocok dengan pola"""
+        matcher = compile_pattern(pattern)
+        if not matcher.slots and not matcher.ranges:
+            return pattern in self.facts   # pola tanpa variabel: cek set
+        return self.first(pattern) is not None
+    
+    def count(self, pattern):
+        """Jumlah fakta yang cocok dengan pola"""
+        matcher = compile_pattern(pattern)
+        bucket = matcher.candidates(self, _NO_BINDINGS)
+        if (type(bucket) is set and not matcher.constants
+                and not matcher.repeats and not matcher.ranges):
+            return len(bucket)   # bucket (predicate, arity) = tepat hasilnya
+        accepts = matcher.accepts
+        return sum(1 for fact in bucket if accepts(fact))
+    
+    def _values(self, pattern, variable):
+        """Nilai variabel untuk setiap fakta yang cocok (tanpa dict bindings)"""
+        matcher = compile_pattern(pattern)
+        position = matcher.positions.get(variable)
+        if position is None:
+            raise ValueError(f"Variabel {variable} tidak ada di pola {pattern}")
+        accepts = matcher.accepts
+        for fact in matcher.candidates(self, _NO_BINDINGS):
+            if accepts(fact):
+                yield fact.arguments[position]
+    
+    def group_by(self, pattern, variable):
+        """
+        Jumlah fakta per nilai variabel
+        
+        Contoh: group_by(Fact("lives_in", ["?a", "?h"]), "?h")
+                -> {"hutan": 3, "laut": 2}
+        """
+        counts = defaultdict(int)
+        for value in self._values(pattern, variable):
+            counts[value] += 1
+        return dict(counts)
+    
+    def distinct(self, pattern, variable):
+        """Himpunan nilai berbeda untuk variabel"""
+        return set(self._values(pattern, variable))
+    
+    def min(self, pattern, variable, key=None):
+        """Nilai terkecil variabel (None jika tidak ada yang cocok)"""
+        return min(self._values(pattern, variable), key=key, default=None)
+    
+    def max(self, pattern, variable, key=None):
+        """Nilai terbesar variabel (None jika tidak ada yang cocok)"""
+        return max(self._values(pattern, variable), key=key, default=None)
+    
+    def estimate(self, pattern, bound=()):
+        """
+        Perkiraan jumlah fakta yang cocok dengan pola (dari ukuran index)
+        
+        Args:
+            pattern: Pola fakta
+            bound: Variabel yang nilainya sudah diketahui saat pola dievaluasi
+        """
+        predicate = pattern.predicate
+        total = len(self._by_arity.get((predicate, len(pattern.arguments)), ()))
+        estimate = total
+        for position, arg in enumerate(pattern.arguments):
+            if isinstance(arg, Range):
+                if arg.variable in bound:
+                    size = total / max(1, self._distinct[(predicate, position)])
+                else:
+                    # Hanya index yang sudah ada: perkiraan tidak boleh
+                    # membuat index yang lalu membebani setiap add
+                    index = self._range_index(predicate, position, build=False)
+                    if index is None:
+                        size = total / 3   # selektivitas Range standar
+                    else:
+                        low, high = index.bounds(arg)
+                        size = high - low
+            elif not is_variable(arg):
+                size = len(self._by_position.get((predicate, position, arg), ()))
+            elif arg in bound:
+                # Nilai belum diketahui: anggap tersebar rata
+                size = total / max(1, self._distinct[(predicate, position)])
+            else:
+                continue
+            estimate = min(estimate, size)
+        return estimate
+    
+    def plan(self, patterns, bound=()):
+        """
+        Urutan evaluasi pola untuk query_all
+        
+        Greedy: pilih pola dengan perkiraan hasil terkecil, utamakan pola
+        yang berbagi variabel dengan pola sebelumnya (hindari cartesian
+        product).
+        """
+        remaining = list(patterns)
+        bound = set(bound)
+        order = []
+        while remaining:
+            best = min(remaining, key=lambda p: (
+                bool(bound) and not (pattern_variables(p) & bound),
+                self.estimate(p, bound),
+            ))
+            remaining.remove(best)
+            order.append(best)
+            bound |= pattern_variables(best)
+        return order
+    
+    def query_all(self, patterns, negated=()):
+        """
+        Query konjungtif: semua pola harus cocok dengan bindings konsisten
+        
+        Contoh: [eats(?a, ?f), lives_in(?a, rumah)]
+        
+        Args:
+            patterns: List pola fakta
+            negated: List pola yang TIDAK boleh cocok (negation as failure),
+                     misal [has(?a, sayap)]. Variabel yang tidak muncul di
+                     `patterns` berarti "fakta apa pun".
+        
+        Returns:
+            List bindings yang memenuhi semua pola
+        """
+        rows = [{}]
+        bound = set()
+        for pattern in self.plan(patterns):
+            rows = self._join(rows, pattern, bound)
+            if not rows:
+                break
+            bound |= pattern_variables(pattern)
+        for pattern in negated:
+            if not rows:
+                break
+            rows = self._anti_join(rows, pattern, bound)
+        return rows
+    
+    def _join(self, rows, pattern, bound):
+        """Gabungkan hasil sementara dengan satu pola"""
+        shared = []
+        for arg in pattern.arguments:
+            if isinstance(arg, Range):
+                arg = arg.variable
+            if arg in bound and arg not in shared:
+                shared.append(arg)
+        
+        if not shared:
+            matches = [bindings for _, bindings in self.query(pattern)]
+            return [{**row, **bindings} for row in rows for bindings in matches]
+        
+        results = []
+        probe_cost = len(rows) * self.estimate(pattern, bound)
+        if probe_cost < len(self.candidates(pattern)):
+            # Sedikit baris: probe index untuk setiap baris
+            matcher = compile_pattern(pattern)
+            for row in rows:
+                for fact in matcher.candidates(self, row):
+                    bindings = matcher.match_dict(fact, row)
+                    if bindings is not None:
+                        results.append(bindings)
+        else:
+            # Banyak baris: hash join pada variabel bersama
+            table = defaultdict(list)
+            for _, bindings in self.query(pattern):
+                table[tuple(bindings[v] for v in shared)].append(bindings)
+            for row in rows:
+                for bindings in table.get(tuple(row[v] for v in shared), ()):
+                    results.append({**row, **bindings})
+        return results
+    
+    def _anti_join(self, rows, pattern, bound):
+        """Buang baris yang punya pasangan di pola (hash anti-join)"""
+        matcher = compile_pattern(pattern)
+        shared = [var for var in matcher.positions if var in bound]
+        if not shared:
+            return [] if self.exists(pattern) else rows
+        if len(shared) == len(matcher.slots) and not matcher.ranges:
+            # Pola menjadi ground per baris: satu probe ke set fakta
+            facts = self.facts
+            return [row for row in rows if matcher.build(row) not in facts]
+        # Ada variabel bebas: kumpulkan kunci variabel bersama sekali
+        keys = {tuple(bindings[v] for v in shared)
+                for _, bindings in self.iter_query(pattern)}
+        return [row for row in rows
+                if tuple(row[v] for v in shared) not in keys]
+    
+    def display(self):
+        """Tampilkan semua fakta"""
+        print("\nFakta dalam database:")
+        if not self.facts:
+            print("  (kosong)")
+        for fact in self.facts:
+            print(f"  • {fact}")
+
+
+_LATEST = sys.maxsize - 1   # versi "terbaru" untuk pembacaan oleh writer
+_ALIVE = sys.maxsize        # died[row] untuk baris yang belum dihapus
+
+
+class _VersionState:
+    """
+    Isi VersionedFactBase: baris append-only + index berisi nomor baris
+    
+    Setiap baris punya versi lahir (born) dan versi dihapus (died).
+    Fakta yang dihapus lalu ditambah lagi mendapat baris baru; baris
+    lamanya tetap ada untuk snapshot yang lebih tua (_previous).
+    """
+    
+    __slots__ = ("facts", "born", "died", "row_of", "previous", "live",
+                 "by_predicate", "by_arity", "by_position", "distinct")
+    
+    def __init__(self):
+        self.facts = []                # nomor baris -> fakta
+        self.born = array("q")
+        self.died = array("q")
+        self.row_of = {}               # fakta -> baris terbaru
+        self.previous = {}             # baris -> baris sebelumnya (fakta sama)
+        self.live = 0
+        self.by_predicate = {}         # kunci -> list nomor baris
+        self.by_arity = {}
+        self.by_position = {}
+        self.distinct = defaultdict(int)
+    
+    def append(self, fact, version):
+        row = len(self.facts)
+        # Data baris diisi sebelum baris masuk index, sehingga pembaca
+        # tidak pernah melihat nomor baris tanpa datanya
+        self.facts.append(fact)
+        self.born.append(version)
+        self.died.append(_ALIVE)
+        old = self.row_of.get(fact)
+        if old is not None:
+            self.previous[row] = old
+        self.row_of[fact] = row
+        self.live += 1
+        
+        predicate = fact.predicate
+        self.by_predicate.setdefault(predicate, []).append(row)
+        self.by_arity.setdefault((predicate, len(fact.arguments)), []).append(row)
+        by_position = self.by_position
+        for position, arg in enumerate(fact.arguments):
+            bucket = by_position.get((predicate, position, arg))
+            if bucket is None:
+                bucket = by_position[(predicate, position, arg)] = []
+                self.distinct[(predicate, position)] += 1
+            bucket.append(row)
+    
+    def visible_row(self, fact, version):
+        """Baris fakta yang terlihat pada versi, atau None"""
+        row = self.row_of.get(fact)
+        born = self.born
+        while row is not None and born[row] > version:
+            row = self.previous.get(row)
+        if row is not None and version < self.died[row]:
+            return row
+        return None
+
+
+class _Rows:
+    """Bucket index pada satu versi: iterasi hanya baris yang terlihat"""
+    
+    __slots__ = ("rows", "state", "version")
+    
+    def __init__(self, rows, state, version):
+        self.rows = rows
+        self.state = state
+        self.version = version
+    
+    def __len__(self):
+        return len(self.rows)   # perkiraan (termasuk baris terhapus)
+    
+    def __iter__(self):
+        state = self.state
+        facts, born, died = state.facts, state.born, state.died
+        version = self.version
+        # Writer hanya menambah di ujung list; baris baru punya born >
+        # version sehingga ikut tersaring
+        for row in self.rows:
+            if born[row] <= version < died[row]:
+                yield facts[row]
+
+
+class _IndexView:
+    """Index (dict kunci -> list baris) dilihat pada satu versi"""
+    
+    __slots__ = ("index", "state", "version")
+    
+    def __init__(self, index, state, version):
+        self.index = index
+        self.state = state
+        self.version = version
+    
+    def get(self, key, default=None):
+        rows = self.index.get(key)
+        if rows is None:
+            return default
+        return _Rows(rows, self.state, self.version)
+    
+    def __contains__(self, key):
+        return key in self.index
+
+
+class _CountView:
+    """Akses baca _distinct tanpa menambah kunci baru"""
+    
+    __slots__ = ("counts",)
+    
+    def __init__(self, counts):
+        self.counts = counts
+    
+    def __getitem__(self, key):
+        return self.counts.get(key, 0)
+
+
+class _FactsView:
+    """Pengganti FactBase.facts: himpunan fakta pada satu versi"""
+    
+    __slots__ = ("state", "version", "size")
+    
+    def __init__(self, state, version, size=None):
+        self.state = state
+        self.version = version
+        self.size = size           # None = jumlah fakta hidup saat ini
+    
+    def __contains__(self, fact):
+        return self.state.visible_row(fact, self.version) is not None
+    
+    def __iter__(self):
+        return iter(_Rows(range(len(self.state.facts)), self.state, self.version))
+    
+    def __len__(self):
+        return self.state.live if self.size is None else self.size
+    
+    def __bool__(self):
+        return len(self) > 0
+
+
+class _VersionedReader(FactBase):
+    """Bagian baca VersionedFactBase/FactSnapshot (API query FactBase)"""
+    
+    def _bind(self, state, version, size=None):
+        self._state = state
+        self.version = version
+        self.facts = _FactsView(state, version, size)
+        self._by_predicate = _IndexView(state.by_predicate, state, version)
+        self._by_arity = _IndexView(state.by_arity, state, version)
+        self._by_position = _IndexView(state.by_position, state, version)
+        self._distinct = _CountView(state.distinct)
+    
+    def _range_index(self, predicate, position, build=True):
+        return None   # tanpa index terurut: Range disaring per kandidat
+
+
+class VersionedFactBase(_VersionedReader):
+    """
+    FactBase untuk satu/lebih writer dan banyak reader thread (MVCC)
+    
+    Fakta disimpan sebagai baris append-only; index berisi nomor baris.
+    Setiap perubahan menaikkan versi. snapshot() hanya mencatat versi
+    saat ini (O(1), tanpa menyalin): snapshot berbagi baris dan index
+    yang sama dengan writer, dan hanya melihat baris dengan
+    born <= versi < died.
+    
+    Writer memakai lock. Reader membaca snapshot tanpa lock: writer tidak
+    pernah mengubah baris yang sudah ada kecuali menandai `died`, dan
+    list index hanya bertambah di ujung (aman dibaca sambil ditambah).
+    
+    Baris yang dihapus dibersihkan (compact) saat jumlahnya melebihi
+    fakta hidup; snapshot lama tetap memegang isi lama sampai dilepas.
+    
+    Contoh:
+        kb = VersionedFactBase()
+        kb.add(Fact("suhu", ["sensor1", "40"]))   # thread ingestion
+        view = kb.snapshot()                      # thread query
+        view.query(Fact("suhu", ["?s", "?t"]))
+    """
+    
+    def __init__(self, facts=()):
+        self._lock = threading.Lock()
+        self._dead = 0
+        self._version = 0
+        self._bind(_VersionState(), _LATEST)
+        for fact in facts:
+            self.add(fact)
+    
+    def add(self, fact):
+        """Tambahkan fakta (versi baru)"""
+        with self._lock:
+            if fact in self.facts:
+                return
+            self._version += 1
+            self._state.append(fact, self._version)
+    
+    def add_facts(self, facts):
+        """Tambahkan banyak fakta dalam satu versi"""
+        with self._lock:
+            version = self._version + 1
+            state = self._state
+            added = 0
+            for fact in facts:
+                if state.visible_row(fact, version) is None:
+                    state.append(fact, version)
+                    added += 1
+            if added:
+                self._version = version
+            return added
+    
+    def remove(self, fact):
+        """
+        Hapus fakta (versi baru); snapshot lama tetap melihatnya
+        
+        Returns:
+            True jika fakta ada dan dihapus
+        """
+        with self._lock:
+            state = self._state
+            row = state.visible_row(fact, _LATEST)
+            if row is None:
+                return False
+            self._version += 1
+            state.died[row] = self._version
+            state.live -= 1
+            self._dead += 1
+            if self._dead > max(1024, state.live):
+                self._compact()
+            return True
+    
+    def _compact(self):
+        """Bangun ulang isi tanpa baris terhapus (versi dipertahankan)"""
+        old = self._state
+        state = _VersionState()
+        for row, fact in enumerate(old.facts):
+            if old.died[row] == _ALIVE:
+                state.append(fact, old.born[row])
+        self._dead = 0
+        self._bind(state, _LATEST)
+    
+    def snapshot(self):
+        """View read-only yang konsisten pada versi saat ini"""
+        with self._lock:
+            return FactSnapshot(self._state, self._version, self._state.live)
+
+
+class FactSnapshot(_VersionedReader):
+    """
+    View read-only VersionedFactBase pada satu versi
+    
+    Mendukung semua query FactBase (query, iter_query, first, exists,
+    query_all, ...) dan aman dipakai dari thread mana pun tanpa lock.
+    """
+    
+    def __init__(self, state, version, size):
+        self._bind(state, version, size)
+    
+    def add(self, fact):
+        raise TypeError("FactSnapshot hanya bisa dibaca")
+    
+    def add_facts(self, facts):
+        raise TypeError("FactSnapshot hanya bisa dibaca")
+    
+    def remove(self, fact):
+        raise TypeError("FactSnapshot hanya bisa dibaca")
+
+
+class TimedFactBase(FactBase):
+    """
+    FactBase untuk aliran event: fakta punya timestamp dan TTL opsional
+    
+    Fakta dengan TTL masuk heap berdasarkan waktu kedaluwarsa. expire()
+    mengambil fakta yang sudah lewat dari puncak heap, masing-masing
+    O(log n), sehingga working memory tetap terbatas walau ingestion
+    berjalan terus.
+    
+    Sebelum fakta dihapus, subscriber (misal TruthMaintenance.retract_facts)
+    dipanggil dengan daftar fakta kedaluwarsa; setelah dihapus, callback
+    watch() untuk pola yang cocok dipanggil, baik untuk fakta kedaluwarsa
+    maupun fakta turunan yang ikut ditarik subscriber.
+    
+    Contoh:
+        readings = TimedFactBase()
+        readings.add(Fact("suhu", ["sensor1", 40]), ttl=60)
+        readings.expire()    # panggil berkala, misal setiap detik
+    """
+    
+    def __init__(self, clock=time.time):
+        """
+        Args:
+            clock: Fungsi waktu sekarang (detik), default time.time
+        """
+        super().__init__()
+        self.clock = clock
+        self.timestamps = {}       # fakta -> waktu masuk
+        self._expires = {}         # fakta -> waktu kedaluwarsa
+        self._heap = []            # (waktu kedaluwarsa, urutan, fakta)
+        self._sequence = 0
+        self._subscribers = []
+        self._watchers = defaultdict(list)   # predicate -> [(matcher, callback)]
+    
+    def add(self, fact, timestamp=None, ttl=None):
+        """
+        Tambahkan fakta (atau perbarui timestamp/TTL fakta yang sudah ada)
+        
+        Args:
+            fact: Fakta
+            timestamp: Waktu event (default: clock())
+            ttl: Umur fakta dalam detik (None = tidak kedaluwarsa)
+        """
+        if timestamp is None and ttl is None and fact in self.facts:
+            return   # add(fact) biasa (misal dari engine) tidak mengubah TTL
+        super().add(fact)
+        if timestamp is None:
+            timestamp = self.clock()
+        self.timestamps[fact] = timestamp
+        if ttl is None:
+            self._expires.pop(fact, None)
+            return
+        expires = timestamp + ttl
+        self._expires[fact] = expires
+        self._sequence += 1
+        heapq.heappush(self._heap, (expires, self._sequence, fact))
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            # Entri lama (fakta diperbarui/dihapus) dibuang sekaligus
+            self._heap = [entry for entry in self._heap
+                          if self._expires.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+    
+    def add_facts(self, facts, timestamp=None, ttl=None):
+        """Tambahkan banyak fakta dengan timestamp/TTL yang sama"""
+        if timestamp is None:
+            timestamp = self.clock()
+        count = len(self.facts)
+        for fact in facts:
+            self.add(fact, timestamp, ttl)
+        return len(self.facts) - count
+    
+    def remove(self, fact):
+        """Hapus fakta beserta timestamp dan jadwal kedaluwarsanya"""
+        if not super().remove(fact):
+            return False
+        self.timestamps.pop(fact, None)
+        self._expires.pop(fact, None)   # entri heap dilewati saat expire()
+        return True
+    
+    def subscribe(self, callback):
+        """
+        callback(facts) dipanggil dengan fakta kedaluwarsa sebelum dihapus
+        
+        Jika callback mengembalikan fakta yang ikut ditarik (seperti
+        TruthMaintenance.retract_facts), fakta itu juga dilaporkan ke watch().
+        """
+        self._subscribers.append(callback)
+    
+    def watch(self, pattern, callback):
+        """
+        callback(fact, bindings) dipanggil untuk fakta yang cocok saat
+        kedaluwarsa atau ditarik subscriber karena kedaluwarsa
+        """
+        self._watchers[pattern.predicate].append((compile_pattern(pattern), callback))
+    
+    def expire(self, now=None):
+        """
+        Hapus semua fakta yang TTL-nya sudah lewat
+        
+        Returns:
+            List fakta yang dihapus
+        """
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        expires = self._expires
+        due = []
+        while heap and heap[0][0] <= now:
+            expires_at, _, fact = heapq.heappop(heap)
+            if expires.get(fact) == expires_at:   # bukan entri usang
+                del expires[fact]
+                due.append(fact)
+        if not due:
+            return due
+        removed = list(due)
+        seen = set(due)
+        for callback in self._subscribers:
+            for fact in callback(due) or ():   # turunan yang ikut ditarik
+                if fact not in seen:
+                    seen.add(fact)
+                    removed.append(fact)
+        for fact in due:
+            self.remove(fact)
+        watchers = self._watchers
+        for fact in removed:
+            for matcher, callback in watchers.get(fact.predicate, ()):
+                bindings = matcher.match_dict(fact)
+                if bindings is not None:
+                    callback(fact, bindings)
+        return due
+    
+    def query_within(self, pattern, seconds, now=None):
+        """
+        Query, hanya fakta dengan timestamp dalam `seconds` detik terakhir
+        
+        Returns:
+            List of (fact, bindings), seperti query()
+        """
+        cutoff = (self.clock() if now is None else now) - seconds
+        timestamps = self.timestamps
+        return [(fact, bindings) for fact, bindings in self.iter_query(pattern)
+                if timestamps.get(fact, cutoff) >= cutoff]
+
+
+class SQLiteFactBase:
+    """
+    FactBase di atas SQLite untuk fakta yang lebih besar dari RAM
+    
+    Setiap (predicate, arity) mendapat satu tabel dengan kolom a0..aN
+    (UNIQUE atas semua kolom, sehingga fakta tidak ganda) dan satu index
+    per posisi argumen. Pola dan query konjungtif diterjemahkan menjadi
+    satu SELECT dengan JOIN antar tabel dan NOT EXISTS untuk negasi,
+    sehingga SQLite yang memilih index; hasil dibaca bertahap dari
+    cursor, jadi memori tidak tumbuh mengikuti jumlah fakta (urutan
+    join diserahkan ke query planner SQLite).
+    
+    API mengikuti FactBase: add, add_facts, remove, query, iter_query,
+    first, exists, count, group_by, distinct, min, max, query_all.
+    
+    SQLite menyimpan bool sebagai integer, jadi True/False disimpan
+    sebagai BLOB b"true"/b"false" dan dikembalikan sebagai bool: Range
+    tidak cocok dengan bool (sama dengan Range.contains), sedangkan
+    konstanta 1/True dan 0/False tetap saling cocok seperti di Python.
+    Bedanya dengan FactBase: fakta yang hanya berbeda True/1 disimpan
+    sebagai dua baris, dan join antar variabel membandingkan keduanya
+    sebagai nilai berbeda.
+    
+    Contoh:
+        fb = SQLiteFactBase("fakta.db")
+        fb.add_facts(facts)                      # executemany per tabel
+        fb.query_all([Fact("eats", ["?a", "?f"]),
+                      Fact("lives_in", ["?a", "rumah"])])
+    """
+    
+    def __init__(self, path=":memory:"):
+        """
+        Args:
+            path: File database SQLite (":memory:" = di memori)
+        """
+        # Autocommit; add_facts membuka transaksi sendiri per potongan
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS predicates "
+            "(predicate, arity INTEGER, name TEXT, PRIMARY KEY (predicate, arity))"
+        )
+        self._tables = {
+            (predicate, arity): name
+            for predicate, arity, name in self.connection.execute(
+                "SELECT predicate, arity, name FROM predicates")
+        }
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _table(self, predicate, arity, pending=None):
+        """
+        Nama tabel untuk (predicate, arity), dibuat jika belum ada
+        
+        Jika `pending` (dict) diberikan, tabel dibuat di dalam transaksi
+        yang masih terbuka: nama tabel dicatat di `pending`, bukan di
+        self._tables, dan index posisinya belum dibuat. Pemanggil
+        memindahkannya ke self._tables setelah COMMIT.
+        """
+        key = (predicate, arity)
+        name = self._tables.get(key)
+        if name is None and pending is not None:
+            name = pending.get(key)
+        if name is None:
+            name = f"f{len(self._tables) + len(pending or ())}"
+            columns = ", ".join(f"a{i}" for i in range(max(arity, 1)))
+            execute = self.connection.execute
+            execute(f"CREATE TABLE {name} ({columns}, UNIQUE ({columns}))")
+            execute("INSERT INTO predicates VALUES (?, ?, ?)", (predicate, arity, name))
+            if pending is None:
+                self._tables[key] = name
+                self._index(name, arity)
+            else:
+                pending[key] = name
+        return name
+    
+    def _index(self, name, arity):
+        # Index UNIQUE sudah melayani a0; posisi lain perlu index sendiri
+        for position in range(1, arity):
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {name}_a{position} ON {name} (a{position})")
+    
+    _BOOLS = {True: b"true", False: b"false"}       # bool -> BLOB
+    _FROM_SQL = {b"true": True, b"false": False}    # BLOB -> bool
+    
+    @classmethod
+    def _row(cls, fact):
+        if not fact.arguments:
+            return (0,)   # fakta tanpa argumen: satu kolom dummy
+        return [cls._BOOLS[arg] if type(arg) is bool else arg
+                for arg in fact.arguments]
+    
+    @classmethod
+    def _values(cls, row):
+        """Nilai kolom SQLite kembali ke nilai Python (BLOB -> bool)"""
+        decode = cls._FROM_SQL.get
+        return [decode(value, value) for value in row]
+    
+    @classmethod
+    def _equals(cls, column, value, params):
+        """Kondisi SQL `column == value` dengan semantik Python (True == 1)"""
+        if (type(value) is bool or is_number(value)) and value in (0, 1):
+            params.extend((int(value), cls._BOOLS[bool(value)]))
+            return f"{column} IN (?, ?)"
+        params.append(value)
+        return f"{column} = ?"
+    
+    def add(self, fact):
+        """Tambahkan fakta"""
+        table = self._table(fact.predicate, len(fact.arguments))
+        row = self._row(fact)
+        self.connection.execute(
+            f"INSERT OR IGNORE INTO {table} VALUES ({', '.join('?' * len(row))})", row)
+    
+    def add_facts(self, facts, chunk_size=50000):
+        """
+        Tambahkan banyak fakta: satu transaksi dan satu executemany per
+        tabel untuk setiap `chunk_size` fakta
+        
+        Index posisi untuk tabel yang baru dibuat di sini dibangun sekali
+        di akhir (lebih cepat daripada memperbarui index per baris).
+        """
+        facts = iter(facts)
+        created = {}   # tabel baru yang sudah di-COMMIT
+        try:
+            while True:
+                chunk = list(islice(facts, chunk_size))
+                if not chunk:
+                    break
+                rows = defaultdict(list)
+                for fact in chunk:
+                    rows[(fact.predicate, len(fact.arguments))].append(self._row(fact))
+                pending = {}
+                with self.connection:   # BEGIN ... COMMIT (atau ROLLBACK)
+                    self.connection.execute("BEGIN")
+                    for (predicate, arity), table_rows in rows.items():
+                        table = self._table(predicate, arity, pending)
+                        placeholders = ", ".join("?" * max(arity, 1))
+                        self.connection.executemany(
+                            f"INSERT OR IGNORE INTO {table} VALUES ({placeholders})",
+                            table_rows)
+                # Hanya di sini: setelah ROLLBACK tabelnya juga tidak ada
+                self._tables.update(pending)
+                created.update(pending)
+        finally:
+            for (_, arity), name in created.items():
+                self._index(name, arity)
+    
+    def load_facts(self, path, chunk_size=50000):
+        """Muat fakta dari file JSON-lines atau CSV (lihat read_facts)"""
+        self.add_facts(read_facts(path, chunk_size), chunk_size)
+    
+    def remove(self, fact):
+        """
+        Hapus fakta
+        
+        Returns:
+            True jika fakta ada dan dihapus
+        """
+        table = self._tables.get((fact.predicate, len(fact.arguments)))
+        if table is None:
+            return False
+        row = self._row(fact)
+        condition = " AND ".join(f"a{i} = ?" for i in range(len(row)))
+        cursor = self.connection.execute(f"DELETE FROM {table} WHERE {condition}", row)
+        return cursor.rowcount > 0
+    
+    def __contains__(self, fact):
+        return self.exists(fact)
+    
+    def __len__(self):
+        return sum(self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                   for table in self._tables.values())
+    
+    def __iter__(self):
+        for (predicate, arity), table in list(self._tables.items()):
+            for row in self.connection.execute(f"SELECT * FROM {table}"):
+                yield Fact(predicate, self._values(row[:arity]))
+    
+    def _compile(self, patterns, negated=()):
+        """
+        Terjemahkan pola menjadi bagian SQL
+        
+        Returns:
+            (from, where, params, kolom per variabel), atau None jika ada
+            pola positif yang tabelnya belum ada (hasil pasti kosong)
+        """
+        tables = []
+        where = []
+        params = []
+        columns = {}   # variabel -> kolom pertama yang mengikatnya
+        for number, pattern in enumerate(patterns):
+            table = self._tables.get((pattern.predicate, len(pattern.arguments)))
+            if table is None:
+                return None
+            alias = f"t{number}"
+            tables.append(f"{table} AS {alias}")
+            for position, arg in enumerate(pattern.arguments):
+                column = f"{alias}.a{position}"
+                if isinstance(arg, Range):
+                    where.extend(self._range_conditions(column, arg, params))
+                    arg = arg.variable
+                    if arg is None:
+                        continue
+                if not is_variable(arg):
+                    where.append(self._equals(column, arg, params))
+                elif arg in columns:
+                    where.append(f"{column} = {columns[arg]}")
+                else:
+                    columns[arg] = column
+        for number, pattern in enumerate(negated):
+            table = self._tables.get((pattern.predicate, len(pattern.arguments)))
+            if table is None:
+                continue   # tidak ada fakta yang bisa menggagalkan negasi
+            alias = f"n{number}"
+            local = {}     # variabel yang hanya ada di pola negasi
+            conditions = []
+            for position, arg in enumerate(pattern.arguments):
+                column = f"{alias}.a{position}"
+                if isinstance(arg, Range):
+                    conditions.extend(self._range_conditions(column, arg, params))
+                    arg = arg.variable
+                    if arg is None:
+                        continue
+                if not is_variable(arg):
+                    conditions.append(self._equals(column, arg, params))
+                elif arg in columns or arg in local:
+                    conditions.append(f"{column} = {columns.get(arg) or local[arg]}")
+                else:
+                    local[arg] = column
+            where.append(f"NOT EXISTS (SELECT 1 FROM {table} AS {alias} "
+                         f"WHERE {' AND '.join(conditions) or '1'})")
+        return ", ".join(tables), " AND ".join(where) or "1", params, columns
+    
+    @staticmethod
+    def _range_conditions(column, bounds, params):
+        """Kondisi SQL untuk Range (hanya kolom angka; bool disimpan sebagai BLOB)"""
+        conditions = [f"typeof({column}) IN ('integer', 'real')"]
+        if bounds.low is not None:
+            conditions.append(f"{column} {'>=' if bounds.low_inclusive else '>'} ?")
+            params.append(bounds.low)
+        if bounds.high is not None:
+            conditions.append(f"{column} {'<=' if bounds.high_inclusive else '<'} ?")
+            params.append(bounds.high)
+        return conditions
+    
+    def _select(self, expression, patterns, negated=(), suffix=""):
+        compiled = self._compile(patterns, negated)
+        if compiled is None:
+            return None
+        tables, where, params, _ = compiled
+        return self.connection.execute(
+            f"SELECT {expression} FROM {tables} WHERE {where}{suffix}", params)
+    
+    def iter_query(self, pattern):
+        """(fact, bindings) satu per satu langsung dari cursor"""
+        arity = len(pattern.arguments)
+        matcher = compile_pattern(pattern)
+        columns = ", ".join(f"t0.a{i}" for i in range(max(arity, 1)))
+        cursor = self._select(columns, [pattern])
+        if cursor is None:
+            return
+        for row in cursor:
+            args = self._values(row[:arity])
+            yield Fact(pattern.predicate, args), {
+                var: args[position] for var, position in matcher.positions.items()
+            }
+    
+    def query(self, pattern, limit=None):
+        """List of (fact, bindings) yang cocok (maksimal `limit`)"""
+        return list(islice(self.iter_query(pattern), limit))
+    
+    def first(self, pattern):
+        """Hasil pertama yang cocok, atau None"""
+        return next(self.iter_query(pattern), None)
+    
+    def exists(self, pattern):
+        """Apakah ada fakta yang cocok dengan pola"""
+        cursor = self._select("1", [pattern], suffix=" LIMIT 1")
+        return cursor is not None and cursor.fetchone() is not None
+    
+    def count(self, pattern):
+        """Jumlah fakta yang cocok dengan pola"""
+        cursor = self._select("COUNT(*)", [pattern])
+        return 0 if cursor is None else cursor.fetchone()[0]
+    
+    def _column(self, pattern, variable):
+        position = compile_pattern(pattern).positions.get(variable)
+        if position is None:
+            raise ValueError(f"Variabel {variable} tidak ada di pola {pattern}")
+        return f"t0.a{position}"
+    
+    def group_by(self, pattern, variable):
+        """Jumlah fakta per nilai variabel (GROUP BY di SQLite)"""
+        column = self._column(pattern, variable)
+        cursor = self._select(f"{column}, COUNT(*)", [pattern],
+                              suffix=f" GROUP BY {column}")
+        decode = self._FROM_SQL.get
+        return {} if cursor is None else {decode(value, value): count
+                                          for value, count in cursor}
+    
+    def distinct(self, pattern, variable):
+        """Himpunan nilai berbeda untuk variabel"""
+        cursor = self._select(f"DISTINCT {self._column(pattern, variable)}", [pattern])
+        decode = self._FROM_SQL.get
+        return set() if cursor is None else {decode(value, value) for value, in cursor}
+    
+    def min(self, pattern, variable, key=None):
+        """Nilai terkecil variabel (key=None: urutan SQLite)"""
+        if key is not None:
+            return min(self.distinct(pattern, variable), key=key, default=None)
+        cursor = self._select(f"MIN({self._column(pattern, variable)})", [pattern])
+        return None if cursor is None else self._values(cursor.fetchone())[0]
+    
+    def max(self, pattern, variable, key=None):
+        """Nilai terbesar variabel (key=None: urutan SQLite)"""
+        if key is not None:
+            return max(self.distinct(pattern, variable), key=key, default=None)
+        cursor = self._select(f"MAX({self._column(pattern, variable)})", [pattern])
+        return None if cursor is None else self._values(cursor.fetchone())[0]
+    
+    def iter_query_all(self, patterns, negated=()):
+        """Seperti query_all, tapi bindings dibaca bertahap dari cursor"""
+        if not patterns:
+            if not any(self.exists(pattern) for pattern in negated):
+                yield {}
+            return
+        compiled = self._compile(patterns, negated)
+        if compiled is None:
+            return
+        tables, where, params, columns = compiled
+        variables = list(columns)
+        expression = ", ".join(columns[var] for var in variables) or "1"
+        for row in self.connection.execute(
+                f"SELECT {expression} FROM {tables} WHERE {where}", params):
+            yield dict(zip(variables, self._values(row)))
+    
+    def query_all(self, patterns, negated=()):
+        """
+        Query konjungtif (dengan negasi opsional) dalam satu SELECT
+        
+        Returns:
+            List bindings yang memenuhi semua pola
+        """
+        return list(self.iter_query_all(patterns, negated))
+
+
+_SNAPSHOT_MAGIC = b"FBSNAP01"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQ")   # magic, offset meta, panjang meta
+
+
+def _encode_symbol(value):
+    """Simbol sebagai bytes bertanda tipe (urutan bytes = urutan id)"""
+    kind = type(value)
+    if kind is str:
+        return b"s" + value.encode("utf-8", "surrogatepass")
+    if kind is int:
+        return b"i" + str(value).encode()
+    if kind is float:
+        return b"f" + value.hex().encode()
+    if kind is bool:
+        return b"b1" if value else b"b0"
+    raise TypeError(f"Simbol {value!r} ({kind.__name__}) tidak bisa disimpan di snapshot")
+
+
+def _decode_symbol(data):
+    kind, payload = data[:1], data[1:]
+    if kind == b"s":
+        return sys.intern(payload.decode("utf-8", "surrogatepass"))
+    if kind == b"i":
+        return int(payload)
+    if kind == b"f":
+        return float.fromhex(payload.decode())
+    return payload == b"1"
+
+
+def _symbol_keys(value):
+    """Encoding semua simbol yang == value (1, 1.0 dan True sama di Python)"""
+    if type(value) not in (int, float, bool):
+        try:
+            return (_encode_symbol(value),)
+        except TypeError:
+            return ()
+    keys = []
+    for kind in (int, float, bool):
+        try:
+            converted = kind(value)
+        except (OverflowError, ValueError):
+            continue
+        if converted == value:
+            keys.append(_encode_symbol(converted))
+    return keys
+
+
+def save_snapshot(facts, path):
+    """
+    Simpan fakta sebagai snapshot biner (dibuka dengan MappedFactBase)
+    
+    Isi file:
+    - Tabel simbol: bytes setiap simbol, terurut, plus array offset;
+      id simbol = posisi dalam urutan itu (dicari dengan bisect)
+    - Per (predicate, arity): satu array id (uint32) per posisi argumen,
+      baris terurut leksikografis (kolom pertama sekaligus index-nya)
+    - Per posisi argumen lain: urutan baris berdasarkan nilai kolom
+      (index siap pakai, tidak dibangun ulang saat dibuka)
+    - Metadata JSON (offset setiap array) di akhir file
+    """
+    symbols = {}                    # (tipe, nilai) -> bytes
+    tables = defaultdict(list)      # (predicate, arity) -> [argumen]
+    for fact in facts:
+        for value in (fact.predicate,) + fact.arguments:
+            key = (type(value), value)
+            if key not in symbols:
+                symbols[key] = _encode_symbol(value)
+        tables[(fact.predicate, len(fact.arguments))].append(fact.arguments)
+    encoded = sorted(set(symbols.values()))
+    ids = {data: number for number, data in enumerate(encoded)}
+    
+    def symbol_id(value):
+        return ids[symbols[(type(value), value)]]
+    
+    with open(path, "wb") as stream:
+        stream.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, 0, 0))
+        
+        def write(values, typecode):
+            padding = -stream.tell() % 8
+            stream.write(b"\0" * padding)
+            offset = stream.tell()
+            array(typecode, values).tofile(stream)
+            return offset
+        
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        meta = {
+            "byteorder": sys.byteorder,
+            "symbols": len(encoded),
+            "symbol_offsets": write(offsets, "Q"),
+            "symbol_data": stream.tell(),
+            "tables": [],
+        }
+        for data in encoded:
+            stream.write(data)
+        for (predicate, arity), rows in tables.items():
+            rows = sorted(tuple(symbol_id(arg) for arg in args) for args in rows)
+            columns = [array("I", column) for column in zip(*rows)]
+            orders = [None] * min(arity, 1)   # kolom pertama sudah terurut
+            distinct = [len(set(column)) for column in columns]
+            for column in columns[1:]:
+                orders.append(write(sorted(range(len(rows)), key=column.__getitem__), "I"))
+            meta["tables"].append({
+                "predicate": symbol_id(predicate),
+                "arity": arity,
+                "rows": len(rows),
+                "columns": [write(column, "I") for column in columns],
+                "orders": orders,
+                "distinct": distinct,
+            })
+        meta_offset = stream.tell()
+        text = json.dumps(meta).encode()
+        stream.write(text)
+        stream.seek(0)
+        stream.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, meta_offset, len(text)))
+
+
+class _SymbolBytes:
+    """Urutan bytes simbol di snapshot (untuk bisect)"""
+    
+    __slots__ = ("data", "offsets")
+    
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, number):
+        return bytes(self.data[self.offsets[number]:self.offsets[number + 1]])
+
+
+class _Sorted:
+    """Kolom dilihat dalam urutan index-nya (untuk bisect)"""
+    
+    __slots__ = ("column", "order")
+    
+    def __init__(self, column, order):
+        self.column = column
+        self.order = order
+    
+    def __len__(self):
+        return len(self.order)
+    
+    def __getitem__(self, number):
+        return self.column[self.order[number]]
+
+
+class _RowTuples:
+    """Baris tabel sebagai tuple id (terurut, untuk bisect)"""
+    
+    __slots__ = ("columns", "rows")
+    
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+    
+    def __len__(self):
+        return self.rows
+    
+    def __getitem__(self, row):
+        return tuple(column[row] for column in self.columns)
+
+
+class _MappedTable:
+    __slots__ = ("predicate", "rows", "columns", "orders")
+    
+    def __init__(self, predicate, rows, columns, orders):
+        self.predicate = predicate
+        self.rows = rows
+        self.columns = columns
+        self.orders = orders
+
+
+class _MappedRows:
+    """Bucket index snapshot: rentang baris dari satu/lebih tabel"""
+    
+    __slots__ = ("symbol", "segments")
+    
+    def __init__(self, symbol, segments):
+        self.symbol = symbol
+        self.segments = segments   # [(tabel, urutan atau None, awal, akhir)]
+    
+    def __len__(self):
+        return sum(stop - start for _, _, start, stop in self.segments)
+    
+    def __iter__(self):
+        symbol = self.symbol
+        for table, order, start, stop in self.segments:
+            columns = table.columns
+            # Tanpa slice order[start:stop]: view yang dipegang generator
+            # yang belum habis membuat mmap tidak bisa ditutup
+            for row in range(start, stop):
+                if order is not None:
+                    row = order[row]
+                yield Fact(table.predicate, [symbol(column[row]) for column in columns])
+
+
+class _MappedLookup:
+    """Pengganti index dict FactBase: get(kunci) -> bucket atau default"""
+    
+    __slots__ = ("lookup",)
+    
+    def __init__(self, lookup):
+        self.lookup = lookup
+    
+    def get(self, key, default=None):
+        bucket = self.lookup(key)
+        return default if bucket is None else bucket
+    
+    def __contains__(self, key):
+        return self.lookup(key) is not None
+
+
+class _MappedFacts:
+    """Pengganti FactBase.facts untuk MappedFactBase"""
+    
+    __slots__ = ("base",)
+    
+    def __init__(self, base):
+        self.base = base
+    
+    def __contains__(self, fact):
+        return self.base._contains(fact)
+    
+    def __iter__(self):
+        for key in self.base._tables:
+            yield from self.base._by_arity.get(key)
+    
+    def __len__(self):
+        return sum(table.rows for table in self.base._tables.values())
+    
+    def __bool__(self):
+        return len(self) > 0
+
+
+class MappedFactBase(FactBase):
+    """
+    FactBase read-only dari snapshot biner (save_snapshot), via mmap
+    
+    Membuka snapshot hanya membaca metadata: tabel simbol, kolom dan
+    index dipakai langsung dari file yang di-mmap, dan halaman baru
+    dibaca saat disentuh. Snapshot multi-GB terbuka dalam milidetik, dan
+    worker (proses) lain yang membuka file yang sama berbagi page cache
+    sistem operasi, bukan menyalin isinya. Di-pickle sebagai path,
+    sehingga murah dikirim ke ProcessPoolExecutor.
+    
+    Semua query FactBase didukung (query, iter_query, exists, count,
+    query_all, ...); Range disaring per kandidat. Simbol di-decode saat
+    dipakai dan disimpan di cache.
+    
+    Contoh:
+        fact_base.save_snapshot("kb.snap")
+        with MappedFactBase("kb.snap") as kb:
+            kb.query(Fact("eats", ["?x", "ikan"]))
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = [memoryview(self._map)]
+        magic, meta_offset, meta_length = _SNAPSHOT_HEADER.unpack_from(self._map)
+        if magic != _SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} bukan snapshot FactBase")
+        meta = json.loads(self._map[meta_offset:meta_offset + meta_length])
+        if meta["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path} dibuat di mesin dengan byte order lain")
+        
+        count = meta["symbols"]
+        offsets = self._array(meta["symbol_offsets"], count + 1, "Q")
+        self._symbol_bytes = _SymbolBytes(
+            self._slice(meta["symbol_data"], offsets[count]), offsets)
+        self._symbols = {}   # id -> simbol (cache decode)
+        
+        self._tables = {}                         # (predicate, arity) -> tabel
+        self._by_predicate_tables = defaultdict(list)
+        distinct = defaultdict(int)
+        for info in meta["tables"]:
+            predicate = self._symbol(info["predicate"])
+            rows = info["rows"]
+            table = _MappedTable(
+                predicate, rows,
+                [self._array(offset, rows, "I") for offset in info["columns"]],
+                [None if offset is None else self._array(offset, rows, "I")
+                 for offset in info["orders"]])
+            self._tables[(predicate, info["arity"])] = table
+            self._by_predicate_tables[predicate].append(table)
+            for position, values in enumerate(info["distinct"]):
+                distinct[(predicate, position)] += values   # perkiraan
+        
+        self.facts = _MappedFacts(self)
+        self._by_predicate = _MappedLookup(self._predicate_rows)
+        self._by_arity = _MappedLookup(self._arity_rows)
+        self._by_position = _MappedLookup(self._position_rows)
+        self._distinct = _CountView(dict(distinct))
+    
+    def _slice(self, offset, size):
+        view = self._views[0][offset:offset + size]
+        self._views.append(view)   # semua view dilepas di close()
+        return view
+    
+    def _array(self, offset, length, typecode):
+        view = self._slice(offset, length * array(typecode).itemsize).cast(typecode)
+        self._views.append(view)
+        return view
+    
+    def __reduce__(self):
+        return (MappedFactBase, (self.path,))
+    
+    def close(self):
+        """
+        Lepas mmap (bucket/fakta yang sedang diiterasi jadi tidak valid)
+        
+        Boleh dipanggil berkali-kali. Jika kode lain masih memegang view
+        ke mmap, BufferError dilempar dan close() bisa diulang setelah
+        view itu dilepas.
+        """
+        while self._views:
+            self._views.pop().release()
+        if self._map.closed:
+            return
+        try:
+            self._map.close()
+        except BufferError:
+            raise BufferError(
+                f"{self.path}: mmap masih dipakai view lain, "
+                f"lepas view itu lalu panggil close() lagi") from None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _symbol(self, number):
+        value = self._symbols.get(number)
+        if value is None:
+            value = self._symbols[number] = _decode_symbol(self._symbol_bytes[number])
+        return value
+    
+    def _symbol_ids(self, value):
+        """Id simbol yang == value (kosong jika tidak ada di snapshot)"""
+        symbols = self._symbol_bytes
+        found = []
+        for key in _symbol_keys(value):
+            number = bisect_left(symbols, key)
+            if number < len(symbols) and symbols[number] == key:
+                found.append(number)
+        return found
+    
+    def _arity_rows(self, key):
+        table = self._tables.get(key)
+        if table is None:
+            return None
+        return _MappedRows(self._symbol, [(table, None, 0, table.rows)])
+    
+    def _predicate_rows(self, predicate):
+        tables = self._by_predicate_tables.get(predicate)
+        if not tables:
+            return None
+        return _MappedRows(self._symbol,
+                           [(table, None, 0, table.rows) for table in tables])
+    
+    def _position_rows(self, key):
+        predicate, position, value = key
+        segments = []
+        for table in self._by_predicate_tables.get(predicate, ()):
+            if position >= len(table.columns):
+                continue
+            order = table.orders[position]
+            column = table.columns[position]
+            values = column if order is None else _Sorted(column, order)
+            for number in self._symbol_ids(value):
+                start = bisect_left(values, number)
+                stop = bisect_right(values, number, start)
+                if stop > start:
+                    segments.append((table, order, start, stop))
+        return _MappedRows(self._symbol, segments) if segments else None
+    
+    def _contains(self, fact):
+        table = self._tables.get((fact.predicate, len(fact.arguments)))
+        if table is None:
+            return False
+        if not table.columns:
+            return table.rows > 0
+        first = table.columns[0]
+        rows = _RowTuples(table.columns, table.rows)
+        for key in product(*(self._symbol_ids(arg) for arg in fact.arguments)):
+            # Kolom pertama (memoryview) di-bisect di C, sisanya per tuple
+            start = bisect_left(first, key[0])
+            stop = bisect_right(first, key[0], start)
+            row = bisect_left(rows, key, start, stop)
+            if row < stop and rows[row] == key:
+                return True
+        return False
+    
+    def _range_index(self, predicate, position, build=True):
+        return None   # id simbol tidak terurut numerik: Range disaring per kandidat
+    
+    def add(self, fact):
+        raise TypeError("MappedFactBase hanya bisa dibaca")
+    
+    def add_facts(self, facts):
+        raise TypeError("MappedFactBase hanya bisa dibaca")
+    
+    def remove(self, fact):
+        raise TypeError("MappedFactBase hanya bisa dibaca")
+
+
+class _OutsideWindow:
+    """
+    Pengganti `exclude` di _join_env: fakta lebih tua dari cutoff
+    (dan fakta di `exclude` asli, jika ada) dilewati
+    """
+    
+    __slots__ = ("timestamps", "cutoff", "exclude")
+    
+    def __init__(self, timestamps, cutoff, exclude=None):
+        self.timestamps = timestamps
+        self.cutoff = cutoff
+        self.exclude = exclude
+    
+    def __contains__(self, fact):
+        if self.timestamps.get(fact, self.cutoff) < self.cutoff:
+            return True
+        return self.exclude is not None and fact in self.exclude
+
+
+def substitute(pattern, bindings):
+    """Ganti variabel pada pola dengan nilai dari bindings"""
+    return Fact(pattern.predicate, [
+        bindings.get(arg, arg) if is_variable(arg) else arg
+        for arg in pattern.arguments
+    ])
+
+
+def pattern_variables(pattern):
+    """Set variabel yang muncul pada pola (termasuk variabel Range)"""
+    return set(compile_pattern(pattern).positions)
+
+
+class PatternRule:
+    """
+    Aturan IF-THEN dengan pola fakta (boleh mengandung variabel)
+    
+    Contoh:
+        PatternRule("ancestor-2",
+                    [Fact("parent", ["?x", "?y"]), Fact("ancestor", ["?y", "?z"])],
+                    Fact("ancestor", ["?x", "?z"]))
+    
+    Variabel yang sama di beberapa antecedent harus bernilai sama (join).
+    
+    Pola di `negated` tidak boleh cocok dengan fakta mana pun (negation
+    as failure), misal burung yang TIDAK punya fakta penguin(?x):
+        PatternRule("terbang", [Fact("burung", ["?x"])],
+                    Fact("bisa_terbang", ["?x"]),
+                    negated=[Fact("penguin", ["?x"])])
+    
+    Dengan `within` (detik), antecedent hanya cocok dengan fakta
+    TimedFactBase yang timestamp-nya dalam jendela waktu terakhir
+    (sliding window), misal within=60 untuk "dalam 60 detik".
+    """
+    
+    def __init__(self, name, antecedents, conclusion, negated=(), within=None):
+        """
+        Args:
+            name: Nama aturan
+            antecedents: List pola (IF part)
+            conclusion: Pola kesimpulan (THEN part)
+            negated: List pola yang harus TIDAK ada (IF NOT part)
+            within: Jendela waktu antecedent dalam detik (None = tanpa batas)
+        """
+        self.name = name
+        self.antecedents = list(antecedents)
+        self.conclusion = conclusion
+        self.negated = list(negated)
+        self.within = within
+        
+        if any(isinstance(arg, Range) for arg in conclusion.arguments):
+            raise ValueError(f"Range tidak boleh ada di kesimpulan {name}")
+        bound = set()
+        for pattern in self.antecedents:
+            bound |= pattern_variables(pattern)
+        unbound = pattern_variables(conclusion) - bound
+        if unbound:
+            raise ValueError(
+                f"Variabel {sorted(unbound)} pada kesimpulan {name} "
+                f"tidak muncul di antecedent"
+            )
+    
+    def __str__(self):
+        antecedents_str = " AND ".join(
+            [str(p) for p in self.antecedents] +
+            [f"NOT {p}" for p in self.negated]
+        )
+        if self.within is not None:
+            antecedents_str += f" WITHIN {self.within}s"
+        return f"{self.name}: IF {antecedents_str} THEN {self.conclusion}"
+
+
+def _argument_from_record(arg):
+    """Argumen pola JSON: {"gt": 60, "var": "?a"} menjadi Range"""
+    if not isinstance(arg, dict):
+        return arg
+    low = arg.get("gt", arg.get("ge"))
+    high = arg.get("lt", arg.get("le"))
+    return Range(low, high, "gt" not in arg, "lt" not in arg, arg.get("var"))
+
+
+def parse_pattern(text):
+    """
+    Pola dari teks seperti hasil str(Fact): "parent(?x, budi)"
+    
+    Argumen angka jadi int/float; argumen berisi koma atau kurung tidak
+    didukung (pakai JSON-lines untuk itu).
+    """
+    predicate, separator, rest = text.strip().partition("(")
+    if not separator or not rest.endswith(")"):
+        raise ValueError(f"Pola tidak valid: {text!r}")
+    arguments = rest[:-1].strip()
+    return Fact(predicate.strip(), [
+        _parse_value(arg.strip()) for arg in arguments.split(",")
+    ] if arguments else [])
+
+
+def _pattern_from_record(record):
+    if isinstance(record, dict):
+        record = dict(record, arguments=[
+            _argument_from_record(arg) for arg in record.get("arguments", ())])
+    else:
+        record = [record[0]] + [_argument_from_record(arg) for arg in record[1:]]
+    return _fact_from_record(record)
+
+
+def _rule_from_record(record):
+    """PatternRule dari objek JSON"""
+    return PatternRule(
+        record["name"],
+        [_pattern_from_record(item) for item in record["antecedents"]],
+        _pattern_from_record(record["conclusion"]),
+        negated=[_pattern_from_record(item) for item in record.get("negated", ())],
+        within=record.get("within"),
+    )
+
+
+def _rule_from_row(row):
+    """PatternRule dari baris CSV (pola sebagai teks, dipisah ';')"""
+    def patterns(text):
+        return [parse_pattern(item) for item in (text or "").split(";")
+                if item.strip()]
+    within = row.get("within")
+    return PatternRule(row["name"], patterns(row["antecedents"]),
+                       parse_pattern(row["conclusion"]),
+                       negated=patterns(row.get("negated")),
+                       within=float(within) if within else None)
+
+
+def load_rules(path, chunk_size=50000):
+    """
+    Aturan berpola (PatternRule) dari file JSON-lines atau CSV
     
-    Contoh: Fact("is", ["kucing", "mamalia"])
-    Artinya: "kucing is mamalia" atau "kucing adalah mamalia"
+    JSON-lines, satu aturan per baris:
+        {"name": "lansia", "antecedents": [["usia", "?p", {"gt": 60}]],
+         "conclusion": ["lansia", "?p"], "negated": [], "within": null}
+    CSV dengan header name,antecedents,conclusion[,negated,within]:
+        lansia,"usia(?p, ?a); sakit(?p)",pasien_prioritas(?p)
+    (Range hanya bisa ditulis di JSON-lines.)
     """
+    if str(path).lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as stream:
+            return [_rule_from_row(row) for row in csv.DictReader(stream)]
+    return [_rule_from_record(record)
+            for chunk in read_records(path, chunk_size)
+            for record in chunk]
+
+
+def stratify(rules):
+    """
+    Strata aturan berpola untuk negation as failure
     
-    def __init__(self, predicate, arguments):
-        """
-        Args:
-            predicate: Predikat/hubungan (misal: "is", "has", "eats")
-            arguments: List argumen
-        """
-        self.predicate = predicate
-        self.arguments = arguments if isinstance(arguments, list) else [arguments]
+    Strata predicate kesimpulan >= strata predicate antecedent, dan
+    > strata predicate yang dinegasikan. Aturan di strata k baru dievaluasi
+    setelah strata < k mencapai fixpoint, sehingga fakta yang dinegasikan
+    sudah lengkap saat dicek.
     
-    def __eq__(self, other):
-        if not isinstance(other, Fact):
-            return False
-        return (self.predicate == other.predicate and 
-                self.arguments == other.arguments)
+    Returns:
+        List strata (0, 1, ...) per aturan, sesuai urutan `rules`
     
-    def __hash__(self):
-        return hash((self.predicate, tuple(self.arguments)))
+    Raises:
+        ValueError: jika ada negasi di dalam siklus (tidak bisa distratifikasi)
+    """
+    users = defaultdict(list)   # predicate -> nomor aturan yang memakainya
+    for number, rule in enumerate(rules):
+        for pattern in rule.antecedents + rule.negated:
+            users[pattern.predicate].append(number)
+    level = {}
+    work = list(range(len(rules)))
+    while work:
+        rule = rules[work.pop()]
+        needed = max((level.get(p.predicate, 0) for p in rule.antecedents),
+                     default=0)
+        for pattern in rule.negated:
+            needed = max(needed, level.get(pattern.predicate, 0) + 1)
+        predicate = rule.conclusion.predicate
+        if needed > level.get(predicate, 0):
+            if needed > len(rules):
+                raise ValueError(
+                    f"Aturan tidak bisa distratifikasi: negasi di dalam "
+                    f"siklus melalui '{predicate}'"
+                )
+            level[predicate] = needed
+            work.extend(users[predicate])
+    return [level.get(rule.conclusion.predicate, 0) for rule in rules]
+
+
+def _absent(fact_base, negations, env):
+    """
+    Anti-join untuk satu environment: True jika tidak ada pola negasi
+    yang cocok. Pola yang ground cukup satu probe ke set fakta; pola
+    dengan variabel bebas satu probe index (berhenti di fakta pertama).
+    """
+    values = env.values
+    for matcher, ground in negations:
+        if ground:
+            if matcher.build(values) in fact_base.facts:
+                return False
+            continue
+        mark = len(env.trail)
+        for fact in matcher.candidates(fact_base, values):
+            if matcher.bind(fact, env):
+                env.undo(mark)
+                return False
+    return True
+
+
+def join_patterns(fact_base, steps, bindings):
+    """
+    Cari semua bindings yang memenuhi rangkaian pola (nested index join)
     
-    def __str__(self):
-        args_str = ", ".join(str(arg) for arg in self.arguments)
-        return f"{self.predicate}({args_str})"
+    Args:
+        fact_base: FactBase sumber kandidat
+        steps: List (pattern, exclude) — fakta di `exclude` dilewati
+        bindings: Bindings awal
     
-    def matches(self, pattern, bindings=None):
+    Yields:
+        Dictionary bindings untuk setiap kombinasi yang cocok
+    """
+    compiled = [(compile_pattern(pattern), exclude) for pattern, exclude in steps]
+    for env in _join_env(fact_base, compiled, Bindings(bindings)):
+        yield env.to_dict()
+
+
+def _join_env(fact_base, steps, env, index=0):
+    """
+    Join dengan CompiledPattern dan trail: env yang sama dipakai ulang
+    
+    Env yang di-yield hanya valid sampai generator dilanjutkan.
+    """
+    if index == len(steps):
+        yield env
+        return
+    matcher, exclude = steps[index]
+    trail = env.trail
+    for fact in matcher.candidates(fact_base, env.values):
+        if exclude is not None and fact in exclude:
+            continue
+        mark = len(trail)
+        if matcher.bind(fact, env):
+            yield from _join_env(fact_base, steps, env, index + 1)
+            env.undo(mark)
+
+
+class DatalogEngine:
+    """
+    Evaluasi aturan berpola sampai fixpoint dengan semi-naive evaluation
+    
+    Naive: setiap iterasi mengevaluasi ulang semua aturan terhadap semua
+    fakta, sehingga fakta lama diturunkan berulang kali.
+    
+    Semi-naive: setiap iterasi hanya mencari turunan yang memakai minimal
+    satu fakta BARU (delta) dari iterasi sebelumnya. Untuk aturan dengan
+    antecedent p1..pn, delta dicoba di posisi i; posisi sebelum i memakai
+    fakta lama saja, sehingga setiap turunan hanya dihitung sekali.
+    
+    Aturan dengan negasi dievaluasi per strata (lihat stratify): setiap
+    strata mencapai fixpoint sebelum strata berikutnya, dan negasi dicek
+    dengan anti-join ke fact_base. Karena fakta hanya bertambah, kesimpulan
+    lama tidak ditarik jika fakta yang dinegasikan ditambahkan belakangan.
+    """
+    
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._matchers = {
+            rule: [compile_pattern(p) for p in rule.antecedents]
+            for rule in self.rules
+        }
+        self._negations = {}
+        for rule in self.rules:
+            if rule.negated:
+                bound = set()
+                for pattern in rule.antecedents:
+                    bound |= pattern_variables(pattern)
+                self._negations[rule] = [
+                    (compile_pattern(p),
+                     pattern_variables(p) <= bound and not compile_pattern(p).ranges)
+                    for p in rule.negated
+                ]
+        levels = stratify(self.rules) if self._negations else [0] * len(self.rules)
+        self.strata = [[] for _ in range(max(levels, default=0) + 1)]
+        for rule, level in zip(self.rules, levels):
+            self.strata[level].append(rule)
+    
+    def run(self, fact_base, added=None):
         """
-        Cek apakah fakta ini cocok dengan pola
+        Jalankan inferensi, kesimpulan ditambahkan ke fact_base
         
         Args:
-            pattern: Pola fakta (bisa mengandung variabel)
-            bindings: Dictionary binding variabel
+            fact_base: FactBase yang diproses
+            added: Fakta yang baru saja ditambahkan ke fact_base yang
+                   sebelumnya sudah di-fixpoint. None = evaluasi penuh.
         
         Returns:
-            Dictionary bindings jika cocok, None jika tidak
+            Set fakta baru yang diturunkan
+        """
+        derived = set()
+        changed = None
+        if added is not None:
+            changed = FactBase()   # fakta baru untuk strata berikutnya
+            for fact in added:
+                changed.add(fact)
+        for rules in self.strata:
+            if added is None:
+                # Iterasi pertama: semua fakta dianggap delta
+                delta = self._derive(rules, fact_base, None)
+            else:
+                delta = self._derive(rules, fact_base, changed)
+            while delta.facts:
+                for fact in delta.facts:
+                    fact_base.add(fact)
+                    if changed is not None and len(self.strata) > 1:
+                        changed.add(fact)
+                derived |= delta.facts
+                delta = self._derive(rules, fact_base, delta)
+        return derived
+    
+    def _derive(self, rules, fact_base, delta):
+        new = FactBase()
+        negations = self._negations
+        for rule in rules:
+            conclusion = compile_pattern(rule.conclusion)
+            negated = negations.get(rule)
+            for env in self.delta_matches(rule, fact_base, delta):
+                if negated is not None and not _absent(fact_base, negated, env):
+                    continue
+                fact = conclusion.build(env.values)
+                if fact not in fact_base.facts:
+                    new.add(fact)
+        return new
+    
+    def delta_matches(self, rule, fact_base, delta, window=True):
         """
-        if bindings is None:
-            bindings = {}
+        Bindings aturan yang memakai minimal satu fakta dari delta
         
-        # Predikat harus sama
-        if self.predicate != pattern.predicate:
-            return None
+        Semua fakta delta harus sudah ada di fact_base. delta=None berarti
+        semua kombinasi (evaluasi penuh). window=False mengabaikan
+        jendela waktu aturan (`within`).
         
-        # Jumlah argumen harus sama
-        if len(self.arguments) != len(pattern.arguments):
-            return None
+        Yields:
+            Bindings (environment yang sama dipakai ulang, hanya valid
+            sampai generator dilanjutkan)
+        """
+        matchers = self._matchers[rule]
+        timestamps = cutoff = None
+        if window and rule.within is not None and isinstance(fact_base, TimedFactBase):
+            # Sliding window: fakta yang lebih tua dari cutoff dilewati
+            timestamps = fact_base.timestamps
+            cutoff = fact_base.clock() - rule.within
         
-        # Cek setiap argumen
-        new_bindings = bindings.copy()
-        for fact_arg, pattern_arg in zip(self.arguments, pattern.arguments):
-            # Jika pattern_arg adalah variabel (dimulai dengan ?)
-            if isinstance(pattern_arg, str) and pattern_arg.startswith("?"):
-                var_name = pattern_arg
-                
-                # Jika variabel sudah ada binding
-                if var_name in new_bindings:
-                    # Cek apakah konsisten
-                    if new_bindings[var_name] != fact_arg:
-                        return None
-                else:
-                    # Tambah binding baru
-                    new_bindings[var_name] = fact_arg
-            else:
-                # Bukan variabel, harus exact match
-                if fact_arg != pattern_arg:
-                    return None
+        def skip(exclude):
+            if timestamps is None:
+                return exclude
+            return _OutsideWindow(timestamps, cutoff, exclude)
         
-        return new_bindings
+        if delta is None:
+            steps = [(matcher, skip(None)) for matcher in matchers]
+            yield from _join_env(fact_base, steps, Bindings())
+            return
+        for i, matcher in enumerate(matchers):
+            if matcher.predicate not in delta._by_predicate:
+                continue
+            # Posisi i dari delta, sebelum i hanya fakta lama, sesudah i semua
+            steps = ([(m, skip(delta.facts)) for m in matchers[:i]] +
+                     [(m, skip(None)) for m in matchers[i + 1:]])
+            env = Bindings()
+            for fact in matcher.candidates(delta, env.values):
+                if timestamps is not None and timestamps.get(fact, cutoff) < cutoff:
+                    continue
+                if matcher.bind(fact, env):
+                    yield from _join_env(fact_base, steps, env)
+                    env.undo(0)
 
 
-class FactBase:
+class TruthMaintenance:
     """
-    Database fakta dengan kemampuan pattern matching
+    Pemeliharaan kesimpulan saat fakta ditambah atau ditarik (retract)
+    
+    Fakta dasar (di-assert) dibedakan dari fakta turunan. Saat fakta
+    dasar ditarik, hanya kesimpulan yang bergantung padanya yang dihapus,
+    tanpa menjalankan ulang inferensi dari awal.
+    
+    Algoritma DRed (Delete and Rederive):
+    1. Overdelete: hapus semua fakta yang punya turunan memakai fakta
+       yang ditarik (semi-naive, dari fakta yang ditarik)
+    2. Rederive: fakta terhapus yang masih bisa diturunkan dari fakta
+       tersisa dikembalikan
+    3. Propagasi: turunan dari fakta yang dikembalikan dihitung ulang
+    
+    Berlaku juga untuk aturan rekursif (misal ancestor), yang tidak bisa
+    ditangani dengan hitungan jumlah justifikasi saja.
     """
     
-    def __init__(self):
-        self.facts = set()
+    def __init__(self, rules, fact_base=None):
+        self.engine = DatalogEngine(rules)
+        if self.engine._negations:
+            # Menambah fakta bisa membatalkan kesimpulan (non-monoton),
+            # yang tidak ditangani DRed di sini
+            raise ValueError("TruthMaintenance tidak mendukung aturan dengan negasi")
+        self.fact_base = fact_base if fact_base is not None else FactBase()
+        self.base = set(self.fact_base.facts)   # fakta dasar
+        self._by_predicate = defaultdict(list)
+        for rule in self.engine.rules:
+            self._by_predicate[rule.conclusion.predicate].append(rule)
+        self.engine.run(self.fact_base)
     
-    def add(self, fact):
-        """Tambahkan fakta"""
-        self.facts.add(fact)
+    def assert_fact(self, fact):
+        """
+        Tambahkan fakta dasar
+        
+        Returns:
+            Set fakta baru yang diturunkan
+        """
+        return self.assert_facts([fact])
     
-    def query(self, pattern):
+    def assert_facts(self, facts):
+        """Tambahkan banyak fakta dasar sekaligus"""
+        added = []
+        for fact in facts:
+            if fact in self.base:
+                continue
+            self.base.add(fact)
+            # Fakta bisa sudah ada di fact_base (turunan, atau ditambahkan
+            # langsung, misal TimedFactBase.add dengan TTL)
+            self.fact_base.add(fact)
+            added.append(fact)
+        if not added:
+            return set()
+        return self.engine.run(self.fact_base, added)
+    
+    def retract_fact(self, fact):
         """
-        Query fakta berdasarkan pola
+        Tarik fakta dasar beserta kesimpulan yang bergantung padanya
         
-        Args:
-            pattern: Pola fakta yang dicari
+        Returns:
+            Set fakta yang benar-benar hilang dari fact_base
+        """
+        return self.retract_facts([fact])
+    
+    def retract_facts(self, facts):
+        """Tarik banyak fakta dasar sekaligus"""
+        deleted = FactBase()
+        for fact in facts:
+            if fact in self.base:
+                self.base.discard(fact)
+                deleted.add(fact)
+        if not deleted.facts:
+            return set()
+        
+        # 1. Overdelete (dihitung terhadap isi fact_base sebelum dihapus)
+        fact_base = self.fact_base
+        overdeleted = set(deleted.facts)
+        delta = deleted
+        while delta.facts:
+            next_delta = FactBase()
+            for rule in self.engine.rules:
+                conclusion = compile_pattern(rule.conclusion)
+                # Tanpa jendela waktu: turunan lama tetap harus ikut terhapus
+                for env in self.engine.delta_matches(rule, fact_base, delta,
+                                                     window=False):
+                    fact = conclusion.build(env.values)
+                    if fact in fact_base.facts and fact not in overdeleted:
+                        overdeleted.add(fact)
+                        next_delta.add(fact)
+            delta = next_delta
+        for fact in overdeleted:
+            fact_base.remove(fact)
+        
+        # 2. Rederive: cukup satu langkah dari fakta yang tersisa
+        rederived = [fact for fact in overdeleted
+                     if fact in self.base or self._derivable(fact)]
+        for fact in rederived:
+            fact_base.add(fact)
+        
+        # 3. Propagasi fakta yang dikembalikan
+        if rederived:
+            self.engine.run(fact_base, rederived)
+        return {fact for fact in overdeleted if fact not in fact_base.facts}
+    
+    def _derivable(self, fact):
+        """Apakah fakta bisa diturunkan satu langkah dari fakta yang ada"""
+        for rule in self._by_predicate[fact.predicate]:
+            bindings = unify_head(rule.conclusion, fact)
+            if bindings is None:
+                continue
+            steps = [(pattern, None) for pattern in rule.antecedents]
+            for _ in join_patterns(self.fact_base, steps, bindings):
+                return True
+        return False
+
+
+def unify_head(head, goal):
+    """
+    Unifikasi kesimpulan aturan dengan goal
+    
+    Returns:
+        Bindings untuk variabel aturan, atau None jika tidak bisa cocok
+    """
+    if head.predicate != goal.predicate:
+        return None
+    if len(head.arguments) != len(goal.arguments):
+        return None
+    bindings = {}
+    for head_arg, goal_arg in zip(head.arguments, goal.arguments):
+        if isinstance(goal_arg, Range):
+            # Range di goal diperlakukan seperti variabel (disaring di jawaban)
+            if not is_variable(head_arg) and not goal_arg.contains(head_arg):
+                return None
+            continue
+        if is_variable(head_arg):
+            if is_variable(goal_arg):
+                continue
+            if bindings.setdefault(head_arg, goal_arg) != goal_arg:
+                return None
+        elif not is_variable(goal_arg) and head_arg != goal_arg:
+            return None
+    return bindings
+
+
+def variant_key(pattern):
+    """
+    Kunci tabel untuk pola: pola yang hanya beda nama variabel
+    (misal p(?x, ?y) dan p(?a, ?b)) mendapat kunci yang sama
+    """
+    constants = []
+    slots = []
+    numbering = {}
+    for arg in pattern.arguments:
+        if is_variable(arg):
+            constants.append(None)
+            slots.append(numbering.setdefault(arg, len(numbering)))
+        else:
+            constants.append(arg)
+            slots.append(-1)
+    return (pattern.predicate, tuple(constants), tuple(slots))
+
+
+class _Table:
+    """Tabel jawaban untuk satu goal (variant)"""
+    
+    __slots__ = ("matcher", "answers", "seen", "complete", "consumers")
+    
+    def __init__(self, goal):
+        self.matcher = compile_pattern(goal)
+        self.answers = []    # urutan ditemukan
+        self.seen = set()
+        self.complete = False
+        self.consumers = []  # (tabel, aturan, posisi, bindings, matcher sub-goal)
+
+
+class TabledProver:
+    """
+    Backward chaining dengan tabling untuk aturan berpola (PatternRule)
+    
+    Berbeda dengan DatalogEngine yang menghitung semua kesimpulan,
+    prover hanya mengevaluasi sub-goal yang dibutuhkan oleh goal.
+    
+    Tabling:
+    - Jawaban setiap sub-goal (per variant) disimpan dan dipakai ulang
+    - Sub-goal yang sudah punya tabel tidak dievaluasi ulang: pemanggil
+      didaftarkan sebagai consumer dan menerima jawaban yang sudah ada
+      sekarang, lalu setiap jawaban baru tepat satu kali (semi-naive)
+    - Evaluasi memakai work stack eksplisit (tanpa rekursi), sehingga
+      rantai rekursi yang dalam (misal ancestor) aman
+    - Saat work stack habis, semua tabel yang sedang dievaluasi
+      (seluruh SCC yang dijangkau goal) ditandai lengkap bersama-sama
+    
+    Negasi: aktivasi aturan dengan NOT ditunda sampai work stack habis,
+    lalu diproses per strata (terendah dulu). Sub-goal yang dinegasikan
+    berada di strata lebih rendah, sehingga tabelnya sudah lengkap saat
+    dicek.
+    
+    Tabel berlaku untuk isi fact_base saat ini; panggil reset() jika
+    fakta berubah.
+    """
+    
+    def __init__(self, rules, fact_base):
+        self.rules = list(rules)
+        self._level = defaultdict(int)   # predicate -> strata
+        if any(rule.negated for rule in self.rules):
+            # ValueError jika negasi dalam siklus
+            for rule, level in zip(self.rules, stratify(self.rules)):
+                predicate = rule.conclusion.predicate
+                self._level[predicate] = max(self._level[predicate], level)
+        self.fact_base = fact_base
+        self._by_predicate = defaultdict(list)
+        for rule in self.rules:
+            self._by_predicate[rule.conclusion.predicate].append(rule)
+        self.reset()
+    
+    def reset(self):
+        """Kosongkan semua tabel"""
+        self._tables = {}
+        self._incomplete = []   # tabel yang belum lengkap
+        self._work = []         # (tabel, aturan, posisi antecedent, bindings)
+        self._deferred = []     # (strata, tabel, aturan, bindings) dengan NOT
+    
+    def solve(self, goal):
+        """
+        Semua jawaban untuk goal
         
         Returns:
-            List of (fact, bindings) yang cocok
+            List of (fact, bindings), seperti FactBase.query
         """
         results = []
-        for fact in self.facts:
-            bindings = fact.matches(pattern)
+        for fact in self._answers(goal):
+            bindings = fact.matches(goal)
             if bindings is not None:
                 results.append((fact, bindings))
         return results
     
-    def display(self):
-        """Tampilkan semua fakta"""
-        print("\nFakta dalam database:")
-        if not self.facts:
-            print("  (kosong)")
-        for fact in self.facts:
-            print(f"  • {fact}")
+    def prove(self, goal):
+        """
+        Buktikan goal
+        
+        Returns:
+            Bindings jawaban pertama, atau None jika tidak terbukti
+        """
+        for fact in self._answers(goal):
+            bindings = fact.matches(goal)
+            if bindings is not None:
+                return bindings
+        return None
+    
+    def _answers(self, goal):
+        """Jawaban dari fakta (FactBase) dan dari aturan (tabel)"""
+        if goal.predicate not in self._by_predicate:
+            return [fact for fact, _ in self.fact_base.query(goal)]
+        table = self._table(goal)
+        self._run()
+        return table.answers
+    
+    def _table(self, goal):
+        """Tabel untuk goal; tabel baru diisi fakta dan dijadwalkan"""
+        key = variant_key(goal)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = _Table(goal)
+            self._incomplete.append(table)
+            for fact, _ in self.fact_base.query(goal):
+                table.seen.add(fact)
+                table.answers.append(fact)
+            for rule in self._by_predicate[goal.predicate]:
+                bindings = unify_head(rule.conclusion, goal)
+                if bindings is not None:
+                    self._work.append((table, rule, 0, bindings))
+        return table
+    
+    def _run(self):
+        """Proses work stack (dan aktivasi tertunda) sampai fixpoint"""
+        work = self._work
+        while True:
+            while work:
+                self._advance(*work.pop())
+            if not self._deferred:
+                break
+            level = min(entry[0] for entry in self._deferred)
+            batch = [entry for entry in self._deferred if entry[0] == level]
+            self._deferred = [entry for entry in self._deferred if entry[0] != level]
+            for _, _, rule, bindings in batch:
+                for pattern in rule.negated:
+                    subgoal = substitute(pattern, bindings)
+                    if subgoal.predicate in self._by_predicate:
+                        self._table(subgoal)
+            if work:
+                # Tabel sub-goal negasi baru dibuat: evaluasi dulu
+                self._deferred.extend(batch)
+                continue
+            for _, table, rule, bindings in batch:
+                if self._absent(rule.negated, bindings):
+                    self._add_answer(table, compile_pattern(rule.conclusion).build(bindings))
+        for table in self._incomplete:
+            table.complete = True
+            table.consumers = []
+        self._incomplete = []
+    
+    def _advance(self, table, rule, index, bindings):
+        """Lanjutkan body aturan dari antecedent ke-index"""
+        antecedents = rule.antecedents
+        if index == len(antecedents):
+            if rule.negated:
+                level = self._level[rule.conclusion.predicate]
+                self._deferred.append((level, table, rule, bindings))
+            else:
+                self._add_answer(table, compile_pattern(rule.conclusion).build(bindings))
+            return
+        subgoal = substitute(antecedents[index], bindings)
+        matcher = compile_pattern(subgoal)
+        if subgoal.predicate in self._by_predicate:
+            called = self._table(subgoal)
+            if not called.complete:
+                called.consumers.append((table, rule, index, bindings, matcher))
+            answers = list(called.answers)
+        else:
+            answers = matcher.candidates(self.fact_base, _NO_BINDINGS)
+        work = self._work
+        for fact in answers:
+            new_bindings = matcher.match_dict(fact, bindings)
+            if new_bindings is not None:
+                work.append((table, rule, index + 1, new_bindings))
+    
+    def _add_answer(self, table, fact):
+        """Jawaban baru: simpan dan teruskan ke setiap consumer tabel"""
+        if fact in table.seen or not table.matcher.accepts(fact):
+            return
+        table.seen.add(fact)
+        table.answers.append(fact)
+        work = self._work
+        for consumer, rule, index, bindings, matcher in table.consumers:
+            new_bindings = matcher.match_dict(fact, bindings)
+            if new_bindings is not None:
+                work.append((consumer, rule, index + 1, new_bindings))
+    
+    def _absent(self, negated, bindings):
+        """Negation as failure: tidak ada jawaban untuk pola negasi"""
+        for pattern in negated:
+            subgoal = substitute(pattern, bindings)
+            if subgoal.predicate in self._by_predicate:
+                answers = self._table(subgoal).answers
+                if any(fact.matches(subgoal) is not None for fact in answers):
+                    return False
+            elif self.fact_base.exists(subgoal):
+                return False
+        return True
 
 
 def demo_simple_matching():
@@ -180,9 +2870,9 @@ def demo_simple_matching():
     print("-"*60)
     
     pattern2 = Fact("has", ["kucing", "ekor"])
-    results2 = fb.query(pattern2)
     
-    if results2:
+    # exists() berhenti di hasil pertama, tidak membuat list
+    if fb.exists(pattern2):
         print("  ✓ YA, kucing punya ekor")
     else:
         print("  ✗ TIDAK, tidak ditemukan")
@@ -242,6 +2932,129 @@ def demo_complex_matching():
         animal = bindings["?animal"]
         food = bindings["?food"]
         print(f"  • {animal} makan {food}")
+    
+    # Query konjungtif: dua pola dengan variabel bersama
+    print("\n" + "="*60)
+    print("3. QUERY: Hewan rumah makan apa?")
+    print("   Pattern: eats(?animal, ?food) AND lives_in(?animal, rumah)")
+    print("-"*60)
+    
+    results = fb.query_all([
+        Fact("eats", ["?animal", "?food"]),
+        Fact("lives_in", ["?animal", "rumah"]),
+    ])
+    
+    for bindings in results:
+        print(f"  • {bindings['?animal']} makan {bindings['?food']}")
+    
+    # Agregasi langsung dari index, tanpa dict bindings per hasil
+    print("\n" + "="*60)
+    print("4. AGREGASI: Berapa hewan di setiap habitat?")
+    print("   group_by(lives_in(?animal, ?habitat), ?habitat)")
+    print("-"*60)
+    
+    pattern = Fact("lives_in", ["?animal", "?habitat"])
+    for habitat, total in sorted(fb.group_by(pattern, "?habitat").items()):
+        print(f"  • {habitat}: {total} hewan")
+    print(f"  Total: {fb.count(pattern)}, "
+          f"habitat berbeda: {len(fb.distinct(pattern, '?habitat'))}")
+
+
+def demo_datalog_ancestor():
+    """
+    Demo: Aturan rekursif dengan variabel (ancestor dari parent)
+    """
+    print("\n" + "="*60)
+    print("DEMO: Aturan Rekursif (Semi-Naive Evaluation)")
+    print("="*60)
+    
+    fb = FactBase()
+    for parent, child in [("kakek", "ayah"), ("ayah", "anak"), ("anak", "cucu")]:
+        fb.add(Fact("parent", [parent, child]))
+    
+    rules = [
+        PatternRule("A1",
+                    [Fact("parent", ["?x", "?y"])],
+                    Fact("ancestor", ["?x", "?y"])),
+        PatternRule("A2",
+                    [Fact("parent", ["?x", "?y"]), Fact("ancestor", ["?y", "?z"])],
+                    Fact("ancestor", ["?x", "?z"])),
+    ]
+    
+    print("\nAturan:")
+    for rule in rules:
+        print(f"  {rule}")
+    
+    derived = DatalogEngine(rules).run(fb)
+    print(f"\nDiturunkan {len(derived)} fakta baru.")
+    
+    print("\nSiapa keturunan kakek?")
+    for fact, bindings in fb.query(Fact("ancestor", ["kakek", "?z"])):
+        print(f"  • {bindings['?z']}")
+
+
+def demo_backward_chaining():
+    """
+    Demo: Backward chaining dengan tabling
+    Hanya sub-goal yang dibutuhkan pertanyaan yang dievaluasi
+    """
+    print("\n" + "="*60)
+    print("DEMO: Backward Chaining dengan Tabling")
+    print("="*60)
+    
+    fb = FactBase()
+    for parent, child in [("kakek", "ayah"), ("ayah", "anak"),
+                          ("anak", "cucu"), ("paman", "sepupu")]:
+        fb.add(Fact("parent", [parent, child]))
+    
+    # Aturan rekursif kiri: tanpa tabling akan rekursi selamanya
+    rules = [
+        PatternRule("A1",
+                    [Fact("parent", ["?x", "?y"])],
+                    Fact("ancestor", ["?x", "?y"])),
+        PatternRule("A2",
+                    [Fact("ancestor", ["?x", "?y"]), Fact("parent", ["?y", "?z"])],
+                    Fact("ancestor", ["?x", "?z"])),
+    ]
+    prover = TabledProver(rules, fb)
+    
+    print("\nApakah kakek leluhur cucu?")
+    print("  ✓ YA" if prover.prove(Fact("ancestor", ["kakek", "cucu"])) is not None
+          else "  ✗ TIDAK")
+    
+    print("\nApakah paman leluhur cucu?")
+    print("  ✓ YA" if prover.prove(Fact("ancestor", ["paman", "cucu"])) is not None
+          else "  ✗ TIDAK")
+
+
+def demo_truth_maintenance():
+    """
+    Demo: Menarik fakta (retract) tanpa menghitung ulang dari awal
+    """
+    print("\n" + "="*60)
+    print("DEMO: Truth Maintenance (Retract Fakta)")
+    print("="*60)
+    
+    rules = [
+        PatternRule("S1",
+                    [Fact("sensor", ["?ruang", "asap"])],
+                    Fact("alarm", ["?ruang"])),
+        PatternRule("S2",
+                    [Fact("alarm", ["?ruang"]), Fact("terhubung", ["?ruang", "?lain"])],
+                    Fact("waspada", ["?lain"])),
+    ]
+    tms = TruthMaintenance(rules)
+    tms.assert_facts([
+        Fact("terhubung", ["dapur", "ruang tamu"]),
+        Fact("sensor", ["dapur", "asap"]),
+    ])
+    print("\nSetelah sensor dapur mendeteksi asap:")
+    tms.fact_base.display()
+    
+    removed = tms.retract_fact(Fact("sensor", ["dapur", "asap"]))
+    print("\nSensor kembali normal, kesimpulan yang ditarik:")
+    for fact in removed:
+        print(f"  ✗ {fact}")
 
 
 def exercise_family_tree():
@@ -281,6 +3094,236 @@ def exercise_family_tree():
     pass
 
 
+def demo_negation():
+    """
+    Demo: Negation as failure (IF NOT) dengan strata
+    """
+    print("\n" + "="*60)
+    print("DEMO: Negasi (Negation as Failure)")
+    print("="*60)
+    
+    fb = FactBase()
+    for animal in ["elang", "pinguin", "merpati", "burung_unta"]:
+        fb.add(Fact("burung", [animal]))
+    fb.add(Fact("tidak_bisa_terbang", ["pinguin"]))
+    fb.add(Fact("berat", ["burung_unta", "besar"]))
+    
+    rules = [
+        PatternRule("N1",
+                    [Fact("berat", ["?x", "besar"])],
+                    Fact("tidak_bisa_terbang", ["?x"])),
+        PatternRule("N2",
+                    [Fact("burung", ["?x"])],
+                    Fact("bisa_terbang", ["?x"]),
+                    negated=[Fact("tidak_bisa_terbang", ["?x"])]),
+    ]
+    
+    print("\nAturan:")
+    for rule, level in zip(rules, stratify(rules)):
+        print(f"  [strata {level}] {rule}")
+    
+    DatalogEngine(rules).run(fb)
+    print("\nBurung yang bisa terbang:")
+    for fact, bindings in fb.query(Fact("bisa_terbang", ["?x"])):
+        print(f"  • {bindings['?x']}")
+    
+    print("\nQuery: burung(?x) AND NOT bisa_terbang(?x)")
+    for bindings in fb.query_all([Fact("burung", ["?x"])],
+                                 negated=[Fact("bisa_terbang", ["?x"])]):
+        print(f"  • {bindings['?x']}")
+
+
+def demo_snapshot():
+    """
+    Demo: Snapshot (MVCC) untuk pembaca yang berjalan bersamaan
+    """
+    print("\n" + "="*60)
+    print("DEMO: Snapshot Versi (MVCC)")
+    print("="*60)
+    
+    kb = VersionedFactBase([Fact("suhu", ["sensor1", "38"]),
+                            Fact("suhu", ["sensor2", "36"])])
+    view = kb.snapshot()
+    
+    # Writer terus berjalan; snapshot tidak berubah
+    kb.add(Fact("suhu", ["sensor3", "40"]))
+    kb.remove(Fact("suhu", ["sensor1", "38"]))
+    
+    pattern = Fact("suhu", ["?s", "?t"])
+    for name, fact_base in [("Snapshot lama", view), ("Versi terbaru", kb)]:
+        readings = sorted(f"{b['?s']}={b['?t']}" for _, b in fact_base.query(pattern))
+        print(f"  {name}: {readings}")
+
+
+def demo_event_window():
+    """
+    Demo: Fakta event dengan TTL dan aturan dalam jendela waktu
+    """
+    print("\n" + "="*60)
+    print("DEMO: Event dengan TTL dan Sliding Window")
+    print("="*60)
+    
+    now = [0]   # jam simulasi (detik)
+    readings = TimedFactBase(clock=lambda: now[0])
+    rules = [
+        PatternRule("K1",
+                    [Fact("suhu", ["?ruang", "tinggi"]), Fact("asap", ["?ruang"])],
+                    Fact("kebakaran", ["?ruang"]),
+                    within=60),
+    ]
+    tms = TruthMaintenance(rules, readings)
+    readings.subscribe(tms.retract_facts)   # event kedaluwarsa → tarik kesimpulan
+    readings.watch(Fact("kebakaran", ["?ruang"]), lambda fact, bindings: print(
+        f"  ⚠ kesimpulan ditarik: kebakaran di {bindings['?ruang']}"))
+    print(f"\nAturan: {rules[0]}")
+    
+    for second, fact in [(0, Fact("suhu", ["gudang", "tinggi"])),
+                         (90, Fact("asap", ["gudang"])),
+                         (100, Fact("suhu", ["dapur", "tinggi"])),
+                         (120, Fact("asap", ["dapur"]))]:
+        now[0] = second
+        readings.add(fact, ttl=120)
+        derived = tms.assert_fact(fact)
+        print(f"  t={second:>3}s  + {fact}  → {sorted(str(f) for f in derived)}")
+    
+    now[0] = 250
+    expired = readings.expire()
+    print(f"  t=250s  kedaluwarsa: {sorted(str(f) for f in expired)}")
+    print(f"  Fakta tersisa: {len(readings.facts)}")
+
+
+def demo_sqlite_fact_base():
+    """
+    Demo: FactBase di SQLite (API sama, query jadi SQL)
+    """
+    print("\n" + "="*60)
+    print("DEMO: FactBase di SQLite")
+    print("="*60)
+    
+    with SQLiteFactBase(":memory:") as fb:   # atau path file .db
+        fb.add_facts([
+            Fact("eats", ["kucing", "ikan"]),
+            Fact("eats", ["anjing", "daging"]),
+            Fact("eats", ["kelinci", "wortel"]),
+            Fact("lives_in", ["kucing", "rumah"]),
+            Fact("lives_in", ["anjing", "rumah"]),
+            Fact("lives_in", ["kelinci", "kandang"]),
+            Fact("galak", ["anjing"]),
+        ])
+        print(f"\nJumlah fakta: {len(fb)}")
+        
+        print("\nHewan rumah yang tidak galak makan apa?")
+        for bindings in fb.query_all(
+                [Fact("eats", ["?animal", "?food"]),
+                 Fact("lives_in", ["?animal", "rumah"])],
+                negated=[Fact("galak", ["?animal"])]):
+            print(f"  • {bindings['?animal']} makan {bindings['?food']}")
+        
+        print(f"\nHewan per habitat: "
+              f"{fb.group_by(Fact('lives_in', ['?a', '?h']), '?h')}")
+
+
+def demo_range_conditions():
+    """
+    Demo: Kondisi numerik (<, <=, >, between) di dalam pola
+    """
+    print("\n" + "="*60)
+    print("DEMO: Kondisi Numerik pada Tanda Vital")
+    print("="*60)
+    
+    fb = FactBase()
+    for patient, age, temperature in [("ani", 72, 38.4), ("budi", 35, 36.8),
+                                      ("citra", 64, 37.1), ("dedi", 8, 39.2)]:
+        fb.add(Fact("usia", [patient, age]))
+        fb.add(Fact("suhu", [patient, temperature]))
+    
+    print("\nPasien usia > 60:")
+    for fact, bindings in fb.query(Fact("usia", ["?p", gt(60, "?a")])):
+        print(f"  • {bindings['?p']} ({bindings['?a']} tahun)")
+    
+    rules = [
+        PatternRule("demam",
+                    [Fact("suhu", ["?p", gt(37.5)])],
+                    Fact("demam", ["?p"])),
+        PatternRule("risiko-tinggi",
+                    [Fact("demam", ["?p"]), Fact("usia", ["?p", ge(60)])],
+                    Fact("risiko_tinggi", ["?p"])),
+    ]
+    DatalogEngine(rules).run(fb)
+    print("\nAturan:")
+    for rule in rules:
+        print(f"  {rule}")
+    print(f"\nDemam        : {sorted(b['?p'] for _, b in fb.query(Fact('demam', ['?p'])))}")
+    print(f"Risiko tinggi: {sorted(b['?p'] for _, b in fb.query(Fact('risiko_tinggi', ['?p'])))}")
+    print(f"Suhu normal (36.5-37.5): "
+          f"{fb.count(Fact('suhu', ['?p', between(36.5, 37.5)]))} pasien")
+
+
+def demo_load_from_file():
+    """
+    Demo: Memuat fakta dan aturan dari file JSON-lines / CSV
+    """
+    print("\n" + "="*60)
+    print("DEMO: Memuat Fakta dan Aturan dari File")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        facts_path = f"{directory}/pasien.csv"
+        with open(facts_path, "w", encoding="utf-8") as stream:
+            stream.write("usia,ani,72\nusia,budi,35\nsuhu,ani,38.4\nsuhu,budi,39.0\n")
+        rules_path = f"{directory}/aturan.jsonl"
+        with open(rules_path, "w", encoding="utf-8") as stream:
+            for rule in [
+                {"name": "demam", "antecedents": [["suhu", "?p", {"gt": 37.5}]],
+                 "conclusion": ["demam", "?p"]},
+                {"name": "risiko-tinggi",
+                 "antecedents": [["demam", "?p"], ["usia", "?p", {"ge": 60}]],
+                 "conclusion": ["risiko_tinggi", "?p"]},
+            ]:
+                stream.write(json.dumps(rule) + "\n")
+        
+        fb = FactBase()
+        print(f"\nFakta dimuat dari CSV   : {fb.load_facts(facts_path)}")
+        rules = load_rules(rules_path)
+        print(f"Aturan dimuat dari JSONL: {len(rules)}")
+        for rule in rules:
+            print(f"  {rule}")
+    
+    DatalogEngine(rules).run(fb)
+    print(f"\nRisiko tinggi: {sorted(b['?p'] for _, b in fb.query(Fact('risiko_tinggi', ['?p'])))}")
+
+
+def demo_mapped_snapshot():
+    """
+    Demo: Snapshot biner yang dibuka dengan mmap
+    """
+    print("\n" + "="*60)
+    print("DEMO: Snapshot Biner (mmap)")
+    print("="*60)
+    
+    fb = FactBase()
+    fb.add_facts([
+        Fact("eats", ["kucing", "ikan"]),
+        Fact("eats", ["anjing", "daging"]),
+        Fact("eats", ["beruang", "ikan"]),
+        Fact("lives_in", ["kucing", "rumah"]),
+    ])
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/fakta.snap"
+        fb.save_snapshot(path)
+        
+        # Worker cukup membuka file: tanpa parsing, tanpa membangun index
+        with MappedFactBase(path) as kb:
+            print(f"\nJumlah fakta: {len(kb.facts)}")
+            print("Siapa makan ikan?")
+            for fact, bindings in kb.query(Fact("eats", ["?x", "ikan"])):
+                print(f"  • {bindings['?x']}")
+            print("Makan ikan dan tinggal di rumah:")
+            for bindings in kb.query_all([Fact("eats", ["?x", "ikan"]),
+                                          Fact("lives_in", ["?x", "rumah"])]):
+                print(f"  • {bindings['?x']}")
+
+
 def main():
     """Fungsi utama"""
     
@@ -290,6 +3333,36 @@ def main():
     # Demo 2: Matching kompleks
     demo_complex_matching()
     
+    # Demo 3: Aturan rekursif
+    demo_datalog_ancestor()
+    
+    # Demo 4: Backward chaining
+    demo_backward_chaining()
+    
+    # Demo 5: Truth maintenance
+    demo_truth_maintenance()
+    
+    # Demo 6: Negasi
+    demo_negation()
+    
+    # Demo 7: Snapshot untuk banyak thread
+    demo_snapshot()
+    
+    # Demo 8: Event dengan TTL
+    demo_event_window()
+    
+    # Demo 9: FactBase di SQLite
+    demo_sqlite_fact_base()
+    
+    # Demo 10: Kondisi numerik
+    demo_range_conditions()
+    
+    # Demo 11: Memuat dari file
+    demo_load_from_file()
+    
+    # Demo 12: Snapshot biner
+    demo_mapped_snapshot()
+    
     # Latihan (uncomment setelah mengerjakan)
     # exercise_family_tree()
     
@@ -299,6 +3372,9 @@ def main():
     print("✓ Pattern matching = mencocokkan pola dengan fakta")
     print("✓ Variabel (?x) = placeholder untuk nilai apapun")
     print("✓ Binding = pemetaan variabel ke nilai")
+    print("✓ Semi-naive: iterasi hanya memakai fakta baru (delta)")
+    print("✓ Negasi (NOT) dievaluasi per strata dengan anti-join")
+    print("✓ Range (gt, between, ...) memakai index terurut (bisect)")
     print("✓ Ini dasar untuk query dalam sistem pakar!")
     print("="*60)
 
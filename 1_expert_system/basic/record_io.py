@@ -0,0 +1,52 @@
+"""
+Pembaca file JSON-lines/CSV bersama untuk loader di basic/
+
+Dipakai KnowledgeBase.load_facts/load_rules (01_knowledge_base.py) dan
+read_facts/load_rules (03_fact_matching.py), sehingga kedua loader
+membaca file dengan cara yang sama dan melaporkan baris JSON yang
+rusak sebagai `path:baris`.
+"""
+
+import csv
+import json
+from itertools import islice
+
+
+def read_records(path, chunk_size=50000):
+    """
+    Baca file JSON-lines atau CSV (dipilih dari ekstensi .csv) per chunk
+    
+    File dibaca bertahap, tidak dimuat utuh ke memori. Satu chunk
+    JSON-lines di-parse dengan satu panggilan json.loads; jika gagal,
+    baris yang rusak dicari dan dilaporkan sebagai ValueError
+    "path:baris: pesan".
+    
+    Yields:
+        List record per chunk: objek JSON, atau list sel (string) untuk CSV
+    """
+    with open(path, newline="", encoding="utf-8") as stream:
+        if str(path).lower().endswith(".csv"):
+            reader = csv.reader(stream)
+            while True:
+                chunk = [row for row in islice(reader, chunk_size) if row]
+                if not chunk:
+                    return
+                yield chunk
+        start = 1
+        while True:
+            lines = list(islice(stream, chunk_size))
+            if not lines:
+                return
+            text = [line for line in lines if line.strip()]
+            try:
+                yield json.loads("[" + ",".join(text) + "]")
+            except json.JSONDecodeError:
+                for number, line in enumerate(lines, start):
+                    if not line.strip():
+                        continue
+                    try:
+                        json.loads(line)
+                    except json.JSONDecodeError as error:
+                        raise ValueError(f"{path}:{number}: {error}") from None
+                raise
+            start += len(lines)
@@ -0,0 +1,431 @@
+"""
+BENCHMARK: Expert System Engine
+
+Konsep:
+--------
+Demo di basic/ hanya memakai 3-6 fakta. Benchmark ini membuat basis
+fakta dan basis aturan sintetis dalam ukuran besar untuk:
+- Mendeteksi regresi performa setelah perubahan kode
+- Memperkirakan kebutuhan hardware
+
+Yang diukur:
+- FactBase.add      : membangun fact base (beserta index)
+- FactBase.add_facts: bulk add; load_facts dari file JSON-lines
+- FactBase.query    : query satu pola
+- Fact.matches      : pencocokan satu fakta dengan pola
+- Rule.evaluate     : evaluasi semua aturan terhadap satu set fakta
+- Chaining          : ForwardChainer, ReteNetwork, BitsetRuleSet
+- DatalogEngine     : aturan rekursif (ancestor) dengan semi-naive
+
+Hasil: throughput (operasi/detik), latency percentile (p50/p90/p99),
+dan peak memory, ditulis sebagai JSON.
+
+Cara menjalankan:
+    python 1_expert_system/benchmarks/01_engine_benchmark.py
+    python 1_expert_system/benchmarks/01_engine_benchmark.py \\
+        --facts 1000 100000 10000000 --rules 100000 --output hasil.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource   # hanya tersedia di Unix
+except ImportError:
+    resource = None
+
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """
+    Import file pelajaran dari basic/
+    
+    Nama file diawali angka (02_simple_rules.py) sehingga tidak bisa
+    di-import dengan `import` biasa.
+    """
+    name = "lesson_" + os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+simple_rules = load_lesson("02_simple_rules.py")
+fact_matching = load_lesson("03_fact_matching.py")
+
+Rule = simple_rules.Rule
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+
+
+# ============================================
+# GENERATOR DATA SINTETIS
+# ============================================
+
+def generate_facts(count, predicates=10, arity=2, symbols=None, seed=0):
+    """
+    Fakta acak: pred<i>(e<j>, e<k>, ...)
+    
+    Args:
+        count: Jumlah fakta
+        predicates: Jumlah predikat berbeda
+        arity: Jumlah argumen per fakta
+        symbols: Jumlah simbol berbeda (default: sebanding dengan count)
+    """
+    rnd = random.Random(seed)
+    symbols = symbols or max(10, count // 10)
+    names = [f"pred{i}" for i in range(predicates)]
+    return [
+        Fact(rnd.choice(names),
+             [f"e{rnd.randrange(symbols)}" for _ in range(arity)])
+        for _ in range(count)
+    ]
+
+
+def generate_rule_chain(depth, fan_out, seed=0):
+    """
+    Basis aturan berlapis untuk chaining
+    
+    Lapisan 0 berisi `fan_out` fakta awal. Setiap aturan di lapisan d
+    membutuhkan 1-2 simbol dari lapisan d-1, sehingga inferensi harus
+    berjalan sedalam `depth` lapisan.
+    
+    Returns:
+        (rules, initial_facts)
+    """
+    rnd = random.Random(seed)
+    layers = [[f"L0_{i}" for i in range(fan_out)]]
+    rules = []
+    for d in range(1, depth + 1):
+        layer = []
+        for i in range(fan_out):
+            conclusion = f"L{d}_{i}"
+            conditions = rnd.sample(layers[-1], min(2, len(layers[-1])))
+            rules.append(Rule(f"R{d}_{i}", conditions, conclusion, "AND"))
+            layer.append(conclusion)
+        layers.append(layer)
+    rnd.shuffle(rules)   # urutan acak: engine tidak boleh bergantung urutan
+    return rules, set(layers[0])
+
+
+def generate_rule_base(count, symbols, conditions=3, seed=0):
+    """Aturan AND acak dengan `conditions` kondisi dari `symbols` simbol"""
+    rnd = random.Random(seed)
+    names = [f"s{i}" for i in range(symbols)]
+    return [
+        Rule(f"R{i}", rnd.sample(names, conditions), rnd.choice(names), "AND")
+        for i in range(count)
+    ], names
+
+
+def generate_family_tree(people, children=3):
+    """Fakta parent(p, c) untuk pohon keluarga dengan `people` orang"""
+    return [Fact("parent", [f"p{(i - 1) // children}", f"p{i}"])
+            for i in range(1, people)]
+
+
+# ============================================
+# PENGUKURAN
+# ============================================
+
+def percentile(sorted_values, fraction):
+    """Percentile (nearest-rank) dari list yang sudah diurutkan"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1,
+                max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def throughput(operations, total_seconds):
+    """
+    Ringkasan throughput saja, untuk operasi bulk yang diukur sekali
+    (tanpa latency percentile: hanya ada satu sampel)
+    """
+    return {
+        'operations': operations,
+        'total_s': round(total_seconds, 6),
+        'throughput_per_s': round(operations / total_seconds, 1)
+        if total_seconds > 0 else None,
+    }
+
+
+def summarize(latencies, operations, total_seconds):
+    """Ringkasan throughput dan latency (mikrodetik)"""
+    latencies = sorted(latencies)
+    return {
+        **throughput(operations, total_seconds),
+        'latency_us': {
+            'p50': round(percentile(latencies, 0.50) * 1e6, 3),
+            'p90': round(percentile(latencies, 0.90) * 1e6, 3),
+            'p99': round(percentile(latencies, 0.99) * 1e6, 3),
+            'max': round(latencies[-1] * 1e6, 3) if latencies else 0.0,
+        },
+    }
+
+
+def measure(operation, inputs, batch=1):
+    """
+    Jalankan operation(item) untuk setiap input
+    
+    Args:
+        batch: Jumlah operasi per sampel latency (untuk operasi yang
+               terlalu cepat diukur satu per satu)
+    """
+    clock = time.perf_counter
+    latencies = []
+    start = clock()
+    for i in range(0, len(inputs), batch):
+        chunk = inputs[i:i + batch]
+        t0 = clock()
+        for item in chunk:
+            operation(item)
+        latencies.append((clock() - t0) / len(chunk))
+    return summarize(latencies, len(inputs), clock() - start)
+
+
+def timed(build, trace_memory=False):
+    """
+    Jalankan build() sekali
+    
+    Returns:
+        (hasil build, detik, peak byte tracemalloc atau None)
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def peak_rss_kb():
+    """Peak resident memory proses (KB), None jika tidak tersedia"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux melaporkan kilobyte
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def bench_fact_base(count, args):
+    """FactBase.add, FactBase.query dan Fact.matches untuk `count` fakta"""
+    facts = generate_facts(count, args.predicates, seed=args.seed)
+    
+    # Latency per sampel 100 add (satu add terlalu cepat untuk diukur)
+    fact_base = FactBase()
+    add, _, traced = timed(lambda: measure(fact_base.add, facts, batch=100),
+                           args.trace_memory)
+    result = {
+        'benchmark': 'fact_base',
+        'facts': count,
+        'unique_facts': len(fact_base.facts),
+        'add': add,
+        'traced_peak_bytes': traced,
+    }
+    
+    _, seconds, _ = timed(lambda: FactBase().add_facts(facts))
+    result['add_facts'] = throughput(count, seconds)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "facts.jsonl")
+        with open(path, "w", encoding="utf-8") as stream:
+            for fact in facts:
+                stream.write(json.dumps([fact.predicate, *fact.arguments]) + "\n")
+        _, seconds, _ = timed(lambda: FactBase().load_facts(path))
+        result['load_facts_jsonl'] = throughput(count, seconds)
+    
+    rnd = random.Random(args.seed + 1)
+    samples = rnd.sample(facts, min(args.queries, count))
+    # Argumen terakhir konstanta, sisanya variabel: has(?x, ekor)
+    patterns = [
+        Fact(fact.predicate,
+             [f"?x{i}" for i in range(len(fact.arguments) - 1)] +
+             list(fact.arguments[-1:]))
+        for fact in samples
+    ]
+    result['query'] = measure(fact_base.query, patterns)
+    result['exists'] = measure(fact_base.exists, patterns)
+    
+    pairs = list(zip(samples, patterns))
+    result['matches'] = measure(lambda pair: pair[0].matches(pair[1]),
+                                pairs, batch=100)
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+
+def bench_rule_evaluate(count, args):
+    """Rule.evaluate vs BitsetRuleSet untuk `count` aturan"""
+    rules, names = generate_rule_base(count, args.symbols, seed=args.seed)
+    rnd = random.Random(args.seed + 2)
+    fact_sets = [set(rnd.sample(names, len(names) // 2))
+                 for _ in range(args.repeat)]
+    
+    def evaluate_all(facts):
+        for rule in rules:
+            rule.evaluate(facts)
+    
+    compiled, compile_seconds, _ = timed(
+        lambda: simple_rules.BitsetRuleSet(rules))
+    return {
+        'benchmark': 'rule_evaluate',
+        'rules': count,
+        'rule_evaluate_pass': measure(evaluate_all, fact_sets),
+        'bitset_compile_s': round(compile_seconds, 6),
+        'bitset_evaluate_pass': measure(compiled.evaluate, fact_sets),
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def bench_chaining(args):
+    """Forward chaining pada basis aturan berlapis"""
+    rules, initial = generate_rule_chain(args.depth, args.fan_out, args.seed)
+    
+    def forward_chainer():
+        facts = set(initial)
+        simple_rules.ForwardChainer(rules).run(facts)
+        return facts
+    
+    def rete():
+        network = simple_rules.ReteNetwork(rules)
+        network.add_facts(initial)
+        return network.facts
+    
+    # Setiap engine mengembalikan himpunan fakta akhir, sehingga jumlah
+    # fakta turunan bisa dibandingkan antar engine
+    engines = {
+        'forward_chainer': forward_chainer,
+        'rete': rete,
+        'bitset_closure': lambda: simple_rules.BitsetRuleSet(rules).closure(initial),
+    }
+    result = {
+        'benchmark': 'chaining',
+        'depth': args.depth,
+        'fan_out': args.fan_out,
+        'rules': len(rules),
+    }
+    for name, run in engines.items():
+        output, seconds, traced = timed(run, args.trace_memory)
+        result[name] = {
+            'total_s': round(seconds, 6),
+            'rules_per_s': round(len(rules) / seconds, 1) if seconds else None,
+            'derived_facts': len(output) - len(set(initial)),
+            'traced_peak_bytes': traced,
+        }
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+
+def bench_datalog(args):
+    """Semi-naive evaluation: ancestor pada pohon keluarga"""
+    PatternRule = fact_matching.PatternRule
+    rules = [
+        PatternRule("A1", [Fact("parent", ["?x", "?y"])],
+                    Fact("ancestor", ["?x", "?y"])),
+        PatternRule("A2", [Fact("parent", ["?x", "?y"]),
+                           Fact("ancestor", ["?y", "?z"])],
+                    Fact("ancestor", ["?x", "?z"])),
+    ]
+    fact_base = FactBase()
+    for fact in generate_family_tree(args.people):
+        fact_base.add(fact)
+    engine = fact_matching.DatalogEngine(rules)
+    derived, seconds, traced = timed(lambda: engine.run(fact_base),
+                                     args.trace_memory)
+    return {
+        'benchmark': 'datalog_ancestor',
+        'people': args.people,
+        'derived': len(derived),
+        'total_s': round(seconds, 6),
+        'derived_per_s': round(len(derived) / seconds, 1) if seconds else None,
+        'traced_peak_bytes': traced,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark sintetis untuk engine sistem pakar")
+    parser.add_argument("--facts", type=int, nargs="+",
+                        default=[1000, 10000, 100000],
+                        help="ukuran fact base (boleh beberapa)")
+    parser.add_argument("--rules", type=int, nargs="+", default=[1000, 10000],
+                        help="ukuran basis aturan untuk Rule.evaluate")
+    parser.add_argument("--predicates", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=500,
+                        help="jumlah simbol kondisi untuk aturan acak")
+    parser.add_argument("--queries", type=int, default=1000,
+                        help="jumlah query/match yang diukur per ukuran")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="jumlah set fakta untuk Rule.evaluate")
+    parser.add_argument("--depth", type=int, default=50,
+                        help="kedalaman rantai aturan")
+    parser.add_argument("--fan-out", type=int, default=200,
+                        help="aturan per lapisan rantai")
+    parser.add_argument("--people", type=int, default=5000,
+                        help="ukuran pohon keluarga untuk DatalogEngine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="ukur peak alokasi dengan tracemalloc (lebih lambat)")
+    parser.add_argument("--output", help="file JSON (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fungsi utama"""
+    args = parse_args(argv)
+    results = []
+    for count in args.facts:
+        print(f"fact base: {count} fakta...", file=sys.stderr)
+        results.append(bench_fact_base(count, args))
+    for count in args.rules:
+        print(f"Rule.evaluate: {count} aturan...", file=sys.stderr)
+        results.append(bench_rule_evaluate(count, args))
+    print("chaining...", file=sys.stderr)
+    results.append(bench_chaining(args))
+    print("datalog...", file=sys.stderr)
+    results.append(bench_datalog(args))
+    
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'parameters': vars(args),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+        print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
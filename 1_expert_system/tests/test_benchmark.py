@@ -0,0 +1,40 @@
+"""
+Smoke test benchmarks/01_engine_benchmark.py dengan ukuran sangat kecil
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "benchmarks", "01_engine_benchmark.py")
+
+
+class BenchmarkSmokeTest(unittest.TestCase):
+    
+    def test_small_run_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "hasil.json")
+            # Proses terpisah: benchmark memuat ulang modul pelajaran
+            subprocess.run(
+                [sys.executable, BENCHMARK, "--facts", "50", "200", "--rules", "20",
+                 "--queries", "5", "--repeat", "1", "--depth", "3", "--fan-out", "3",
+                 "--people", "20", "--output", output],
+                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=120)
+            with open(output, encoding="utf-8") as stream:
+                report = json.load(stream)
+        self.assertEqual(report["meta"]["parameters"]["facts"], [50, 200])
+        self.assertEqual([result["benchmark"] for result in report["results"]],
+                         ["fact_base", "fact_base", "rule_evaluate", "chaining",
+                          "datalog_ancestor"])
+
+
+if __name__ == "__main__":
+    unittest.main()
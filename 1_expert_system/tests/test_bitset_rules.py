@@ -0,0 +1,90 @@
+"""
+Test BitsetRuleSet: hasil harus sama dengan Rule.evaluate dan ForwardChainer
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+simple_rules = load_lesson("02_simple_rules.py")
+Rule = simple_rules.Rule
+
+
+def random_rules(rng, count, symbols, negations=False):
+    """
+    Aturan acak; dengan negasi, kondisi dan negasi hanya memakai simbol
+    sebelum kesimpulan (tanpa siklus, jadi selalu bisa distratifikasi)
+    """
+    rules = []
+    for number in range(count):
+        conclusion = rng.randrange(1, len(symbols))
+        pool = symbols[:conclusion] if negations else symbols
+        conditions = rng.sample(pool, rng.randint(0, min(3, len(pool))))
+        operator = "OR" if conditions and rng.random() < 0.2 else "AND"
+        negated = []
+        if negations and rng.random() < 0.3:
+            negated = [rng.choice([s for s in pool if s not in conditions] or pool)]
+        rules.append(Rule(f"R{number}", conditions, symbols[conclusion], operator,
+                          negations=negated))
+    return rules
+
+
+class BitsetRuleSetTest(unittest.TestCase):
+    
+    def test_satisfied_matches_rule_evaluate(self):
+        rng = random.Random(1)
+        symbols = [f"f{i}" for i in range(60)]
+        rules = random_rules(rng, 300, symbols)
+        compiled = simple_rules.BitsetRuleSet(rules)
+        for size in (0, 1, 3, 10, 30, 55, 60):
+            for _ in range(5):
+                facts = set(rng.sample(symbols, size))
+                expected = [rule for rule in rules if rule.evaluate(facts)]
+                with self.subTest(size=size):
+                    self.assertEqual(compiled.evaluate(facts), expected)
+    
+    def test_closure_matches_forward_chainer(self):
+        rng = random.Random(2)
+        symbols = [f"f{i}" for i in range(40)]
+        for negations in (False, True):
+            rules = random_rules(rng, 80, symbols, negations)
+            compiled = simple_rules.BitsetRuleSet(rules)
+            for _ in range(10):
+                facts = set(rng.sample(symbols, rng.randint(0, 8)))
+                expected = set(facts)
+                simple_rules.ForwardChainer(rules).run(expected)
+                with self.subTest(negations=negations, facts=sorted(facts)):
+                    self.assertEqual(compiled.closure(facts), expected)
+    
+    def test_unknown_facts_ignored(self):
+        compiled = simple_rules.BitsetRuleSet([Rule("R1", ["a", "b"], "c")])
+        self.assertEqual(compiled.closure({"a", "b", "x"}), {"a", "b", "c", "x"})
+        self.assertEqual(compiled.evaluate({"a", "x"}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+"""
+Test DatalogEngine (semi-naive, negasi terstratifikasi) dan TruthMaintenance
+dibandingkan dengan evaluasi naive
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+PatternRule = fact_matching.PatternRule
+
+PREDICATES = ["p", "q", "r", "s"]
+VARIABLES = ["?x", "?y", "?z"]
+
+
+def match(fact, pattern, bindings):
+    """Matching tanpa index (acuan)"""
+    if (fact.predicate != pattern.predicate or
+            len(fact.arguments) != len(pattern.arguments)):
+        return None
+    result = dict(bindings)
+    for arg, value in zip(pattern.arguments, fact.arguments):
+        if isinstance(arg, str) and arg.startswith("?"):
+            if result.setdefault(arg, value) != value:
+                return None
+        elif arg != value:
+            return None
+    return result
+
+
+def naive_closure(rules, facts):
+    """
+    Evaluasi naive per strata: semua aturan dievaluasi ulang terhadap
+    semua fakta sampai tidak ada fakta baru (acuan)
+    """
+    facts = set(facts)
+    levels = fact_matching.stratify(rules)
+    for level in sorted(set(levels)):
+        stratum = [rule for rule, own in zip(rules, levels) if own == level]
+        changed = True
+        while changed:
+            changed = False
+            for rule in stratum:
+                rows = [{}]
+                for pattern in rule.antecedents:
+                    rows = [bindings for row in rows for fact in facts
+                            for bindings in [match(fact, pattern, row)]
+                            if bindings is not None]
+                for row in rows:
+                    if any(match(fact, fact_matching.substitute(pattern, row), {})
+                           is not None
+                           for pattern in rule.negated for fact in facts):
+                        continue
+                    conclusion = fact_matching.substitute(rule.conclusion, row)
+                    if conclusion not in facts:
+                        facts.add(conclusion)
+                        changed = True
+    return facts
+
+
+def random_program(rng, negation=False):
+    """Aturan acak dua argumen; None jika tidak valid atau tidak stratified"""
+    def pattern():
+        return Fact(rng.choice(PREDICATES),
+                    [rng.choice(VARIABLES + ["a", "b"]) for _ in range(2)])
+    try:
+        rules = []
+        for number in range(rng.randint(1, 4)):
+            body = [pattern() for _ in range(rng.randint(1, 3))]
+            negated = [pattern()] if negation and rng.random() < 0.3 else []
+            rules.append(PatternRule(f"r{number}", body, pattern(), negated))
+        fact_matching.stratify(rules)
+    except ValueError:
+        return None
+    return rules
+
+
+def random_facts(rng, count):
+    return [Fact(rng.choice(PREDICATES), [rng.choice("abcd"), rng.choice("abcd")])
+            for _ in range(count)]
+
+
+def fact_base(facts):
+    base = FactBase()
+    base.add_facts(facts)
+    return base
+
+
+class DatalogEngineTest(unittest.TestCase):
+    
+    def test_random_programs_match_naive(self):
+        rng = random.Random(1)
+        checked = 0
+        while checked < 150:
+            rules = random_program(rng)
+            if rules is None:
+                continue
+            facts = random_facts(rng, rng.randint(0, 10))
+            base = fact_base(facts)
+            derived = fact_matching.DatalogEngine(rules).run(base)
+            expected = naive_closure(rules, facts)
+            self.assertEqual(base.facts, expected)
+            self.assertEqual(derived, expected - set(facts))
+            checked += 1
+    
+    def test_incremental_run_matches_full_run(self):
+        rng = random.Random(2)
+        checked = 0
+        while checked < 100:
+            rules = random_program(rng)
+            if rules is None:
+                continue
+            engine = fact_matching.DatalogEngine(rules)
+            first, later = random_facts(rng, 6), random_facts(rng, 4)
+            base = fact_base(first)
+            engine.run(base)
+            added = [fact for fact in later if fact not in base.facts]
+            base.add_facts(added)
+            engine.run(base, added)
+            self.assertEqual(base.facts, naive_closure(rules, first + later))
+            checked += 1
+    
+    def test_transitive_closure(self):
+        rules = [
+            PatternRule("a1", [Fact("parent", ["?x", "?y"])], Fact("ancestor", ["?x", "?y"])),
+            PatternRule("a2", [Fact("ancestor", ["?x", "?y"]), Fact("parent", ["?y", "?z"])],
+                        Fact("ancestor", ["?x", "?z"])),
+        ]
+        n = 60
+        base = fact_base(Fact("parent", [i, i + 1]) for i in range(n))
+        derived = fact_matching.DatalogEngine(rules).run(base)
+        self.assertEqual(len(derived), n * (n + 1) // 2)
+        self.assertIn(Fact("ancestor", [0, n]), base.facts)
+        self.assertNotIn(Fact("ancestor", [n, 0]), base.facts)
+
+
+
+class NegationTest(unittest.TestCase):
+    
+    def test_random_stratified_programs_match_naive(self):
+        rng = random.Random(4)
+        checked = 0
+        while checked < 150:
+            rules = random_program(rng, negation=True)
+            if rules is None or not any(rule.negated for rule in rules):
+                continue
+            facts = random_facts(rng, rng.randint(0, 10))
+            base = fact_base(facts)
+            fact_matching.DatalogEngine(rules).run(base)
+            self.assertEqual(base.facts, naive_closure(rules, facts))
+            checked += 1
+    
+    def test_negation_sees_complete_lower_stratum(self):
+        rules = [
+            PatternRule("terbang", [Fact("burung", ["?x"])], Fact("bisa_terbang", ["?x"]),
+                        negated=[Fact("penguin", ["?x"])]),
+            PatternRule("penguin", [Fact("kutub", ["?x"])], Fact("penguin", ["?x"])),
+            PatternRule("sepi", [Fact("burung", ["?x"])], Fact("sendiri", ["?x"]),
+                        negated=[Fact("teman", ["?x", "?y"])]),   # ?y: fakta apa pun
+        ]
+        base = fact_base([Fact("burung", ["tweety"]), Fact("burung", ["pingu"]),
+                          Fact("kutub", ["pingu"]), Fact("teman", ["tweety", "pingu"])])
+        fact_matching.DatalogEngine(rules).run(base)
+        self.assertEqual(base.distinct(Fact("bisa_terbang", ["?x"]), "?x"), {"tweety"})
+        self.assertEqual(base.distinct(Fact("sendiri", ["?x"]), "?x"), {"pingu"})
+    
+    def test_unstratifiable_rules_rejected(self):
+        rules = [PatternRule("a", [Fact("p", ["?x"])], Fact("q", ["?x"]),
+                             negated=[Fact("r", ["?x"])]),
+                 PatternRule("b", [Fact("q", ["?x"])], Fact("r", ["?x"]))]
+        with self.assertRaises(ValueError):
+            fact_matching.DatalogEngine(rules)
+
+
+class TruthMaintenanceTest(unittest.TestCase):
+    
+    def test_random_assert_and_retract_match_recomputation(self):
+        rng = random.Random(3)
+        checked = 0
+        while checked < 60:
+            rules = random_program(rng)
+            if rules is None:
+                continue
+            tms = fact_matching.TruthMaintenance(rules)
+            for _ in range(12):
+                if tms.base and rng.random() < 0.4:
+                    fact = rng.choice(sorted(tms.base, key=str))
+                    before = set(tms.fact_base.facts)
+                    removed = tms.retract_fact(fact)
+                    self.assertEqual(removed, before - tms.fact_base.facts)
+                else:
+                    tms.assert_fact(random_facts(rng, 1)[0])
+                self.assertEqual(tms.fact_base.facts, naive_closure(rules, tms.base))
+            checked += 1
+    
+    def test_alternative_derivation_survives_retract(self):
+        rules = [
+            PatternRule("a1", [Fact("parent", ["?x", "?y"])], Fact("ancestor", ["?x", "?y"])),
+            PatternRule("a2", [Fact("parent", ["?x", "?y"]), Fact("ancestor", ["?y", "?z"])],
+                        Fact("ancestor", ["?x", "?z"])),
+        ]
+        tms = fact_matching.TruthMaintenance(rules)
+        for pair in [("a", "b"), ("b", "c"), ("a", "x"), ("x", "c")]:
+            tms.assert_fact(Fact("parent", list(pair)))
+        removed = tms.retract_fact(Fact("parent", ["b", "c"]))
+        self.assertEqual(removed, {Fact("parent", ["b", "c"]), Fact("ancestor", ["b", "c"])})
+        self.assertIn(Fact("ancestor", ["a", "c"]), tms.fact_base.facts)
+        self.assertEqual(tms.retract_fact(Fact("parent", ["b", "c"])), set())
+    
+    def test_negation_rejected(self):
+        rules = [PatternRule("n", [Fact("p", ["?x"])], Fact("q", ["?x"]),
+                             negated=[Fact("r", ["?x"])])]
+        with self.assertRaises(ValueError):
+            fact_matching.TruthMaintenance(rules)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+"""
+Test Fact dan FactBase: index posisi, pola terkompilasi, query_all,
+query streaming, estimate() dan agregasi
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import pickle
+import random
+import sys
+import unittest
+from collections import Counter
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+gt = fact_matching.gt
+
+
+class FactTest(unittest.TestCase):
+    
+    def test_immutable_and_slotted(self):
+        fact = Fact("is", ["kucing", "mamalia"])
+        with self.assertRaises(AttributeError):
+            fact.predicate = "has"
+        with self.assertRaises(AttributeError):
+            fact.extra = 1
+        self.assertFalse(hasattr(fact, "__dict__"))
+        self.assertEqual(fact.arguments, ("kucing", "mamalia"))
+    
+    def test_equality_and_hash(self):
+        fact = Fact("is", ["kucing", "mamalia"])
+        same = Fact("is", ("kucing", "mamalia"))
+        self.assertEqual(fact, same)
+        self.assertEqual(hash(fact), hash(same))
+        self.assertEqual(len({fact, same}), 1)
+        self.assertNotEqual(fact, Fact("is", ["mamalia", "kucing"]))
+        self.assertNotEqual(Fact("p", [1]), Fact("p", ["1"]))
+        self.assertEqual(Fact("hujan", "deras").arguments, ("deras",))
+    
+    def test_symbols_interned(self):
+        name = "".join(["kuc", "ing"])   # string baru, bukan literal
+        fact = Fact("is", [name, "mamalia"])
+        other = Fact("".join(["i", "s"]), ["kucing", "mamalia"])
+        self.assertIs(fact.arguments[0], other.arguments[0])
+        self.assertIs(fact.predicate, other.predicate)
+    
+    def test_pickle_round_trip(self):
+        fact = Fact("usia", ["ani", 72])
+        copy = pickle.loads(pickle.dumps(fact))
+        self.assertEqual(copy, fact)
+        self.assertEqual(hash(copy), hash(fact))
+
+
+def random_facts(rng, count):
+    """Fakta acak dengan predicate, arity dan nilai yang sering berulang"""
+    symbols = ["a", "b", "c", "d", 1, 2, 3]
+    return [Fact(rng.choice(["p", "q", "r"]),
+                 [rng.choice(symbols) for _ in range(rng.randint(1, 3))])
+            for _ in range(count)]
+
+
+def brute_force_match(fact, pattern, bindings=None):
+    """Matching tanpa index dan tanpa kompilasi (acuan)"""
+    if (fact.predicate != pattern.predicate or
+            len(fact.arguments) != len(pattern.arguments)):
+        return None
+    result = dict(bindings or {})
+    for arg, value in zip(pattern.arguments, fact.arguments):
+        if isinstance(arg, str) and arg.startswith("?"):
+            if result.setdefault(arg, value) != value:
+                return None
+        elif arg != value:
+            return None
+    return result
+
+
+def random_pattern(rng):
+    arguments = [rng.choice(["?x", "?y", "a", "b", 1, 2])
+                 for _ in range(rng.randint(1, 3))]
+    return Fact(rng.choice(["p", "q", "r"]), arguments)
+
+
+class PositionIndexTest(unittest.TestCase):
+    
+    def test_query_matches_full_scan(self):
+        rng = random.Random(1)
+        facts = FactBase()
+        facts.add_facts(random_facts(rng, 300))
+        for _ in range(100):
+            pattern = random_pattern(rng)
+            expected = {fact for fact in facts.facts
+                        if brute_force_match(fact, pattern) is not None}
+            with self.subTest(pattern=str(pattern)):
+                found = facts.query(pattern)
+                self.assertEqual({fact for fact, _ in found}, expected)
+                for fact, bindings in found:
+                    self.assertEqual(bindings, brute_force_match(fact, pattern))
+    
+    def test_candidates_use_smallest_bucket(self):
+        facts = FactBase()
+        facts.add_facts([Fact("is", [f"hewan{i}", "mamalia"]) for i in range(50)])
+        facts.add(Fact("is", ["kucing", "mamalia"]))
+        facts.add(Fact("is", ["kucing", "lucu", "kecil"]))
+        candidates = facts.candidates(Fact("is", ["kucing", "?k"]))
+        self.assertEqual(set(candidates), {Fact("is", ["kucing", "mamalia"]),
+                                           Fact("is", ["kucing", "lucu", "kecil"])})
+        self.assertEqual(facts.query(Fact("is", ["kucing", "?k"])),
+                         [(Fact("is", ["kucing", "mamalia"]), {"?k": "mamalia"})])
+        self.assertEqual(facts.candidates(Fact("is", ["anjing", "?k"])), ())
+    
+    def test_remove_cleans_indexes(self):
+        rng = random.Random(2)
+        facts = FactBase()
+        added = random_facts(rng, 200)
+        facts.add_facts(added)
+        for fact in added:
+            facts.remove(fact)
+        self.assertFalse(facts.remove(added[0]))
+        self.assertEqual(len(facts.facts), 0)
+        self.assertEqual(dict(facts._by_predicate), {})
+        self.assertEqual(dict(facts._by_arity), {})
+        self.assertEqual(dict(facts._by_position), {})
+        self.assertEqual(set(facts._distinct.values()), {0})
+
+
+class StreamingQueryTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.facts = FactBase()
+        self.facts.add_facts([Fact("usia", [f"p{i}", i]) for i in range(100)])
+    
+    def test_iter_query_is_lazy(self):
+        results = self.facts.iter_query(Fact("usia", ["?p", "?u"]))
+        self.assertEqual(len([next(results) for _ in range(3)]), 3)
+        self.assertEqual(len(self.facts.query(Fact("usia", ["?p", "?u"]), limit=5)), 5)
+    
+    def test_first_and_exists(self):
+        fact, bindings = self.facts.first(Fact("usia", ["?p", 42]))
+        self.assertEqual(bindings, {"?p": "p42"})
+        self.assertIsNone(self.facts.first(Fact("usia", ["?p", 1000])))
+        self.assertTrue(self.facts.exists(Fact("usia", ["p7", 7])))
+        self.assertFalse(self.facts.exists(Fact("usia", ["p7", 8])))
+    
+    def test_estimate_does_not_build_sorted_index(self):
+        estimate = self.facts.estimate(Fact("usia", ["?p", gt(90)]))
+        self.assertLess(estimate, 100)
+        self.assertEqual(self.facts._sorted, {})
+        self.assertEqual(self.facts.count(Fact("usia", ["?p", gt(90)])), 9)
+        self.assertIn(("usia", 1), self.facts._sorted)
+        self.assertEqual(self.facts.estimate(Fact("usia", ["?p", gt(90)])), 9)
+    
+    def test_nan_kept_out_of_ranges(self):
+        nan = float("nan")
+        self.facts.add(Fact("usia", ["x", nan]))
+        self.assertEqual(self.facts.count(Fact("usia", ["?p", gt(-1)])), 100)
+        self.facts.add(Fact("usia", ["y", nan]))
+        self.facts.add(Fact("usia", ["z", 50.5]))
+        keys = self.facts._sorted[("usia", 1)].keys
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(self.facts.count(Fact("usia", ["?p", gt(50)])), 50)
+        self.assertFalse(fact_matching.between(0, 1).contains(nan))
+
+
+
+def brute_force_join(facts, patterns):
+    """Semua bindings dengan nested loop atas semua fakta (acuan)"""
+    rows = [{}]
+    for pattern in patterns:
+        rows = [bindings for row in rows for fact in facts
+                for bindings in [brute_force_match(fact, pattern, row)]
+                if bindings is not None]
+    return rows
+
+
+def sorted_items(row):
+    return tuple(sorted(row.items(), key=str))
+
+
+def as_set(rows):
+    return set(map(sorted_items, rows))
+
+
+class QueryAllTest(unittest.TestCase):
+    
+    def test_matches_nested_loop_join(self):
+        rng = random.Random(3)
+        facts = FactBase()
+        facts.add_facts(random_facts(rng, 150))
+        for _ in range(60):
+            patterns = [random_pattern(rng) for _ in range(rng.randint(1, 3))]
+            with self.subTest(patterns=[str(p) for p in patterns]):
+                self.assertEqual(as_set(facts.query_all(patterns)),
+                                 as_set(brute_force_join(facts.facts, patterns)))
+    
+    def test_negated_patterns(self):
+        rng = random.Random(4)
+        facts = FactBase()
+        facts.add_facts(random_facts(rng, 150))
+        for _ in range(40):
+            patterns = [random_pattern(rng) for _ in range(rng.randint(1, 2))]
+            negated = random_pattern(rng)
+            expected = [row for row in brute_force_join(facts.facts, patterns)
+                        if not brute_force_join(facts.facts, [
+                            fact_matching.substitute(negated, row)])]
+            with self.subTest(patterns=[str(p) for p in patterns], negated=str(negated)):
+                self.assertEqual(as_set(facts.query_all(patterns, negated=[negated])),
+                                 as_set(expected))
+    
+    def test_plan_starts_selective_and_stays_connected(self):
+        facts = FactBase()
+        facts.add_facts(Fact("eats", [f"hewan{i}", "daging"]) for i in range(100))
+        facts.add_facts(Fact("lives_in", [f"hewan{i}", "hutan"]) for i in range(100))
+        facts.add_facts(Fact("color", [f"benda{i}", "hitam"]) for i in range(20))
+        facts.add(Fact("lives_in", ["hewan7", "rumah"]))
+        eats = Fact("eats", ["?a", "?f"])
+        home = Fact("lives_in", ["?a", "rumah"])
+        color = Fact("color", ["?b", "hitam"])
+        self.assertEqual(facts.plan([eats, color, home]), [home, eats, color])
+        self.assertEqual(facts.query_all([eats, home]), [{"?a": "hewan7", "?f": "daging"}])
+
+
+class CompiledPatternTest(unittest.TestCase):
+    
+    def test_match_dict_matches_reference(self):
+        rng = random.Random(5)
+        facts = random_facts(rng, 200)
+        for _ in range(50):
+            pattern = random_pattern(rng)
+            matcher = fact_matching.compile_pattern(pattern)
+            self.assertIs(fact_matching.compile_pattern(pattern), matcher)
+            bindings = {"?x": rng.choice(["a", 1])}
+            before = dict(bindings)
+            for fact in facts:
+                self.assertEqual(matcher.match_dict(fact, bindings),
+                                 brute_force_match(fact, pattern, bindings))
+                self.assertEqual(fact.matches(pattern), brute_force_match(fact, pattern))
+            self.assertEqual(bindings, before)
+    
+    def test_failed_bind_leaves_env_unchanged(self):
+        matcher = fact_matching.compile_pattern(Fact("p", ["?x", "?y", "?x"]))
+        env = fact_matching.Bindings({"?z": 0})
+        self.assertFalse(matcher.bind(Fact("p", ["a", "b", "c"]), env))
+        self.assertEqual((env.values, env.trail), ({"?z": 0}, []))
+        mark = env.mark()
+        self.assertTrue(matcher.bind(Fact("p", ["a", "b", "a"]), env))
+        self.assertEqual(env.values, {"?z": 0, "?x": "a", "?y": "b"})
+        env.undo(mark)
+        self.assertEqual((env.values, env.trail), ({"?z": 0}, []))
+    
+    def test_join_patterns_matches_nested_loop(self):
+        rng = random.Random(6)
+        facts = FactBase()
+        facts.add_facts(random_facts(rng, 150))
+        for _ in range(40):
+            patterns = [random_pattern(rng) for _ in range(rng.randint(1, 3))]
+            found = fact_matching.join_patterns(
+                facts, [(pattern, None) for pattern in patterns], {})
+            with self.subTest(patterns=[str(p) for p in patterns]):
+                self.assertEqual(Counter(map(sorted_items, found)),
+                                 Counter(map(sorted_items,
+                                             brute_force_join(facts.facts, patterns))))
+    
+    def test_join_patterns_exclude(self):
+        facts = FactBase()
+        facts.add_facts([Fact("parent", ["a", "b"]), Fact("parent", ["b", "c"])])
+        steps = [(Fact("parent", ["?x", "?y"]), {Fact("parent", ["a", "b"])}),
+                 (Fact("parent", ["?y", "?z"]), None)]
+        self.assertEqual(list(fact_matching.join_patterns(facts, steps, {})), [])
+        steps[0] = (steps[0][0], None)
+        self.assertEqual(list(fact_matching.join_patterns(facts, steps, {})),
+                         [{"?x": "a", "?y": "b", "?z": "c"}])
+
+
+class AggregateTest(unittest.TestCase):
+    
+    def setUp(self):
+        rng = random.Random(7)
+        self.facts = FactBase()
+        self.facts.add_facts(random_facts(rng, 300))
+        self.patterns = [Fact("p", ["?x", "?y"]), Fact("q", ["?x", "a", "?y"]),
+                         Fact("r", ["?x", "?x"]), Fact("p", ["?x"]),
+                         Fact("q", [gt(1, "?x"), "?y"])]
+    
+    def values(self, pattern, variable):
+        return [bindings[variable] for _, bindings in self.facts.query(pattern)]
+    
+    def test_aggregates_match_query(self):
+        for pattern in self.patterns:
+            values = self.values(pattern, "?x")
+            with self.subTest(pattern=str(pattern)):
+                self.assertEqual(self.facts.count(pattern), len(values))
+                self.assertEqual(self.facts.group_by(pattern, "?x"), dict(Counter(values)))
+                self.assertEqual(self.facts.distinct(pattern, "?x"), set(values))
+                self.assertEqual(self.facts.min(pattern, "?x", key=str),
+                                 min(values, key=str, default=None))
+                self.assertEqual(self.facts.max(pattern, "?x", key=str),
+                                 max(values, key=str, default=None))
+    
+    def test_empty_and_unknown_variable(self):
+        pattern = Fact("tidak_ada", ["?x"])
+        self.assertEqual(self.facts.count(pattern), 0)
+        self.assertEqual(self.facts.group_by(pattern, "?x"), {})
+        self.assertIsNone(self.facts.min(pattern, "?x"))
+        self.assertIsNone(self.facts.max(pattern, "?x"))
+        with self.assertRaises(ValueError):
+            self.facts.distinct(Fact("p", ["?x"]), "?z")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,345 @@
+"""
+Test engine forward chaining proposisional di 02_simple_rules
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+simple_rules = load_lesson("02_simple_rules.py")
+Rule = simple_rules.Rule
+
+
+def random_rules(rng, count, symbols):
+    """Aturan AND/OR acak (boleh bersiklus, tanpa negasi)"""
+    rules = []
+    for number in range(count):
+        conditions = rng.sample(symbols, rng.randint(0, 3))
+        operator = "OR" if conditions and rng.random() < 0.2 else "AND"
+        rules.append(Rule(f"R{number}", conditions, rng.choice(symbols), operator))
+    return rules
+
+
+def naive_closure(rules, facts):
+    """Fixpoint dengan Rule.evaluate berulang (acuan)"""
+    facts = set(facts)
+    changed = True
+    while changed:
+        changed = False
+        for rule in rules:
+            if rule.conclusion not in facts and rule.evaluate(facts):
+                facts.add(rule.conclusion)
+                changed = True
+    return facts
+
+
+class ReteNetworkTest(unittest.TestCase):
+    
+    def test_closure_matches_naive_fixpoint(self):
+        rng = random.Random(1)
+        symbols = [f"f{i}" for i in range(30)]
+        for _ in range(20):
+            rules = random_rules(rng, 40, symbols)
+            facts = rng.sample(symbols, rng.randint(0, 6))
+            net = simple_rules.ReteNetwork(rules)
+            net.add_facts(facts)
+            self.assertEqual(net.facts, naive_closure(rules, facts))
+    
+    def test_incremental_add_fires_chain(self):
+        net = simple_rules.ReteNetwork([
+            Rule("R1", ["a", "b"], "c"),
+            Rule("R2", ["c"], "d"),
+            Rule("R3", ["x", "y"], "z", "OR"),
+        ])
+        self.assertEqual(net.add_fact("a"), [])
+        self.assertEqual([rule.name for rule in net.add_fact("b")], ["R1", "R2"])
+        self.assertEqual([rule.name for rule in net.add_fact("y")], ["R3"])
+        self.assertEqual(net.add_fact("x"), [])
+    
+    def test_shared_prefixes(self):
+        net = simple_rules.ReteNetwork([
+            Rule("R1", ["a", "b", "c"], "x"),
+            Rule("R2", ["a", "b", "d"], "y"),
+            Rule("R3", ["b", "a"], "z"),
+        ])
+        stats = net.stats()
+        self.assertEqual(stats["alpha_nodes"], 4)
+        self.assertEqual(stats["join_nodes"], 4)   # (a), (a,b), (a,b,c), (a,b,d)
+        net.add_facts(["a", "b", "c", "d"])
+        self.assertTrue({"x", "y", "z"} <= net.facts)
+
+
+class ForwardChainerTest(unittest.TestCase):
+    
+    def test_closure_matches_naive_fixpoint(self):
+        rng = random.Random(2)
+        symbols = [f"f{i}" for i in range(30)]
+        for _ in range(20):
+            rules = random_rules(rng, 40, symbols)
+            facts = set(rng.sample(symbols, rng.randint(0, 6)))
+            expected = naive_closure(rules, facts)
+            fired = simple_rules.ForwardChainer(rules).run(facts)
+            self.assertEqual(facts, expected)
+            self.assertEqual(len(fired), len({rule.conclusion for rule in fired}))
+    
+    def test_rule_order_does_not_matter(self):
+        rng = random.Random(3)
+        symbols = [f"f{i}" for i in range(30)]
+        rules = random_rules(rng, 60, symbols)
+        start = rng.sample(symbols, 4)
+        closures = []
+        for _ in range(5):
+            rng.shuffle(rules)
+            facts = set(start)
+            simple_rules.ForwardChainer(rules).run(facts)
+            closures.append(facts)
+        self.assertTrue(all(facts == closures[0] for facts in closures))
+    
+    def test_long_chain_without_recursion(self):
+        depth = sys.getrecursionlimit() * 2
+        rules = [Rule(f"R{i}", [f"f{i}"], f"f{i + 1}") for i in range(depth)]
+        facts = {"f0"}
+        fired = simple_rules.ForwardChainer(reversed(rules)).run(facts)
+        self.assertEqual(len(fired), depth)
+        self.assertIn(f"f{depth}", facts)
+    
+    def test_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            simple_rules.ForwardChainer([Rule("R1", ["a"], "b", "XOR")])
+
+
+class ListenerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.rules = [Rule("R1", ["a"], "b"), Rule("R2", ["b"], "c"),
+                      Rule("R3", ["a"], "c")]
+    
+    def test_counting_listener(self):
+        counter = simple_rules.CountingListener()
+        simple_rules.ForwardChainer(self.rules).run({"a"}, listener=counter)
+        self.assertEqual(counter.facts_added, 2)
+        self.assertEqual(sum(counter.fired.values()), 2)
+        self.assertEqual(sum(counter.skipped.values()), 1)   # c sudah ada
+    
+    def test_json_lines_and_multi_listener(self):
+        stream = io.StringIO()
+        counter = simple_rules.CountingListener()
+        listener = simple_rules.MultiListener(
+            simple_rules.JsonLinesListener(stream), counter)
+        simple_rules.ForwardChainer(self.rules).run({"a"}, listener=listener)
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        fired = [event for event in events if event["event"] == "fired"]
+        self.assertEqual(len(fired), sum(counter.fired.values()))
+        self.assertEqual({event["conclusion"] for event in fired}, {"b", "c"})
+        self.assertEqual(
+            [event["reason"] for event in events if event["event"] == "skipped"],
+            [simple_rules.SKIP_CONCLUSION_EXISTS])
+    
+    def test_sampling_listener(self):
+        counter = simple_rules.CountingListener()
+        sampled = simple_rules.SamplingListener(counter, rate=0.0)
+        simple_rules.ForwardChainer(self.rules).run({"a"}, listener=sampled)
+        self.assertEqual(counter.facts_added, 0)
+        sampled = simple_rules.SamplingListener(counter, rate=1.0)
+        simple_rules.ForwardChainer(self.rules).run({"a"}, listener=sampled)
+        self.assertEqual(counter.facts_added, 2)
+    
+    def test_no_listener_prints_nothing(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            simple_rules.ForwardChainer(self.rules).run({"a"})
+            simple_rules.ReteNetwork(self.rules).add_fact("a")
+        self.assertEqual(stdout.getvalue(), "")
+
+
+class AgendaTest(unittest.TestCase):
+    
+    def drain(self, agenda):
+        names = []
+        while True:
+            activation = agenda.pop()
+            if activation is None:
+                return names
+            names.append(activation.rule.name)
+    
+    def test_strategies(self):
+        one = Rule("satu", ["a"], "x")
+        two = Rule("dua", ["a", "b"], "y")
+        urgent = Rule("darurat", ["a"], "z", salience=10)
+        expected = {
+            "salience": ["darurat", "satu", "dua"],
+            "lex": ["darurat", "dua", "satu"],
+            "mea": ["darurat", "satu", "dua"],
+            "specificity": ["darurat", "dua", "satu"],
+        }
+        for strategy, order in expected.items():
+            agenda = simple_rules.Agenda(strategy)
+            agenda.push(one, (2,))
+            agenda.push(two, (1, 3))
+            agenda.push(urgent, (1,))
+            with self.subTest(strategy=strategy):
+                self.assertEqual(len(agenda), 3)
+                self.assertEqual(self.drain(agenda), order)
+        with self.assertRaises(ValueError):
+            simple_rules.Agenda("acak")
+    
+    def test_remove_and_empty_pop(self):
+        agenda = simple_rules.Agenda("salience")
+        first = agenda.push(Rule("R1", [], "x"))
+        agenda.push(Rule("R2", [], "y"))
+        agenda.remove(first)
+        agenda.remove(first)   # kedua kali tidak berpengaruh
+        self.assertEqual(len(agenda), 1)
+        self.assertEqual(self.drain(agenda), ["R2"])
+        self.assertIsNone(agenda.pop())
+        self.assertEqual(len(agenda), 0)
+    
+    def test_rete_fires_in_agenda_order(self):
+        rules = [Rule("R1", ["a"], "x"), Rule("R2", ["b"], "y"),
+                 Rule("R3", ["a"], "z", salience=5)]
+        net = simple_rules.ReteNetwork(rules, agenda=simple_rules.Agenda("lex"))
+        fired = net.add_facts(["a", "b"])
+        self.assertEqual([rule.name for rule in fired], ["R3", "R2", "R1"])
+
+
+class ProofStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.rules = [Rule("R1", ["a", "b"], "c"), Rule("R2", ["c", "a"], "d"),
+                      Rule("R3", ["x", "b"], "e", "OR")]
+    
+    def test_explain_shares_subtrees(self):
+        for engine in ("ForwardChainer", "ReteNetwork"):
+            proofs = simple_rules.ProofStore()
+            if engine == "ForwardChainer":
+                simple_rules.ForwardChainer(self.rules).run({"a", "b"}, proofs=proofs)
+            else:
+                simple_rules.ReteNetwork(self.rules, proofs=proofs).add_facts(["a", "b"])
+            with self.subTest(engine=engine):
+                tree = proofs.explain("d")
+                self.assertEqual(tree["rule"].name, "R2")
+                c, a = tree["premises"]
+                self.assertEqual((c["fact"], c["rule"].name), ("c", "R1"))
+                self.assertIs(c["premises"][0], a)   # DAG: node 'a' dipakai bersama
+                self.assertIsNone(a["rule"])
+                or_tree = proofs.explain("e")
+                self.assertEqual([p["fact"] for p in or_tree["premises"]], ["b"])
+                self.assertIsNone(proofs.explain("z"))
+    
+    def test_format_refers_to_shown_facts(self):
+        proofs = simple_rules.ProofStore()
+        simple_rules.ForwardChainer(self.rules).run({"a", "b"}, proofs=proofs)
+        lines = proofs.format("d").splitlines()
+        self.assertTrue(lines[0].startswith("• d ← R2 #"))
+        self.assertEqual(len(lines), 5)   # d, c, a, b, lalu a dirujuk
+        self.assertIn("(lihat #", lines[-1])
+        self.assertEqual(proofs.format("z"), "")
+    
+    def test_first_proof_kept(self):
+        proofs = simple_rules.ProofStore()
+        first, second = Rule("R1", ["a"], "c"), Rule("R2", ["b"], "c")
+        proofs.record("c", first, ["a"])
+        proofs.record("c", second, ["b"])
+        tree = proofs.explain("c")
+        self.assertIs(tree["rule"], first)
+        self.assertEqual([p["fact"] for p in tree["premises"]], ["a"])
+    
+    def test_deep_chain_explained_iteratively(self):
+        depth = sys.getrecursionlimit() * 2
+        rules = [Rule(f"R{i}", [f"f{i}"], f"f{i + 1}") for i in range(depth)]
+        proofs = simple_rules.ProofStore()
+        simple_rules.ForwardChainer(rules).run({"f0"}, proofs=proofs)
+        self.assertEqual(len(proofs.format(f"f{depth}").splitlines()), depth + 1)
+        self.assertEqual(proofs.explain(f"f{depth}")["rule"].name, f"R{depth - 1}")
+
+
+class RuleGraphTest(unittest.TestCase):
+    
+    def test_components_and_layers(self):
+        graph = simple_rules.RuleGraph([
+            Rule("R0", ["a"], "b"),
+            Rule("R1", ["b"], "c"),
+            Rule("R2", ["c"], "b"),            # siklus R1 <-> R2
+            Rule("R3", ["x"], "y"),
+            Rule("R4", ["c"], "d", negations=["y"]),
+            Rule("R5", ["d"], "d"),            # siklus ke diri sendiri
+        ])
+        cyclic = {tuple(component): flag
+                  for component, flag in zip(graph.components, graph.cyclic)}
+        self.assertEqual(cyclic, {(0,): False, (1, 2): True, (3,): False,
+                                  (4,): False, (5,): True})
+        layer_of = {number: depth for depth, layer in enumerate(graph.layers)
+                    for index in layer for number in graph.components[index]}
+        self.assertEqual(layer_of, {0: 0, 3: 0, 1: 1, 2: 1, 4: 2, 5: 3})
+        position = {number: index for index, component in enumerate(graph.components)
+                    for number in component}
+        for number, users in enumerate(graph.edges):   # urutan topologis
+            for user in users:
+                if position[user] != position[number]:
+                    self.assertLess(position[number], position[user])
+    
+    def test_negation_inside_cycle_rejected(self):
+        with self.assertRaisesRegex(ValueError, "stratifikasi"):
+            simple_rules.RuleGraph([Rule("R1", ["a"], "b", negations=["c"]),
+                                    Rule("R2", ["b"], "c")])
+
+
+class ParallelChainerTest(unittest.TestCase):
+    
+    def setUp(self):
+        rng = random.Random(4)
+        self.symbols = [f"f{i}" for i in range(40)]
+        self.rules = random_rules(rng, 120, self.symbols)
+        self.rules.append(Rule("N1", ["f1"], "aman", negations=["f39"]))
+        self.starts = [set(rng.sample(self.symbols, 5)) for _ in range(5)]
+    
+    def check(self, chainer):
+        for start in self.starts:
+            expected = set(start)
+            simple_rules.ForwardChainer(self.rules).run(expected)
+            facts = set(start)
+            fired = chainer.run(facts)
+            with self.subTest(start=sorted(start)):
+                self.assertEqual(facts, expected)
+                self.assertEqual(len(fired), len(expected - start))
+    
+    def test_single_process_matches_forward_chainer(self):
+        self.check(simple_rules.ParallelChainer(self.rules, processes=1))
+    
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork",
+                         "modul pelajaran hanya terlihat oleh worker hasil fork")
+    def test_process_pool_matches_forward_chainer(self):
+        self.check(simple_rules.ParallelChainer(self.rules, processes=2,
+                                                min_parallel=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Test KnowledgeBase di 01_knowledge_base: snapshot mmap
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+knowledge_base = load_lesson("01_knowledge_base.py")
+KnowledgeBase = knowledge_base.KnowledgeBase
+
+
+class SnapshotTest(unittest.TestCase):
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "hewan.kbsnap")
+        kb = KnowledgeBase()
+        kb.add_facts(["memiliki bulu", "memberi susu", "karnivora", "ékor"])
+        kb.add_rule("R1", ["memiliki bulu", "memberi susu"], "adalah mamalia")
+        kb.save_snapshot(self.path)
+    
+    def test_round_trip(self):
+        with KnowledgeBase.open_snapshot(self.path) as kb:
+            self.assertEqual(set(kb.facts),
+                             {"memiliki bulu", "memberi susu", "karnivora", "ékor"})
+            self.assertTrue(kb.has_fact("ékor"))
+            self.assertFalse(kb.has_fact("bisa terbang"))
+            self.assertEqual(kb.rules[0]["conclusion"], "adalah mamalia")
+    
+    def test_added_facts_stay_in_memory(self):
+        with KnowledgeBase.open_snapshot(self.path) as kb:
+            self.assertEqual(kb.add_facts(["karnivora", "bisa berenang"]), 1)
+            self.assertEqual(kb.facts.added, {"bisa berenang"})
+            self.assertEqual(len(kb.facts), 5)
+    
+    def test_close_is_idempotent(self):
+        kb = KnowledgeBase.open_snapshot(self.path)
+        iterator = iter(kb.facts)
+        next(iterator)
+        kb.close()
+        kb.close()
+        self.assertTrue(kb.facts._map.closed)
+    
+    def test_rejects_other_files(self):
+        other = os.path.join(self.directory, "bukan.kbsnap")
+        with open(other, "wb") as stream:
+            stream.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            KnowledgeBase.open_snapshot(other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Test loader file JSON-lines/CSV (record_io.read_records) di 01 dan 03
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import json
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+knowledge_base = load_lesson("01_knowledge_base.py")
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+
+
+class LoaderTest(unittest.TestCase):
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+    
+    def write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as stream:
+            stream.writelines(line + "\n" for line in lines)
+        return path
+    
+    def test_knowledge_base_jsonl_and_csv(self):
+        kb = knowledge_base.KnowledgeBase()
+        facts = self.write("fakta.jsonl", [json.dumps("memiliki bulu"), "",
+                                           json.dumps({"fact": "memberi susu"})])
+        rules = self.write("aturan.csv", [
+            "name,conditions,conclusion",
+            "R1,memiliki bulu; memberi susu,adalah mamalia"])
+        self.assertEqual(kb.load_facts(facts, chunk_size=1), 2)
+        self.assertEqual(kb.load_rules(rules), 1)
+        self.assertEqual(kb.rules[0]["conditions"], ["memiliki bulu", "memberi susu"])
+        self.assertEqual(kb.load_facts(self.write("fakta.csv", ["karnivora"])), 1)
+    
+    def test_fact_base_jsonl_and_csv(self):
+        jsonl = self.write("fakta.jsonl", [
+            json.dumps({"predicate": "usia", "arguments": ["ani", 72]}),
+            json.dumps(["usia", "budi", 30.5]),
+            json.dumps(["hujan"])])
+        csv_path = self.write("fakta.csv", ["usia,ani,72", "usia,budi,30.5", "hujan"])
+        expected = {Fact("usia", ["ani", 72]), Fact("usia", ["budi", 30.5]),
+                    Fact("hujan", [])}
+        self.assertEqual(set(fact_matching.read_facts(jsonl, chunk_size=2)), expected)
+        self.assertEqual(set(fact_matching.read_facts(csv_path)), expected)
+    
+    def test_rules_with_ranges(self):
+        path = self.write("aturan.jsonl", [json.dumps({
+            "name": "lansia", "antecedents": [["usia", "?p", {"gt": 60}]],
+            "conclusion": ["lansia", "?p"]})])
+        rule, = fact_matching.load_rules(path)
+        self.assertEqual(rule.antecedents[0].arguments[1], fact_matching.gt(60))
+        csv_path = self.write("aturan.csv", [
+            "name,antecedents,conclusion,negated",
+            'sehat,"usia(?p, ?a); aktif(?p)",sehat(?p),sakit(?p)'])
+        rule, = fact_matching.load_rules(csv_path)
+        self.assertEqual(rule.negated, [fact_matching.parse_pattern("sakit(?p)")])
+    
+    def test_bad_json_reports_path_and_line(self):
+        lines = [json.dumps("a"), "", json.dumps("b"), "{rusak", json.dumps("c")]
+        path = self.write("rusak.jsonl", lines)
+        loaders = {
+            "KnowledgeBase.load_facts": knowledge_base.KnowledgeBase().load_facts,
+            "read_facts": lambda *args: list(fact_matching.read_facts(*args)),
+        }
+        for name, load in loaders.items():
+            for chunk_size in (2, 50):
+                with self.subTest(loader=name, chunk_size=chunk_size):
+                    with self.assertRaisesRegex(ValueError, "^" + re.escape(f"{path}:4: ")):
+                        load(path, chunk_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Test MappedFactBase: snapshot mmap harus menjawab sama dengan FactBase
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+MappedFactBase = fact_matching.MappedFactBase
+
+
+class MappedFactBaseTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "kb.snap")
+        self.facts = FactBase()
+        self.facts.add_facts(
+            [Fact("umur", [f"orang{i}", i % 40]) for i in range(200)]
+            + [Fact("kota", [f"orang{i}", ["bandung", "medan"][i % 2]])
+               for i in range(200)]
+            + [Fact("aktif", [f"orang{i}", i % 3 == 0]) for i in range(50)]
+            + [Fact("nilai", [1.5]), Fact("kosong", [])])
+        self.facts.save_snapshot(self.path)
+        self.mapped = MappedFactBase(self.path)
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(self.mapped.close)
+    
+    def assertSameAnswers(self, patterns):
+        key = lambda binding: sorted(binding.items(), key=repr)
+        expected = sorted(map(key, self.facts.query_all(patterns)), key=repr)
+        answers = sorted(map(key, self.mapped.query_all(patterns)), key=repr)
+        self.assertEqual(answers, expected)
+    
+    def test_queries_match_fact_base(self):
+        self.assertEqual(len(self.mapped.facts), len(self.facts.facts))
+        self.assertEqual(set(self.mapped.facts), set(self.facts.facts))
+        self.assertSameAnswers([Fact("umur", ["?x", 7])])
+        self.assertSameAnswers([Fact("kota", ["?x", "medan"]),
+                                Fact("umur", ["?x", "?u"])])
+        self.assertSameAnswers([Fact("aktif", ["?x", True])])
+        self.assertSameAnswers([Fact("umur", ["?x", fact_matching.between(10, 12)])])
+        self.assertEqual(self.mapped.count(Fact("kosong", [])), 1)
+    
+    def test_contains(self):
+        self.assertIn(Fact("umur", ["orang3", 3]), self.mapped.facts)
+        self.assertIn(Fact("nilai", [1.5]), self.mapped.facts)
+        self.assertNotIn(Fact("umur", ["orang3", 4]), self.mapped.facts)
+        self.assertNotIn(Fact("umur", ["orang3"]), self.mapped.facts)
+    
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.mapped.add(Fact("umur", ["baru", 1]))
+    
+    def test_pickled_as_path(self):
+        with pickle.loads(pickle.dumps(self.mapped)) as copy:
+            self.assertEqual(copy.count(Fact("kota", ["?x", "bandung"])), 100)
+    
+    def test_close_with_open_iterator(self):
+        iterator = self.mapped.iter_query(Fact("kota", ["?x", "medan"]))
+        next(iterator)
+        self.mapped.close()
+        self.mapped.close()
+        self.assertTrue(self.mapped._map.closed)
+    
+    def test_close_retry_after_outside_view(self):
+        view = memoryview(self.mapped._map)
+        with self.assertRaises(BufferError):
+            self.mapped.close()
+        view.release()
+        self.mapped.close()
+        self.assertTrue(self.mapped._map.closed)
+    
+    def test_rejects_other_files(self):
+        other = os.path.join(self.directory.name, "bukan.snap")
+        with open(other, "wb") as stream:
+            stream.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            MappedFactBase(other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Test Range (lt/le/gt/ge/between): FactBase dan SQLiteFactBase harus
+memberi jawaban yang sama dengan penyaringan langsung Range.contains
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+lt, le, gt, ge, between = (fact_matching.lt, fact_matching.le, fact_matching.gt,
+                           fact_matching.ge, fact_matching.between)
+
+
+def mixed_facts(count, seed=0):
+    """Fakta nilai(?x, v) dengan v campuran int, float, bool dan str"""
+    rng = random.Random(seed)
+    values = [
+        lambda: rng.randint(-50, 50),
+        lambda: rng.uniform(-50, 50),
+        lambda: rng.choice([True, False]),
+        lambda: rng.choice(["a", "10", "z"]),
+    ]
+    return [Fact("nilai", [f"o{i}", rng.choice(values)()]) for i in range(count)]
+
+
+def typed(bindings):
+    """Bindings yang membedakan True dari 1 (di Python True == 1)"""
+    return sorted(sorted((var, type(value).__name__, repr(value))
+                         for var, value in binding.items())
+                  for binding in bindings)
+
+
+class RangeBackendsTest(unittest.TestCase):
+    
+    RANGES = [gt(0), ge(1), lt(1), le(30), le(0.5), gt(-0.5),
+              between(-10, 10), between(0, 1), between(5, 5), between(3, -3)]
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.facts = mixed_facts(400)
+        cls.memory = fact_matching.FactBase()
+        cls.memory.add_facts(cls.facts)
+        cls.sqlite = fact_matching.SQLiteFactBase()
+        cls.sqlite.add_facts(cls.facts)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.sqlite.close()
+    
+    def expected(self, bounds):
+        return typed({"?x": fact.arguments[0], "?v": fact.arguments[1]}
+                     for fact in self.facts if bounds.contains(fact.arguments[1]))
+    
+    def test_backends_agree_on_ranges(self):
+        for bounds in self.RANGES:
+            bound = fact_matching.Range(bounds.low, bounds.high, bounds.low_inclusive,
+                                        bounds.high_inclusive, "?v")
+            patterns = [Fact("nilai", ["?x", bound])]
+            expected = self.expected(bounds)
+            with self.subTest(bounds=bounds._key()):
+                self.assertEqual(typed(self.memory.query_all(patterns)), expected)
+                self.assertEqual(typed(self.sqlite.query_all(patterns)), expected)
+                pattern = Fact("nilai", ["?x", bounds])
+                self.assertEqual(self.memory.count(pattern), len(expected))
+                self.assertEqual(self.sqlite.count(pattern), len(expected))
+    
+    def test_bools_never_in_range(self):
+        for backend in (self.memory, self.sqlite):
+            for _, bindings in backend.query(Fact("nilai", ["?x", ge(0, "?v")])):
+                self.assertIsNot(type(bindings["?v"]), bool)
+    
+    def test_sorted_index_follows_updates(self):
+        facts = fact_matching.FactBase()
+        facts.add_facts(self.facts)
+        pattern = Fact("nilai", ["?x", between(0, 10)])
+        before = facts.count(pattern)
+        facts.add(Fact("nilai", ["baru", 5]))
+        facts.remove(next(f for f in self.facts
+                          if type(f.arguments[1]) is int and 0 <= f.arguments[1] <= 10))
+        self.assertEqual(facts.count(pattern), before)
+        facts.add(Fact("nilai", ["baru2", 7.5]))
+        self.assertEqual(facts.count(pattern), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
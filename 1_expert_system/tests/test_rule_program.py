@@ -0,0 +1,133 @@
+"""
+Test RuleProgram/Session dan negasi terstratifikasi di 02_simple_rules
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+simple_rules = load_lesson("02_simple_rules.py")
+Rule = simple_rules.Rule
+ForwardChainer = simple_rules.ForwardChainer
+RuleProgram = simple_rules.RuleProgram
+
+
+def closure(rules, facts):
+    facts = set(facts)
+    ForwardChainer(rules).run(facts)
+    return facts
+
+
+class NegationTest(unittest.TestCase):
+    
+    RULES = [
+        Rule("N1", ["hujan"], "jalan basah"),
+        Rule("N2", ["cerah"], "bawa topi", negations=["jalan basah"]),
+        Rule("N3", ["jalan basah"], "pakai sepatu bot"),
+    ]
+    
+    def test_stratify_puts_negation_above_producer(self):
+        levels = simple_rules.stratify(self.RULES)
+        self.assertGreater(levels[1], levels[0])
+    
+    def test_negated_fact_derived_later_blocks_rule(self):
+        self.assertEqual(closure(self.RULES, {"cerah", "hujan"}),
+                         {"cerah", "hujan", "jalan basah", "pakai sepatu bot"})
+        self.assertIn("bawa topi", closure(self.RULES, {"cerah"}))
+    
+    def test_unstratifiable_rules_rejected(self):
+        rules = [Rule("a", ["x"], "p", negations=["q"]),
+                 Rule("b", ["p"], "q")]
+        with self.assertRaises(ValueError):
+            simple_rules.stratify(rules)
+    
+    def test_session_without_add_facts_has_negation_conclusions(self):
+        program = RuleProgram([Rule("n", ["a"], "b", negations=["c"])],
+                              base_facts={"a"})
+        session = program.session()
+        self.assertIn("b", session)
+        self.assertEqual(session.facts, {"a", "b"})
+    
+    def test_base_closure_matches_forward_chainer(self):
+        for base in [{"cerah"}, {"cerah", "hujan"}, {"hujan"}]:
+            program = RuleProgram(self.RULES, base_facts=base)
+            self.assertEqual(program.base_facts, closure(self.RULES, base))
+            self.assertEqual(program.session().facts, program.base_facts)
+    
+    def test_session_negation_checked_after_lower_strata(self):
+        program = RuleProgram(self.RULES)
+        session = program.session()
+        session.add_facts(["cerah", "hujan"])
+        self.assertNotIn("bawa topi", session)
+        self.assertEqual(session.facts, closure(self.RULES, {"cerah", "hujan"}))
+
+
+class SessionTest(unittest.TestCase):
+    
+    RULES = [
+        Rule("D1", ["demam", "batuk"], "flu"),
+        Rule("D2", ["flu", "musim hujan"], "perlu vitamin"),
+        Rule("D3", ["ruam", "demam"], "campak", "OR"),
+    ]
+    
+    def test_session_matches_forward_chainer(self):
+        program = RuleProgram(self.RULES, base_facts={"musim hujan"})
+        session = program.session()
+        session.add_fact("demam")
+        session.add_facts(["batuk"])
+        self.assertEqual(session.facts,
+                         closure(self.RULES, {"musim hujan", "demam", "batuk"}))
+        self.assertEqual([rule.name for rule in session.fired],
+                         ["D3", "D1", "D2"])
+    
+    def test_sessions_are_isolated(self):
+        program = RuleProgram(self.RULES, base_facts={"musim hujan"})
+        first, second = program.session(), program.session()
+        first.add_facts(["demam", "batuk"])
+        self.assertIn("perlu vitamin", first)
+        self.assertNotIn("flu", second)
+        self.assertEqual(second.facts, {"musim hujan"})
+        self.assertEqual(program.base_facts, {"musim hujan"})
+        second.add_facts(["batuk", "demam"])
+        self.assertEqual(second.facts, first.facts)
+    
+    def test_base_counters_shared_by_sessions(self):
+        program = RuleProgram(self.RULES, base_facts={"demam"})
+        self.assertIn("campak", program.base_facts)
+        session = program.session()
+        self.assertEqual(session.add_fact("batuk")[0].name, "D1")
+        self.assertEqual(session.local_facts, {"batuk", "flu"})
+    
+    def test_session_proofs_use_base_facts_as_leaves(self):
+        program = RuleProgram(self.RULES, base_facts={"musim hujan"})
+        proofs = simple_rules.ProofStore()
+        session = program.session(proofs=proofs)
+        session.add_facts(["demam", "batuk"])
+        self.assertIn("musim hujan", proofs.format("perlu vitamin"))
+
+
+if __name__ == "__main__":
+    unittest.main()
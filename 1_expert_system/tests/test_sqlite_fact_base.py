@@ -0,0 +1,118 @@
+"""
+Test SQLiteFactBase: jawaban harus sama dengan FactBase
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+SQLiteFactBase = fact_matching.SQLiteFactBase
+
+
+def typed(bindings):
+    """Bindings yang membedakan True dari 1 (di Python True == 1)"""
+    return sorted(sorted((var, type(value).__name__, repr(value))
+                         for var, value in binding.items())
+                  for binding in bindings)
+
+
+class SQLiteFactBaseTest(unittest.TestCase):
+    
+    FACTS = [
+        Fact("eats", ["kucing", "ikan"]),
+        Fact("eats", ["beruang", "ikan"]),
+        Fact("eats", ["beruang", "madu"]),
+        Fact("lives_in", ["kucing", "rumah"]),
+        Fact("lives_in", ["beruang", "hutan"]),
+        Fact("jinak", ["kucing", True]),
+        Fact("jinak", ["beruang", False]),
+        Fact("kaki", ["kucing", 4]),
+        Fact("hujan", []),
+    ]
+    
+    def setUp(self):
+        self.memory = FactBase()
+        self.memory.add_facts(self.FACTS)
+        self.sqlite = SQLiteFactBase()
+        self.sqlite.add_facts(self.FACTS)
+        self.addCleanup(self.sqlite.close)
+    
+    def assertSameAnswers(self, patterns, negated=()):
+        self.assertEqual(typed(self.sqlite.query_all(patterns, negated)),
+                         typed(self.memory.query_all(patterns, negated)))
+    
+    def test_conjunctive_queries(self):
+        self.assertSameAnswers([Fact("eats", ["?a", "ikan"]),
+                                Fact("lives_in", ["?a", "?p"])])
+        self.assertSameAnswers([Fact("eats", ["?a", "?f"])],
+                               [Fact("lives_in", ["?a", "rumah"])])
+        self.assertSameAnswers([Fact("hujan", [])])
+        self.assertEqual(len(self.sqlite), len(self.FACTS))
+    
+    def test_bools_round_trip(self):
+        pattern = Fact("jinak", ["?a", "?j"])
+        self.assertEqual(typed(b for _, b in self.sqlite.query(pattern)),
+                         typed(b for _, b in self.memory.query(pattern)))
+        self.assertEqual(self.sqlite.distinct(pattern, "?j"), {True, False})
+        self.assertIn(Fact("jinak", ["kucing", True]), set(self.sqlite))
+    
+    def test_bool_constants_match_like_python(self):
+        for value in [True, 1, False, 0]:
+            self.assertSameAnswers([Fact("jinak", ["?a", value])])
+        self.assertFalse(self.sqlite.exists(Fact("kaki", ["?a", fact_matching.le(1)])))
+        self.assertSameAnswers([Fact("jinak", ["?a", fact_matching.ge(0)])])
+    
+    def test_remove(self):
+        self.assertTrue(self.sqlite.remove(Fact("jinak", ["kucing", True])))
+        self.assertFalse(self.sqlite.remove(Fact("jinak", ["kucing", True])))
+        self.assertFalse(self.sqlite.remove(Fact("terbang", ["kucing"])))
+        self.assertEqual(self.sqlite.count(Fact("jinak", ["?a", "?j"])), 1)
+    
+    def test_failed_add_facts_leaves_no_tables(self):
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.sqlite.add_facts([Fact("warna", ["kucing", "oranye"]),
+                                   Fact("rusak", [object()])])
+        self.assertNotIn(("warna", 2), self.sqlite._tables)
+        self.assertEqual(self.sqlite.count(Fact("warna", ["?a", "?w"])), 0)
+        self.sqlite.add_facts([Fact("warna", ["kucing", "oranye"])])
+        self.assertEqual(self.sqlite.count(Fact("warna", ["?a", "?w"])), 1)
+    
+    def test_tables_reopened_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fakta.db")
+            with SQLiteFactBase(path) as fb:
+                fb.add_facts(self.FACTS)
+            with SQLiteFactBase(path) as fb:
+                self.assertEqual(set(fb), set(self.FACTS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test TabledProver: jawaban harus sama dengan DatalogEngine (closure penuh)
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+PatternRule = fact_matching.PatternRule
+pattern = fact_matching.parse_pattern
+
+
+def rule(name, antecedents, conclusion, negated=()):
+    return PatternRule(name, [pattern(text) for text in antecedents],
+                       pattern(conclusion), [pattern(text) for text in negated])
+
+
+def fact_base(facts):
+    base = FactBase()
+    base.add_facts(facts)
+    return base
+
+
+class TabledProverTest(unittest.TestCase):
+    
+    def assertSameAsDatalog(self, rules, facts, goals):
+        closure = fact_base(facts)
+        fact_matching.DatalogEngine(rules).run(closure)
+        prover = fact_matching.TabledProver(rules, fact_base(facts))
+        for goal in goals:
+            expected = {fact for fact, _ in closure.query(goal)}
+            answers = {fact for fact, _ in prover.solve(goal)}
+            self.assertEqual(answers, expected, f"goal {goal}")
+    
+    def test_scc_with_repeated_subgoals(self):
+        rules = [
+            rule("1", ["r(?x)", "r(?x)", "s(?z, ?x)"], "s(?x, ?z)"),
+            rule("2", ["q(?x, ?z)", "q(?x, ?z)", "q(?x, ?y)"], "r(?x)"),
+            rule("3", ["q(?z, ?z)", "q(?y, ?x)"], "s(?x, ?x)"),
+            rule("4", ["r(?x)", "s(?x, ?y)", "r(?z)"], "q(?y, ?x)"),
+        ]
+        facts = [pattern(text) for text in
+                 "p(d,a) p(d,c) q(a,d) q(d,a) r(a) r(d) s(d,b)".split()]
+        self.assertSameAsDatalog(rules, facts, [
+            pattern("q(?a, ?b)"), pattern("s(?a, ?b)"), pattern("r(?a)"),
+            pattern("s(d, ?b)"), pattern("q(?a, ?a)"),
+        ])
+    
+    def test_deep_right_recursive_chain(self):
+        rules = [
+            rule("a1", ["parent(?x, ?y)"], "ancestor(?x, ?y)"),
+            rule("a2", ["parent(?x, ?y)", "ancestor(?y, ?z)"], "ancestor(?x, ?z)"),
+        ]
+        n = 400
+        prover = fact_matching.TabledProver(
+            rules, fact_base(Fact("parent", [i, i + 1]) for i in range(n)))
+        answers = prover.solve(Fact("ancestor", [0, "?z"]))
+        self.assertEqual(sorted(b["?z"] for _, b in answers), list(range(1, n + 1)))
+    
+    def test_deep_left_recursive_chain(self):
+        rules = [
+            rule("a1", ["parent(?x, ?y)"], "ancestor(?x, ?y)"),
+            rule("a2", ["ancestor(?x, ?y)", "parent(?y, ?z)"], "ancestor(?x, ?z)"),
+        ]
+        n = 2000
+        prover = fact_matching.TabledProver(
+            rules, fact_base(Fact("parent", [i, i + 1]) for i in range(n)))
+        self.assertEqual(len(prover.solve(Fact("ancestor", [0, "?z"]))), n)
+        self.assertIsNotNone(prover.prove(Fact("ancestor", [0, n])))
+        self.assertIsNone(prover.prove(Fact("ancestor", [n, 0])))
+    
+    def test_mutual_recursion(self):
+        rules = [
+            rule("e0", ["zero(?x)"], "even(?x)"),
+            rule("e1", ["succ(?x, ?y)", "odd(?x)"], "even(?y)"),
+            rule("o1", ["succ(?x, ?y)", "even(?x)"], "odd(?y)"),
+        ]
+        n = 1000
+        facts = [Fact("zero", [0])] + [Fact("succ", [i, i + 1]) for i in range(n)]
+        self.assertSameAsDatalog(rules, facts, [
+            Fact("even", ["?x"]), Fact("odd", ["?x"]),
+            Fact("even", [n]), Fact("odd", [n - 1]),
+        ])
+    
+    def test_random_programs_match_datalog(self):
+        rnd = random.Random(0)
+        predicates = ["p", "q", "r", "s"]
+        variables = ["?x", "?y", "?z"]
+        
+        def random_pattern():
+            return Fact(rnd.choice(predicates),
+                        [rnd.choice(variables + ["a", "b"]) for _ in range(2)])
+        
+        checked = 0
+        while checked < 150:
+            try:
+                rules = []
+                for number in range(rnd.randint(1, 4)):
+                    body = [random_pattern() for _ in range(rnd.randint(1, 3))]
+                    negated = [random_pattern()] if rnd.random() < 0.3 else []
+                    rules.append(PatternRule(f"r{number}", body, random_pattern(),
+                                             negated))
+                fact_matching.stratify(rules)
+            except ValueError:
+                continue   # variabel kesimpulan tidak terikat / tidak stratified
+            facts = [Fact(rnd.choice(predicates), [rnd.choice("abcd"), rnd.choice("abcd")])
+                     for _ in range(rnd.randint(0, 10))]
+            goals = [Fact(predicate, args) for predicate in predicates
+                     for args in (["?u", "?v"], ["a", "?v"], ["?u", "?u"])]
+            self.assertSameAsDatalog(rules, facts, goals)
+            checked += 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test TimedFactBase: TTL, expire(), watch() dan TruthMaintenance
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+PatternRule = fact_matching.PatternRule
+
+
+class TimedFactBaseTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.now = 0
+        self.readings = fact_matching.TimedFactBase(clock=lambda: self.now)
+    
+    def test_expire_after_ttl(self):
+        self.readings.add(Fact("suhu", ["s1", 40]), ttl=10)
+        self.readings.add(Fact("lokasi", ["s1", "gudang"]))   # tanpa TTL
+        self.now = 9
+        self.assertEqual(self.readings.expire(), [])
+        self.now = 10
+        self.assertEqual(self.readings.expire(), [Fact("suhu", ["s1", 40])])
+        self.assertEqual(set(self.readings.facts), {Fact("lokasi", ["s1", "gudang"])})
+        self.assertEqual(self.readings.count(Fact("suhu", ["?s", "?t"])), 0)
+    
+    def test_refresh_and_remove_cancel_old_expiry(self):
+        fact = Fact("asap", ["dapur"])
+        self.readings.add(fact, ttl=10)
+        self.readings.add(fact, timestamp=5, ttl=10)   # diperbarui: kedaluwarsa t=15
+        self.readings.add(fact)                        # add biasa: TTL tetap
+        self.now = 12
+        self.assertEqual(self.readings.expire(), [])
+        self.now = 15
+        self.assertEqual(self.readings.expire(), [fact])
+        self.readings.add(fact, ttl=1)
+        self.readings.remove(fact)
+        self.now = 100
+        self.assertEqual(self.readings.expire(), [])
+    
+    def test_query_within(self):
+        self.readings.add(Fact("asap", ["gudang"]), timestamp=0)
+        self.readings.add(Fact("asap", ["dapur"]), timestamp=50)
+        self.now = 60
+        found = self.readings.query_within(Fact("asap", ["?r"]), 30)
+        self.assertEqual([bindings["?r"] for _, bindings in found], ["dapur"])
+    
+    def test_watch_reports_expired_and_retracted_facts(self):
+        rules = [PatternRule("K1", [Fact("suhu", ["?r", "tinggi"]),
+                                    Fact("asap", ["?r"])],
+                             Fact("kebakaran", ["?r"]))]
+        tms = fact_matching.TruthMaintenance(rules, self.readings)
+        self.readings.subscribe(tms.retract_facts)
+        seen = []
+        self.readings.watch(Fact("kebakaran", ["?r"]),
+                            lambda fact, bindings: seen.append(bindings["?r"]))
+        self.readings.watch(Fact("asap", ["?r"]),
+                            lambda fact, bindings: seen.append(str(fact)))
+        for fact in [Fact("suhu", ["dapur", "tinggi"]), Fact("asap", ["dapur"])]:
+            self.readings.add(fact, ttl=30)
+            tms.assert_fact(fact)
+        self.assertIn(Fact("kebakaran", ["dapur"]), self.readings.facts)
+        self.now = 30
+        self.readings.expire()
+        self.assertEqual(sorted(seen), ["asap(dapur)", "dapur"])
+        self.assertEqual(len(self.readings.facts), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Test VersionedFactBase: snapshot MVCC terisolasi dari perubahan writer
+
+Cara menjalankan:
+    python -m unittest discover 1_expert_system/tests
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import threading
+import unittest
+
+BASIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "basic")
+
+
+def load_lesson(filename):
+    """Import file pelajaran dari basic/ (nama file diawali angka)"""
+    name = "lesson_" + os.path.splitext(filename)[0]
+    if name in sys.modules:   # satu modul untuk semua file test (pickle)
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BASIC_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    if BASIC_DIR not in sys.path:   # pelajaran meng-import record_io.py
+        sys.path.insert(0, BASIC_DIR)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fact_matching = load_lesson("03_fact_matching.py")
+Fact = fact_matching.Fact
+FactBase = fact_matching.FactBase
+VersionedFactBase = fact_matching.VersionedFactBase
+
+PATTERNS = [Fact("p", ["?x", "?y"]), Fact("p", ["a", "?y"]), Fact("q", ["?x"]),
+            Fact("p", ["?x", "?x"]), Fact("q", [fact_matching.gt(1)])]
+
+
+def random_fact(rng):
+    if rng.random() < 0.5:
+        return Fact("q", [rng.randint(0, 3)])
+    return Fact("p", [rng.choice("abc"), rng.choice("abc")])
+
+
+class VersionedFactBaseTest(unittest.TestCase):
+    
+    def assertSameAs(self, view, expected):
+        reference = FactBase()
+        reference.add_facts(expected)
+        self.assertEqual(set(view.facts), expected)
+        self.assertEqual(len(view.facts), len(expected))
+        for pattern in PATTERNS:
+            self.assertEqual(sorted(map(str, (f for f, _ in view.query(pattern)))),
+                             sorted(map(str, (f for f, _ in reference.query(pattern)))))
+            self.assertEqual(view.count(pattern), reference.count(pattern))
+        joined = [Fact("p", ["?x", "?y"]), Fact("p", ["?y", "?z"])]
+        self.assertEqual(len(view.query_all(joined)), len(reference.query_all(joined)))
+    
+    def test_snapshots_keep_their_version(self):
+        rng = random.Random(1)
+        kb = VersionedFactBase()
+        current = set()
+        snapshots = []
+        for _ in range(300):
+            fact = random_fact(rng)
+            if fact in current and rng.random() < 0.5:
+                self.assertTrue(kb.remove(fact))
+                current.discard(fact)
+            else:
+                kb.add(fact)
+                current.add(fact)
+            if rng.random() < 0.1:
+                snapshots.append((kb.snapshot(), set(current)))
+        self.assertSameAs(kb, current)
+        for view, expected in snapshots:
+            self.assertSameAs(view, expected)
+    
+    def test_remove_and_add_again(self):
+        kb = VersionedFactBase([Fact("q", [1])])
+        before = kb.snapshot()
+        kb.remove(Fact("q", [1]))
+        removed = kb.snapshot()
+        kb.add(Fact("q", [1]))
+        self.assertIn(Fact("q", [1]), before.facts)
+        self.assertNotIn(Fact("q", [1]), removed.facts)
+        self.assertIn(Fact("q", [1]), kb.snapshot().facts)
+        self.assertFalse(kb.remove(Fact("q", [2])))
+        self.assertEqual(kb.add_facts([Fact("q", [1]), Fact("q", [2])]), 1)
+    
+    def test_compaction_keeps_old_snapshots(self):
+        facts = [Fact("q", [i]) for i in range(3000)]
+        kb = VersionedFactBase(facts)
+        view = kb.snapshot()
+        for fact in facts[:2000]:
+            kb.remove(fact)
+        self.assertEqual(len(kb._state.facts), 1000 + kb._dead)   # sudah compact
+        self.assertEqual(len(view.facts), 3000)
+        self.assertEqual(view.count(Fact("q", ["?x"])), 3000)
+        self.assertEqual(kb.count(Fact("q", ["?x"])), 1000)
+        kb.add(facts[0])
+        self.assertIn(facts[0], kb.snapshot().facts)
+    
+    def test_snapshot_is_read_only(self):
+        view = VersionedFactBase().snapshot()
+        for write in (view.add, view.remove):
+            with self.assertRaises(TypeError):
+                write(Fact("q", [1]))
+        with self.assertRaises(TypeError):
+            view.add_facts([Fact("q", [1])])
+    
+    def test_readers_see_whole_batches(self):
+        kb = VersionedFactBase()
+        done = threading.Event()
+        errors = []
+        
+        def write():
+            for i in range(2000):
+                kb.add_facts([Fact("kiri", [i]), Fact("kanan", [i])])
+            done.set()
+        
+        def read():
+            while not done.is_set():
+                view = kb.snapshot()
+                left = view.count(Fact("kiri", ["?i"]))
+                right = view.count(Fact("kanan", ["?i"]))
+                if left != right or len(view.facts) != left + right:
+                    errors.append((left, right, len(view.facts)))
+        
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(kb.facts), 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()